@@ -1,40 +1,150 @@
-import pymel.core as pm
-import importlib
+import time
+import contextlib
+
+import maya.cmds as mc
 
 from core.utils import curve_library
-importlib.reload(curve_library)
+from core.utils import node_handle as nh
+
+
+# addAttr 에 attributeType 대신 dataType 으로 넘겨야 하는 타입
+DATA_ATTR_TYPES = {
+    'string', 'stringArray', 'doubleArray', 'floatArray', 'Int32Array', 'vectorArray', 'pointArray',
+    'matrix', 'fltMatrix', 'reflectanceRGB', 'spectrumRGB', 'nurbsCurve', 'nurbsSurface', 'mesh', 'lattice',
+}
+# defaultValue 를 줄 수 없는 attributeType
+NO_DEFAULT_ATTR_TYPES = {'message', 'compound', 'enum'} | DATA_ATTR_TYPES
+
+
+class AttrBatch(object):
+    '''
+    어트리뷰트 add / set / connect / lock 작업을 모아뒀다가 apply 에서 한 번에 적용하는 배치
+    - maya.cmds 로 적용하고 undo 한 번으로 묶는다. (Ctrl+Z / redo 가 lock 까지 포함해서 동작)
+      MDGModifier 를 스크립트에서 doIt() 하면 undo 큐에 올라가지 않고, undo 되는 MPxCommand 는 플러그인을 따로
+      배포/로드해야 해서 사용하지 않는다.
+    - 적용 순서: add -> set -> connect -> lock (lock 된 어트리뷰트에 set 이 실패하지 않도록)
+    - 노드는 nh.NodeHandle(MObjectHandle)로 바꿔서 들고 있다가 apply 시점에 현재 이름으로 바꾸므로
+      중간에 rename / reparent 되어도 안전하다.
+    '''
+    def __init__(self):
+        self.adds = []
+        self.sets = []
+        self.connects = []
+        self.locks = []
+        self.operation_count = 0
+        self.elapsed = 0.0
+
+    def __len__(self):
+        return len(self.adds) + len(self.sets) + len(self.connects) + len(self.locks)
+
+    def add_attr(self, node, long_name, attr_type, default_value, keyable=False, **kwargs):
+        """kwargs 는 mc.addAttr 에 그대로 전달 (enum 의 enumName, min/max 등)"""
+        self.adds.append((nh.as_node(node), long_name, attr_type, default_value, keyable, kwargs))
+
+    def set_attr(self, node, attr, value, value_type=None):
+        self.sets.append((nh.as_node(node), attr, value, value_type))
+
+    def connect_attr(self, node_a, attr_a, node_b, attr_b, force=False):
+        self.connects.append((nh.as_node(node_a), attr_a, nh.as_node(node_b), attr_b, force))
+
+    def lock_attr(self, node, attr, lock=True, keyable=False, channelBox=False):
+        self.locks.append((nh.as_node(node), attr, lock, keyable, channelBox))
+
+    @staticmethod
+    def _add_attr_kwargs(long_name, attr_type, default_value, keyable, kwargs):
+        add_kwargs = {'longName': long_name, 'keyable': keyable}
+        if attr_type in DATA_ATTR_TYPES:
+            add_kwargs['dataType'] = attr_type
+        else:
+            add_kwargs['attributeType'] = attr_type
+        if default_value is not None and attr_type not in NO_DEFAULT_ATTR_TYPES:
+            add_kwargs['defaultValue'] = default_value
+        add_kwargs.update(kwargs)
+        return add_kwargs
+
+    def apply(self):
+        start = time.perf_counter()
+        mc.undoInfo(openChunk=True, chunkName='AttrBatch')
+        try:
+            for node, long_name, attr_type, default_value, keyable, kwargs in self.adds:
+                mc.addAttr(str(node), **self._add_attr_kwargs(long_name, attr_type, default_value, keyable, kwargs))
+
+            for node, attr, value, value_type in self.sets:
+                values = value if isinstance(value, (list, tuple)) else [value]
+                if value_type:
+                    mc.setAttr(f'{node}.{attr}', *values, type=value_type)
+                else:
+                    mc.setAttr(f'{node}.{attr}', *values)
+
+            for node_a, attr_a, node_b, attr_b, force in self.connects:
+                mc.connectAttr(f'{node_a}.{attr_a}', f'{node_b}.{attr_b}', force=force)
+
+            for node, attr, lock, keyable, channelBox in self.locks:
+                mc.setAttr(f'{node}.{attr}', lock=lock, keyable=keyable, channelBox=channelBox)
+        finally:
+            mc.undoInfo(closeChunk=True)
+
+        self.operation_count = len(self)
+        self.elapsed = time.perf_counter() - start
+        self.adds, self.sets, self.connects, self.locks = [], [], [], []
+        return self.operation_count, self.elapsed
+
 
 class CasperHelpers(object):
+    _active_batch = None
+
+    @classmethod
+    @contextlib.contextmanager
+    def batch(cls, verbose=True):
+        '''
+        with CasperHelpers.batch() as batch:
+            ...  # 이 안의 add_attr / set_attr / connect_attr / lock_and_hide_attrs 는 모였다가 블록이 끝날때 한 번에 적용
+        중첩되면 가장 바깥 배치에 모인다.
+        '''
+        if cls._active_batch is not None:
+            yield cls._active_batch
+            return
+
+        cls._active_batch = AttrBatch()
+        try:
+            yield cls._active_batch
+            count, elapsed = cls._active_batch.apply()
+            if verbose:
+                print(f"[CasperHelpers] applied {count} attribute operations in {elapsed * 1000:.1f} ms")
+        finally:
+            cls._active_batch = None
+
     @classmethod
-    def add_attr(cls, node, long_name, attr_type, default_value, keyable=False):
-        pm.addAttr(node, longName=long_name, attributeType = attr_type, defaultValue = default_value, keyable = keyable)
+    def add_attr(cls, node, long_name, attr_type, default_value, keyable=False, **kwargs):
+        with cls.batch(verbose=False) as batch:
+            batch.add_attr(node, long_name, attr_type, default_value, keyable=keyable, **kwargs)
 
     @classmethod
     def set_attr(cls, node, attr, value, value_type = None):
-        if value_type:
-            pm.setAttr(f'{node}.{attr}',  *value, type=value_type)
-        else:
-            pm.setAttr(f'{node}.{attr}', value)
+        with cls.batch(verbose=False) as batch:
+            batch.set_attr(node, attr, value, value_type=value_type)
 
     @classmethod
     def connect_attr(cls, node_a, attr_a, node_b, attr_b, force=False):
-        pm.connectAttr(f'{node_a}.{attr_a}',f'{node_b}.{attr_b}', force=force)
+        with cls.batch(verbose=False) as batch:
+            batch.connect_attr(node_a, attr_a, node_b, attr_b, force=force)
 
     @classmethod
     def lock_and_hide_attrs(cls, node, attrs, lock=True, hide=True, channelBox=False):
         keyable = not hide
 
-        for attr in attrs:
-            full_name = f'{node}.{attr}'
-            pm.setAttr(full_name, lock=lock, keyable = keyable, channelBox = channelBox)
+        with cls.batch(verbose=False) as batch:
+            for attr in attrs:
+                batch.lock_attr(node, attr, lock=lock, keyable=keyable, channelBox=channelBox)
+
     @classmethod
     def create_display_layer(cls, name, members, reference=False):
-        display_layer = pm.createDisplayLayer(name=name, empty=True)
+        display_layer = mc.createDisplayLayer(name=name, empty=True)
 
         if reference:
-            pm.setAttr(f'{display_layer}',2)
+            mc.setAttr(f'{display_layer}.displayType',2)
         if members:
-            pm.editDisplayLayerMembers(display_layer, members, noRecurse=True)
+            mc.editDisplayLayerMembers(display_layer, *[str(m) for m in members], noRecurse=True)
 
         return display_layer
 
@@ -50,40 +160,96 @@ class BallAutoRig(object):
         self.secondary_color = secondary
 
     def create_ball(self,name,parent=None):
-        ball_geo = pm.sphere(pivot=(0,0,0), axis=(0,1,0), radius=1, name=name)[0]
+        ball_geo = nh.as_node(mc.sphere(pivot=(0,0,0), axis=(0,1,0), radius=1, name=name)[0])
         if parent:
-            ball_geo = pm.parent(ball_geo,parent)[0]
+            nh.parent(ball_geo,parent)
 
         return ball_geo
 
     def create_ball_ctrl(self, name, parent=None):
-        curve_library_path ='/home/mago/casper/core/utils/curve_library.json'
-        ball_ctrl = curve_library.create_curve_from_crv_lib('arrowBoth',curve_library_path)
+        ball_ctrl = nh.as_node(curve_library.create_curve_from_crv_lib('arrowBoth'))
         if parent:
-            ball_ctrl = pm.parent(ball_ctrl,parent)[0]
+            nh.parent(ball_ctrl,parent)
 
         CasperHelpers.lock_and_hide_attrs(ball_ctrl,['sx','sy','sz','v'])
         CasperHelpers.set_attr(ball_ctrl,'rotateOrder',3)
 
-        ball_ctrl = pm.rename(ball_ctrl,name)
+        ball_ctrl.rename(name)
         return ball_ctrl
 
-    def construct_rig(self, name='ball'):
-        pm.select(clear=True)
-        root_grp = pm.group(name=name, empty=True, world=True)
-        anim_controls_grp = pm.group(name='anim_controls', empty=True, parent=root_grp)
-        geometry_grp = pm.group(name='geometry_doNotTouch', empty=True, parent=root_grp)
+    def construct_rig(self, name='ball', display_layer=True):
+        return self._construct_rig(name, display_layer)[0]
+
+    def _construct_rig(self, name, display_layer):
+        """리그를 만들고 (루트 그룹, 구체 geo) 를 반환 (씬에 같은 이름이 있으면 Maya 가 이름 뒤에 숫자를 붙인다)"""
+        mc.select(clear=True)
+        root_grp = nh.group(name)
+        anim_controls_grp = nh.group('anim_controls', parent_node=root_grp)
+        geometry_grp = nh.group('geometry_doNotTouch', parent_node=root_grp)
         ball_geo = self.create_ball('ball_geo', parent=geometry_grp)
         ball_ctrl = self.create_ball_ctrl('ball_ctrl',parent=anim_controls_grp)
 
-        pm.parentConstraint(ball_ctrl,ball_geo,maintainOffset=True, weight=1)
-        CasperHelpers.create_display_layer("ball_geometry",[ball_geo], True)
-
-
-
-
-pm.newFile(force=True)
-ball = BallAutoRig()
-ball.construct_rig()
-
-
+        nh.parent_constraint(ball_ctrl,ball_geo,maintainOffset=True, weight=1)
+        if display_layer:
+            CasperHelpers.create_display_layer("ball_geometry",[ball_geo], True)
+
+        return root_grp, ball_geo
+
+    def construct_rigs(self, count, name='ball', use_namespace=False, spacing=3.0, columns=20):
+        '''
+        프로토타입 리그를 한 번 만들고 복제해서 count 개의 리그를 만든다.
+        - 복제는 이미 만들어진 리그 전체를 한 번에 duplicate 해서 매번 개수가 두 배가 된다. (log2(count) 번 호출)
+        - inputConnections 로 복제해서 구체의 makeNurbSphere 히스토리는 복제본들이 공유한다.
+        - 이름은 '{name}_000_ball_geo' 같은 접두사 방식, use_namespace=True 면 '{name}_000:ball_geo'
+        - 디스플레이 레이어 멤버십은 마지막에 한 번에 편집하고, 전체가 undo 한 번으로 묶인다.
+        - 리그 루트들은 columns 개씩 spacing 간격의 격자로 배치된다.
+        반환값: 리그 루트 그룹 리스트
+        '''
+        if count < 1:
+            raise ValueError(f"count 는 1 이상이어야 합니다: {count}")
+
+        mc.undoInfo(openChunk=True, chunkName='construct_rigs')
+        try:
+            proto_root, proto_geo = self._construct_rig(f'{name}_proto', display_layer=False)
+            proto_nodes = mc.ls(str(proto_root), dag=True, long=True)
+            base_names = [n.rsplit('|', 1)[-1] for n in proto_nodes]
+            base_names[0] = 'root'
+            # 이름(ball_geo1 처럼 바뀔 수 있음)이 아니라 create_ball 이 돌려준 노드의 경로로 찾는다
+            geo_index = proto_nodes.index(str(proto_geo))
+
+            roots = [proto_root]
+            while len(roots) < count:
+                copies = mc.duplicate([str(r) for r in roots[:count - len(roots)]],
+                                      inputConnections=True, returnRootsOnly=True)
+                roots.extend(nh.as_nodes(copies))
+
+            geos = []
+            for i, root in enumerate(roots):
+                instance_name = f'{name}_{i:03d}'
+                nodes = mc.ls(str(root), dag=True, long=True)
+                geos.append(nh.as_node(nodes[geo_index]))
+
+                if use_namespace and not mc.namespace(exists=instance_name):
+                    mc.namespace(add=instance_name)
+                # 자식부터 이름을 바꿔서 부모 경로가 바뀌어도 이름 충돌이 없도록 한다
+                for index in reversed(range(len(nodes))):
+                    base_name = name if index == 0 else base_names[index]
+                    if use_namespace:
+                        new_name = f'{instance_name}:{base_name}'
+                    else:
+                        new_name = instance_name if index == 0 else f'{instance_name}_{base_name}'
+                    mc.rename(nodes[index], new_name)
+
+                root.translate.set((i % columns) * spacing, 0, (i // columns) * spacing)
+
+            CasperHelpers.create_display_layer("ball_geometry", geos, True)
+        finally:
+            mc.undoInfo(closeChunk=True)
+
+        return roots
+
+
+if __name__ == '__main__':
+    mc.file(new=True, force=True)
+    ball = BallAutoRig()
+    ball.construct_rig()
@@ -0,0 +1,255 @@
+"""
+컨트롤 커브 라이브러리
+
+JSON 커브 라이브러리 파일들을 한 번만 읽어서 이름 -> 쉐입 데이터 인덱스로 메모리에 들고 있습니다.
+컨트롤을 수백 개 만들어도 파일 I/O 는 처음 한 번만 일어납니다.
+
+- 검색 경로: CASPER_CURVE_LIBRARY_PATH 환경변수(os.pathsep 구분) + 이 모듈 폴더
+  add_search_path 로 런타임에 추가할 수 있습니다.
+- JSON 마다 사용자별 캐시 폴더(CASPER_CURVE_CACHE_DIR, 기본값 ~/.cache/casper/curve_library)에
+  marshal 캐시(<경로 해시>.crvcache)를 만들고, JSON 의 mtime/size 가 바뀌면 다시 만듭니다.
+  공유 검색 경로에는 아무것도 쓰지 않고, 캐시에는 리스트/dict/숫자/문자열만 들어갑니다. (pickle 처럼 코드가 실행되지 않음)
+  캐시를 쓸 수 없으면 캐시 없이 JSON 만 사용합니다.
+- 읽을 수 없거나 아래 형식이 아닌 JSON 은 경고를 출력하고 건너뜁니다.
+
+JSON 형식:
+    {
+        "arrowBoth": [
+            {"degree": 1, "periodic": false, "points": [[x, y, z], ...], "knots": [...]},
+            ...  # 쉐입이 여러 개면 하나의 트랜스폼 아래로 합쳐집니다
+        ]
+    }
+
+사용 예:
+    from core.utils import curve_library
+    ctrl = curve_library.create_curve_from_crv_lib('arrowBoth')
+"""
+
+import os
+import json
+import marshal
+import hashlib
+
+import maya.cmds as mc
+
+SEARCH_PATH_ENV = 'CASPER_CURVE_LIBRARY_PATH'
+CACHE_DIR_ENV = 'CASPER_CURVE_CACHE_DIR'
+CACHE_EXTENSION = '.crvcache'
+CACHE_FORMAT_VERSION = 2
+
+_search_paths = []
+_shape_index = None
+# 읽은 라이브러리 파일 경로 -> 그 파일의 {이름: 쉐입 리스트}
+_loaded_files = {}
+
+
+def get_search_paths():
+    """환경변수, add_search_path 로 추가된 경로, 모듈 폴더 순서의 검색 경로"""
+    paths = [p for p in os.environ.get(SEARCH_PATH_ENV, '').split(os.pathsep) if p]
+    paths.extend(_search_paths)
+    paths.append(os.path.dirname(os.path.abspath(__file__)))
+    return paths
+
+
+def add_search_path(path):
+    """검색 경로를 추가하고 인덱스를 다시 만들도록 표시"""
+    if path not in _search_paths:
+        _search_paths.append(path)
+        reload()
+
+
+def reload():
+    """다음 조회 때 라이브러리를 다시 읽도록 인덱스를 비웁니다."""
+    global _shape_index
+    _shape_index = None
+    _loaded_files.clear()
+
+
+def _library_files():
+    files = []
+    for path in get_search_paths():
+        if os.path.isfile(path):
+            files.append(path)
+        elif os.path.isdir(path):
+            files.extend(os.path.join(path, f) for f in sorted(os.listdir(path)) if f.endswith('.json'))
+    return files
+
+
+def _is_library_data(data):
+    """{이름: [쉐입 dict, ...]} 형식인지 확인 (쉐입이 하나면 리스트 대신 dict 도 허용)"""
+    if not isinstance(data, dict):
+        return False
+    for shapes in data.values():
+        if isinstance(shapes, dict):
+            continue
+        if not isinstance(shapes, list) or not all(isinstance(shape, dict) for shape in shapes):
+            return False
+    return True
+
+
+def get_cache_dir():
+    """사용자별 캐시 폴더 (CASPER_CURVE_CACHE_DIR > LOCALAPPDATA(윈도우) > XDG_CACHE_HOME > ~/.cache)"""
+    cache_dir = os.environ.get(CACHE_DIR_ENV)
+    if cache_dir:
+        return cache_dir
+    base = os.environ.get('LOCALAPPDATA') or os.environ.get('XDG_CACHE_HOME') or os.path.join(
+        os.path.expanduser('~'), '.cache')
+    return os.path.join(base, 'casper', 'curve_library')
+
+
+def _cache_path(json_path):
+    name = hashlib.md5(os.path.abspath(json_path).encode('utf-8')).hexdigest()
+    return os.path.join(get_cache_dir(), name + CACHE_EXTENSION)
+
+
+def _read_cache(cache_path, key):
+    try:
+        with open(cache_path, 'rb') as f:
+            cache_key, shapes = marshal.load(f)
+    except (OSError, EOFError, ValueError, TypeError):
+        return None
+    if cache_key != key or not _is_library_data(shapes):
+        return None
+    return shapes
+
+
+def _write_cache(cache_path, key, shapes):
+    """임시 파일에 쓰고 os.replace 로 교체 (다른 세션이 반쯤 쓴 캐시를 읽지 않도록)"""
+    tmp_path = f'{cache_path}.tmp{os.getpid()}'
+    try:
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        with open(tmp_path, 'wb') as f:
+            marshal.dump((key, shapes), f)
+        os.replace(tmp_path, cache_path)
+    except (OSError, ValueError):
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+
+
+def _read_library_file(json_path):
+    """
+    캐시가 유효하면 캐시를, 아니면 JSON 을 읽고 캐시를 갱신
+    읽을 수 없거나 라이브러리 형식이 아니면 경고를 출력하고 None 을 반환
+    """
+    try:
+        stat = os.stat(json_path)
+    except OSError as e:
+        print(f"[WARNING] curve library 파일을 읽을 수 없습니다: {json_path} ({e})")
+        return None
+    # 해시 충돌에 대비해서 JSON 경로도 키에 넣는다
+    key = (CACHE_FORMAT_VERSION, os.path.abspath(json_path), stat.st_mtime_ns, stat.st_size)
+    cache_path = _cache_path(json_path)
+
+    shapes = _read_cache(cache_path, key)
+    if shapes is not None:
+        return shapes
+
+    try:
+        with open(json_path, 'r', encoding='utf-8') as f:
+            shapes = json.load(f)
+    except (OSError, ValueError) as e:
+        print(f"[WARNING] curve library 파일을 읽을 수 없어서 건너뜁니다: {json_path} ({e})")
+        return None
+    if not _is_library_data(shapes):
+        print(f"[WARNING] curve library 형식({{이름: [쉐입, ...]}})이 아니라서 건너뜁니다: {json_path}")
+        return None
+
+    _write_cache(cache_path, key, shapes)
+    return shapes
+
+
+def _load_into_index(json_path):
+    """파일을 한 번만 읽어서 인덱스에 추가하고, 그 파일의 {이름: 쉐입} 을 반환 (읽지 못하면 빈 dict)"""
+    json_path = os.path.abspath(json_path)
+    if json_path not in _loaded_files:
+        _loaded_files[json_path] = _read_library_file(json_path) or {}
+        for name, shapes in _loaded_files[json_path].items():
+            # 먼저 찾은 경로가 우선
+            _shape_index.setdefault(name, shapes)
+    return _loaded_files[json_path]
+
+
+def get_index():
+    """이름 -> 쉐입 데이터 리스트 인덱스 (처음 호출할 때 한 번만 로드)"""
+    global _shape_index
+    if _shape_index is None:
+        _shape_index = {}
+        for json_path in _library_files():
+            _load_into_index(json_path)
+    return _shape_index
+
+
+def list_curves():
+    return sorted(get_index())
+
+
+def get_curve_data(name, library_path=None):
+    """library_path 를 주면 그 파일의 커브를 먼저 찾고, 없으면 검색 경로 인덱스에서 찾습니다."""
+    index = get_index()
+    shapes = None
+    if library_path:
+        shapes = _load_into_index(library_path).get(name)
+    if shapes is None:
+        shapes = index.get(name)
+    if shapes is None:
+        raise KeyError(f"curve library에 '{name}' 커브가 없습니다. (검색 경로: {get_search_paths()})")
+    return shapes if isinstance(shapes, list) else [shapes]
+
+
+def create_curve_from_crv_lib(name, library_path=None):
+    """
+    라이브러리의 커브로 트랜스폼 하나를 만들고 이름을 반환합니다.
+    :param name: 라이브러리 커브 이름
+    :param library_path: 검색 경로보다 먼저 찾을 JSON 경로 (한 번만 로드됨)
+    """
+    transform = None
+    for shape_data in get_curve_data(name, library_path):
+        curve_kwargs = {'degree': shape_data.get('degree', 1),
+                        'point': shape_data['points'],
+                        'periodic': shape_data.get('periodic', False)}
+        # knots 가 없는 쉐입은 Maya 가 기본 knot 를 만들도록 knot 를 넘기지 않는다
+        if shape_data.get('knots') is not None:
+            curve_kwargs['knot'] = shape_data['knots']
+        curve = mc.curve(**curve_kwargs)
+        if transform is None:
+            transform = mc.rename(curve, name)
+            continue
+        # 두 번째 쉐입부터는 첫 트랜스폼 아래로 옮기고 빈 트랜스폼은 삭제
+        shape = mc.listRelatives(curve, shapes=True, fullPath=True)[0]
+        mc.parent(shape, transform, relative=True, shape=True)
+        mc.delete(curve)
+
+    for index, shape in enumerate(mc.listRelatives(transform, shapes=True, fullPath=True) or []):
+        mc.rename(shape, f"{transform}Shape{index or ''}")
+    return transform
+
+
+def export_curve_to_crv_lib(transform, name, library_path):
+    """씬의 커브 트랜스폼을 라이브러리 JSON 에 저장하고 인덱스를 갱신합니다."""
+    shapes = []
+    for shape in mc.listRelatives(transform, shapes=True, type='nurbsCurve', fullPath=True) or []:
+        spans = mc.getAttr(f'{shape}.spans')
+        degree = mc.getAttr(f'{shape}.degree')
+        periodic = mc.getAttr(f'{shape}.form') == 2
+        cv_count = spans if periodic else spans + degree
+        points = [list(mc.pointPosition(f'{shape}.cv[{i}]', local=True)) for i in range(cv_count)]
+        if periodic:
+            points.extend(points[:degree])
+        info = mc.createNode('curveInfo', skipSelect=True)
+        mc.connectAttr(f'{shape}.worldSpace[0]', f'{info}.inputCurve')
+        knots = mc.getAttr(f'{info}.knots[*]')
+        mc.delete(info)
+        shapes.append({'degree': degree, 'periodic': periodic, 'points': points, 'knots': knots})
+
+    data = {}
+    if os.path.exists(library_path):
+        with open(library_path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    data[name] = shapes
+    with open(library_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2)
+
+    reload()
+    return shapes
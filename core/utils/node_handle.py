@@ -0,0 +1,323 @@
+"""
+PyMEL 없이 쓰는 가벼운 노드 핸들 레이어
+
+pymel.core 는 처음 import 할 때 수 초가 걸리고, 노드 작업마다 PyNode 생성 비용이 붙습니다.
+리그 빌드 툴(auto_ball_rig, create_fk_uber)이 쓰는 작업만 maya.cmds / OpenMaya 2 로 감쌌습니다.
+
+- NodeHandle 은 MObjectHandle 을 들고 있어서 rename / reparent 되어도 같은 노드를 가리킵니다.
+- str(handle) 은 현재 이름(DAG 노드는 full path)이라 cmds 에 그대로 넘길 수 있습니다.
+- handle.translate, handle.worldMatrix[0], handle.wtMatrix[0].matrixIn 처럼 PyMEL 과 비슷하게 어트리뷰트에 접근합니다.
+
+사용 예:
+    from core.utils import node_handle as nh
+    grp = nh.create_node('transform', name='grp')
+    mm = nh.create_node('multMatrix', name='mm')
+    nh.connect_attr(grp.worldMatrix[0], mm.matrixIn[0])
+    grp.translate.set(1, 2, 3)
+"""
+
+import time
+import subprocess
+import sys
+import os
+
+import maya.cmds as mc
+import maya.api.OpenMaya as om2
+
+
+class AttrHandle(object):
+    """노드 어트리뷰트 경로. 문자열로 바꾸면 'node.attr' 이 됩니다."""
+    __slots__ = ('node', 'attr')
+
+    def __init__(self, node, attr):
+        self.node = node
+        self.attr = attr
+
+    def __str__(self):
+        return f'{self.node}.{self.attr}'
+
+    def __repr__(self):
+        return f"AttrHandle('{self}')"
+
+    def __getitem__(self, index):
+        return AttrHandle(self.node, f'{self.attr}[{index}]')
+
+    def __getattr__(self, child):
+        if child.startswith('_'):
+            raise AttributeError(child)
+        return AttrHandle(self.node, f'{self.attr}.{child}')
+
+    def get(self, **kwargs):
+        return mc.getAttr(str(self), **kwargs)
+
+    def set(self, *values, **kwargs):
+        set_attr(self, *values, **kwargs)
+
+    def connect(self, destination, force=False):
+        mc.connectAttr(str(self), str(destination), force=force)
+
+    def exists(self):
+        return mc.objExists(str(self))
+
+
+class NodeHandle(object):
+    """MObjectHandle 기반 노드 핸들"""
+    __slots__ = ('_handle', '_is_dag')
+
+    def __init__(self, node):
+        if isinstance(node, NodeHandle):
+            self._handle = node._handle
+            self._is_dag = node._is_dag
+            return
+        if isinstance(node, om2.MObject):
+            mobject = node
+        else:
+            selection = om2.MSelectionList()
+            selection.add(str(node))
+            mobject = selection.getDependNode(0)
+        self._handle = om2.MObjectHandle(mobject)
+        self._is_dag = mobject.hasFn(om2.MFn.kDagNode)
+
+    def __str__(self):
+        return self.name()
+
+    def __repr__(self):
+        return f"NodeHandle('{self}')"
+
+    def __eq__(self, other):
+        if isinstance(other, NodeHandle):
+            return self.mobject == other.mobject
+        return str(self) == str(other)
+
+    def __ne__(self, other):
+        return not self.__eq__(other)
+
+    def __hash__(self):
+        return self._handle.hashCode()
+
+    def __getattr__(self, attr):
+        if attr.startswith('_'):
+            raise AttributeError(attr)
+        return AttrHandle(self, attr)
+
+    @property
+    def mobject(self):
+        if not self._handle.isValid():
+            raise RuntimeError("노드가 삭제되었습니다.")
+        return self._handle.object()
+
+    def name(self):
+        if self._is_dag:
+            return om2.MFnDagNode(self.mobject).fullPathName()
+        return om2.MFnDependencyNode(self.mobject).name()
+
+    def node_name(self):
+        """네임스페이스 포함 짧은 이름"""
+        return om2.MFnDependencyNode(self.mobject).name()
+
+    def node_type(self):
+        return om2.MFnDependencyNode(self.mobject).typeName
+
+    def exists(self):
+        return self._handle.isValid()
+
+    def has_attr(self, attr):
+        return om2.MFnDependencyNode(self.mobject).hasAttribute(attr)
+
+    def attr(self, attr):
+        return AttrHandle(self, attr)
+
+    def rename(self, new_name):
+        mc.rename(str(self), new_name)
+        return self
+
+    def get_parent(self):
+        parents = mc.listRelatives(str(self), parent=True, fullPath=True)
+        return NodeHandle(parents[0]) if parents else None
+
+
+def as_node(node):
+    """문자열, PyNode, NodeHandle 무엇이든 NodeHandle 로 바꿉니다. (None 은 그대로)"""
+    if node is None or isinstance(node, NodeHandle):
+        return node
+    return NodeHandle(str(node))
+
+
+def as_nodes(nodes):
+    return [NodeHandle(n) for n in nodes or []]
+
+
+def create_node(node_type, name=None, parent=None):
+    kwargs = {'skipSelect': True}
+    if name:
+        kwargs['name'] = name
+    if parent is not None:
+        kwargs['parent'] = str(parent)
+    return NodeHandle(mc.createNode(node_type, **kwargs))
+
+
+def connect_attr(source, destination, force=False):
+    mc.connectAttr(str(source), str(destination), force=force)
+
+
+def set_attr(attr, *values, **kwargs):
+    # set(1, 2, 3) 과 set([1, 2, 3]) 둘 다 허용
+    if len(values) == 1 and isinstance(values[0], (list, tuple)) and 'type' not in kwargs:
+        values = values[0]
+    mc.setAttr(str(attr), *values, **kwargs)
+
+
+def get_attr(attr, **kwargs):
+    return mc.getAttr(str(attr), **kwargs)
+
+
+def list_relatives(node, **kwargs):
+    """listRelatives 결과를 NodeHandle 리스트로 반환 (항상 fullPath 로 조회)"""
+    kwargs.setdefault('fullPath', True)
+    if kwargs.get('path'):
+        kwargs.pop('fullPath')
+    return as_nodes(mc.listRelatives(str(node), **kwargs))
+
+
+def xform(node, **kwargs):
+    return mc.xform(str(node), **kwargs)
+
+
+def parent(nodes, parent_node=None, **kwargs):
+    """nodes(한 개 또는 리스트)를 parent_node 아래로 옮기고 NodeHandle 리스트를 반환 (None 이면 world)"""
+    nodes = nodes if isinstance(nodes, (list, tuple)) else [nodes]
+    handles = [as_node(n) for n in nodes]
+    if parent_node is None:
+        mc.parent(*[str(h) for h in handles], world=True, **kwargs)
+    else:
+        mc.parent(*[str(h) for h in handles] + [str(parent_node)], **kwargs)
+    # 핸들은 MObject 를 들고 있어서 reparent 후에도 그대로 유효
+    return handles
+
+
+def parent_constraint(drivers, driven, **kwargs):
+    drivers = drivers if isinstance(drivers, (list, tuple)) else [drivers]
+    return NodeHandle(mc.parentConstraint(*[str(d) for d in drivers] + [str(driven)], **kwargs)[0])
+
+
+def point_constraint(drivers, driven, **kwargs):
+    drivers = drivers if isinstance(drivers, (list, tuple)) else [drivers]
+    return NodeHandle(mc.pointConstraint(*[str(d) for d in drivers] + [str(driven)], **kwargs)[0])
+
+
+def orient_constraint(drivers, driven, **kwargs):
+    drivers = drivers if isinstance(drivers, (list, tuple)) else [drivers]
+    return NodeHandle(mc.orientConstraint(*[str(d) for d in drivers] + [str(driven)], **kwargs)[0])
+
+
+def group(name, parent_node=None):
+    """빈 트랜스폼 그룹 (pm.group(empty=True) 대응)"""
+    return create_node('transform', name=name, parent=parent_node)
+
+
+def ls(*args, **kwargs):
+    return as_nodes(mc.ls(*[str(a) for a in args], **kwargs))
+
+
+# ------- 벤치마크 -------- #
+
+_STARTUP_SNIPPET = """
+import time
+import maya.standalone
+maya.standalone.initialize(name='python')
+start = time.perf_counter()
+import {module}
+print(time.perf_counter() - start)
+"""
+
+
+def _mayapy():
+    maya_location = os.environ.get('MAYA_LOCATION')
+    if maya_location:
+        return os.path.join(maya_location, 'bin', 'mayapy')
+    return sys.executable
+
+
+def benchmark_startup(modules=('pymel.core', 'core.utils.node_handle')):
+    """새 mayapy 프로세스에서 모듈 import 시간을 잰다. {module: seconds}"""
+    project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    env = dict(os.environ)
+    env['PYTHONPATH'] = os.pathsep.join(filter(None, [project_root, env.get('PYTHONPATH')]))
+
+    results = {}
+    for module in modules:
+        output = subprocess.check_output([_mayapy(), '-c', _STARTUP_SNIPPET.format(module=module)],
+                                         env=env, universal_newlines=True)
+        results[module] = float(output.strip().splitlines()[-1])
+    return results
+
+
+def _time_operations(count, create, connect, set_value, relatives, get_matrix, parent_to):
+    timings = {}
+
+    start = time.perf_counter()
+    nodes = [create(f'bench_{i}') for i in range(count)]
+    timings['createNode'] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for a, b in zip(nodes, nodes[1:]):
+        connect(a, b)
+    timings['connectAttr'] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for node in nodes:
+        set_value(node)
+    timings['setAttr'] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for node in nodes:
+        get_matrix(node)
+    timings['xform'] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for a, b in zip(nodes[1:], nodes):
+        parent_to(a, b)
+    timings['parent'] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for node in nodes:
+        relatives(node)
+    timings['listRelatives'] = time.perf_counter() - start
+
+    return timings
+
+
+def benchmark_operations(count=1000):
+    """
+    현재 세션에서 노드 작업별 시간을 PyMEL 과 비교한다. 씬을 새로 열기 때문에 현재 씬은 버려진다.
+    반환값: {'node_handle': {op: seconds}, 'pymel': {op: seconds}}
+    """
+    results = {}
+
+    mc.file(new=True, force=True)
+    results['node_handle'] = _time_operations(
+        count,
+        create=lambda name: create_node('transform', name=name),
+        connect=lambda a, b: connect_attr(a.translateX, b.rotateX),
+        set_value=lambda n: n.scale.set(2, 2, 2),
+        relatives=lambda n: list_relatives(n, children=True),
+        get_matrix=lambda n: xform(n, query=True, worldSpace=True, matrix=True),
+        parent_to=lambda a, b: parent(a, b),
+    )
+
+    import pymel.core as pm
+    mc.file(new=True, force=True)
+    results['pymel'] = _time_operations(
+        count,
+        create=lambda name: pm.createNode('transform', name=name),
+        connect=lambda a, b: pm.connectAttr(a.translateX, b.rotateX),
+        set_value=lambda n: n.scale.set(2, 2, 2),
+        relatives=lambda n: pm.listRelatives(n, children=True),
+        get_matrix=lambda n: pm.xform(n, query=True, worldSpace=True, matrix=True),
+        parent_to=lambda a, b: pm.parent(a, b),
+    )
+
+    for op in results['node_handle']:
+        fast, slow = results['node_handle'][op], results['pymel'][op]
+        print(f"{op:<14} node_handle {fast:.3f}s  pymel {slow:.3f}s  x{slow / fast if fast else 0:.1f}")
+    return results
@@ -0,0 +1,134 @@
+"""
+리그 평가 성능 프로파일러
+
+씬을 열거나 빌드 함수로 리그를 만든 뒤, DG / parallel 평가 모드에서 프레임 범위를 재생하며
+Maya profiler 이벤트로 노드별 평가 시간을 모읍니다.
+결과는 JSON 으로 저장할 수 있어서 리그 성능 변화를 계속 추적할 수 있습니다.
+
+사용 예:
+    from core.utils import rig_profiler
+
+    report = rig_profiler.profile_rig(scene='/path/rig_v003.ma', start=1, end=120,
+                                      output='/tmp/rig_v003_profile.json')
+
+    from auto_ball_rig import BallAutoRig
+    report = rig_profiler.profile_rig(build=lambda: BallAutoRig().construct_rig())
+"""
+
+import json
+import time
+import datetime
+
+import maya.cmds as mc
+
+EVALUATION_MODES = ('off', 'parallel')
+
+
+def count_graph():
+    """씬의 DG 노드 수와 커넥션 수를 반환"""
+    nodes = mc.ls(dependencyNodes=True) or []
+    # 목적지 기준으로 세면 커넥션 하나가 한 번만 세어진다
+    connections = mc.listConnections(nodes, source=True, destination=False, connections=True, plugs=True) or []
+    return {'nodes': len(nodes), 'connections': len(connections) // 2}
+
+
+def _collect_profiler_events():
+    """profiler 버퍼의 이벤트를 노드 이름 기준으로 합산 (duration 은 마이크로초)"""
+    per_node = {}
+    event_count = mc.profiler(query=True, eventCount=True) or 0
+    for index in range(event_count):
+        name = mc.profiler(query=True, eventIndex=index, eventName=True)
+        if not name or not mc.objExists(name):
+            continue
+        duration = mc.profiler(query=True, eventIndex=index, eventDuration=True) or 0
+        per_node[name] = per_node.get(name, 0.0) + duration
+    return per_node
+
+
+def _scrub(frames, evaluation_mode):
+    """평가 모드를 바꾸고 그래프를 준비한 뒤 frames 를 재생, 걸린 시간(초)을 반환"""
+    mc.evaluationManager(mode=evaluation_mode)
+    if evaluation_mode != 'off':
+        mc.evaluationManager(invalidate=True)
+
+    # 워밍업: 평가 그래프 생성 비용은 측정에서 제외
+    for frame in frames[:2]:
+        mc.currentTime(frame, update=True)
+
+    mc.profiler(reset=True)
+    mc.profiler(sampling=True)
+    start = time.perf_counter()
+    for frame in frames:
+        mc.currentTime(frame, update=True)
+    elapsed = time.perf_counter() - start
+    mc.profiler(sampling=False)
+    return elapsed
+
+
+def _summarize(per_node, top):
+    per_type = {}
+    for node, duration in per_node.items():
+        node_type = mc.nodeType(node)
+        per_type[node_type] = per_type.get(node_type, 0.0) + duration
+
+    def _ranked(values):
+        ranked = sorted(values.items(), key=lambda item: item[1], reverse=True)[:top]
+        return [{'name': name, 'ms': duration / 1000.0} for name, duration in ranked]
+
+    return _ranked(per_type), _ranked(per_node)
+
+
+def profile_rig(scene=None, build=None, start=None, end=None, modes=EVALUATION_MODES, top=10,
+                buffer_size=200, output=None):
+    """
+    리그를 준비하고 평가 모드별로 재생해서 성능 리포트를 만든다.
+
+    :param scene: 열어볼 씬 경로 (None 이면 현재 씬 사용)
+    :param build: 씬을 연 뒤 리그를 만드는 함수 (예: BallAutoRig().construct_rig)
+    :param start/end: 재생 프레임 범위 (None 이면 플레이백 범위)
+    :param modes: evaluationManager 모드 목록 ('off' = DG, 'parallel', 'serial')
+    :param top: 리포트에 남길 상위 노드/노드타입 개수
+    :param buffer_size: profiler 버퍼 크기(MB)
+    :param output: JSON 리포트 저장 경로
+    :return: 리포트 dict
+    """
+    if scene:
+        mc.file(scene, open=True, force=True)
+    if build:
+        build()
+
+    start = mc.playbackOptions(query=True, minTime=True) if start is None else start
+    end = mc.playbackOptions(query=True, maxTime=True) if end is None else end
+    frames = [start + i for i in range(int(end - start) + 1)]
+
+    original_mode = mc.evaluationManager(query=True, mode=True)[0]
+    mc.profiler(bufferSize=buffer_size)
+
+    report = {
+        'scene': mc.file(query=True, sceneName=True),
+        'maya_version': mc.about(version=True),
+        'timestamp': datetime.datetime.now().isoformat(timespec='seconds'),
+        'frame_range': [start, end],
+        'graph': count_graph(),
+        'modes': {},
+    }
+
+    try:
+        for mode in modes:
+            elapsed = _scrub(frames, mode)
+            top_types, top_nodes = _summarize(_collect_profiler_events(), top)
+            report['modes'][mode] = {
+                'seconds': elapsed,
+                'fps': len(frames) / elapsed if elapsed else 0.0,
+                'top_node_types': top_types,
+                'top_nodes': top_nodes,
+            }
+            print(f"[{mode}] {report['modes'][mode]['fps']:.1f} fps ({elapsed:.3f}s / {len(frames)} frames)")
+    finally:
+        mc.evaluationManager(mode=original_mode)
+
+    if output:
+        with open(output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+
+    return report
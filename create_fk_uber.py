@@ -1,7 +1,12 @@
-import pymel.core as pm
+import time
+
+import maya.cmds as cmds
+
+from core.utils import node_handle as nh
 '''
     상단의 3개의 함수는 uber그룹을 찾고 만들기위한 함수로 환경 탐색 및 준비 단계 이고 아래쪽 함수 2개는 연결해주는걸로 fk_data_list를 만들어서 전달
     즉 준비단계와 연결단계가 분리되어 있는 상황
+    탐색은 HierarchyIndex 로 root 당 한 번만 계층을 쿼리하고, 같은 root 를 여러 번 탐색할 때는 index 를 넘겨서 재사용한다.
     
     fk구조에서 중간에 컨스트레인이 걸려서 부모의 위치값을 자식에게 전달을 못하는데 uber라는 트랜스폼이 이동값을 계산해서 넘겨주는 구조로 총 4개의 트랜스폼이
     매트릭스로 곱해서 계산을 해준다.
@@ -9,85 +14,168 @@ import pymel.core as pm
     컨스트레인된 부모그룹, 부모 컨트롤러, 컨스트레인된 자식 그룹, 자식의 uber 가 필요 곱샘순서는 아래 코드 참조
     
 '''
-def get_fk_controls_from_root(root):
-    shapes = pm.listRelatives(root, ad=True, type='nurbsCurve') or []
-    ctrls_set = set()
+class HierarchyIndex(object):
+    '''
+    root 아래 계층을 한 번의 cmds.ls 쿼리로 스냅샷해서 parent/children/type 딕셔너리로 들고 있는 인덱스
+    컨트롤 탐색, 컨스트레인 탐색, 부모 찾기를 노드별 쿼리 없이 메모리에서 처리한다.
+    키는 모두 long name(|a|b|c) 이고 결과를 돌려줄 때만 NodeHandle 로 바꾼다.
+    '''
+    def __init__(self, root):
+        self.root = cmds.ls(str(root), long=True)[0]
+        self.type_of = {}
+        self.parent_of = {}
+        self.children_of = {}
+        self._inherited_cache = {}
+
+        # [name, type, name, type, ...] 형태로 root 포함 전체 dag 를 한 번에 받는다
+        listing = cmds.ls(self.root, dag=True, long=True, showType=True) or []
+        for node, node_type in zip(listing[0::2], listing[1::2]):
+            self.type_of[node] = node_type
+            if node == self.root:
+                continue
+            parent = node.rsplit('|', 1)[0]
+            self.parent_of[node] = parent
+            self.children_of.setdefault(parent, []).append(node)
+
+    def is_type(self, node, base_type):
+        node_type = self.type_of[node]
+        if node_type not in self._inherited_cache:
+            inherited = cmds.nodeType(node_type, isTypeName=True, inherited=True) or [node_type]
+            self._inherited_cache[node_type] = set(inherited)
+        return base_type in self._inherited_cache[node_type]
+
+    def descendants(self, base_type=None):
+        return [n for n in self.parent_of if base_type is None or self.is_type(n, base_type)]
+
+    def _key(self, node):
+        node = str(node)
+        if node in self.type_of:
+            return node
+        return cmds.ls(node, long=True)[0]
+
+    def parent(self, node):
+        return self.parent_of.get(self._key(node))
 
-    for shape in shapes:
-        transform = pm.listRelatives(shape, p=True)[0]
-        ctrls_set.add(transform)
+    def children(self, node):
+        return list(self.children_of.get(self._key(node), []))
 
-    ctrls = list(ctrls_set)
-    return ctrls
+    def constrained_transforms(self):
+        constrained = {self.parent_of[c] for c in self.descendants('constraint')}
+        constrained.discard(self.root)
+        return sorted(constrained)
 
-def get_constrained_transforms(root):
-    transforms = pm.listRelatives(root,ad=True, type='transform') or []
-    constrained_set = set()
-    print(transforms)
-    for transform in transforms:
-        cons = pm.listRelatives(transform, type='constraint') or []
-        if cons:
-            constrained_set.add(transform)
+    def fk_controls(self):
+        return sorted({self.parent_of[s] for s in self.descendants('nurbsCurve')})
 
-    constrained_transforms = list(constrained_set)
-    return constrained_transforms
+
+def get_fk_controls_from_root(root, index=None):
+    index = index or HierarchyIndex(root)
+    return nh.as_nodes(index.fk_controls())
+
+def get_constrained_transforms(root, index=None):
+    index = index or HierarchyIndex(root)
+    return nh.as_nodes(index.constrained_transforms())
 
 def insert_uber_transform(constrained_transforms):
     uber_grps = []
 
     for transform in constrained_transforms:
-        if not pm.objExists(transform):
-            pm.warning(f"f[skip] not exists: {transform}")
+        if not cmds.objExists(str(transform)):
+            cmds.warning(f"f[skip] not exists: {transform}")
             continue
-        uber_name = f"{transform}_uber"
-        if pm.objExists(uber_name):
+        transform = nh.as_node(transform)
+        uber_name = f"{transform.node_name()}_uber"
+        if cmds.objExists(uber_name):
             continue
 
-        children = pm.listRelatives(transform, children=True, path=True) or [None]
+        children = cmds.listRelatives(str(transform), children=True, type="transform", fullPath=True) or []
 
         children = [
             c for c in children
-            if pm.nodeType(c) == "transform" and "Constraint" not in pm.nodeType(c)
+            if cmds.nodeType(c) == "transform" and "Constraint" not in cmds.nodeType(c)
         ]
 
-        uber = pm.createNode("transform", n=uber_name, p=transform)
+        uber = nh.create_node("transform", name=uber_name, parent=transform)
 
-        wm = pm.xform(transform, q=True, ws=True, m=True)
-        pm.xform(uber, ws=True, m=wm)
+        wm = nh.xform(transform, q=True, ws=True, m=True)
+        nh.xform(uber, ws=True, m=wm)
 
-        for child in children:
-            pm.parent(child, uber)
+        if children:
+            nh.parent(children, uber)
 
         uber_grps.append(uber)
 
     return uber_grps
 
 
-def create_fk_uber(fk_data):
+UBER_MODE_LEGACY = 'legacy'
+UBER_MODE_COMPACT = 'compact'
+UBER_MODE_OFFSET_PARENT = 'offset_parent'
+UBER_MODES = (UBER_MODE_LEGACY, UBER_MODE_COMPACT, UBER_MODE_OFFSET_PARENT)
+
+
+def create_fk_uber(fk_data, mode=UBER_MODE_LEGACY):
+    '''
+    mode
+        legacy        : multMatrix 3개 + decomposeMatrix (기존 방식)
+        compact       : 4개 입력을 받는 multMatrix 1개 + decomposeMatrix
+        offset_parent : multMatrix 1개를 uber 의 offsetParentMatrix 에 바로 연결 (decompose 없음, Maya 2020+)
+                        offsetParentMatrix 를 지원하지 않으면 compact 로 대체
+                        translate/rotate 만 받던 기존 방식과 달리 곱한 매트릭스의 스케일도 같이 전달된다.
+    '''
+    if mode not in UBER_MODES:
+        raise ValueError(f"unknown uber mode: {mode} (expected one of {UBER_MODES})")
+
+    constrained_parent_transform = nh.as_node(fk_data[0])
+    parent_ctrl = nh.as_node(fk_data[1])
+    constrained_child_transform = nh.as_node(fk_data[2])
+    uber_grp = nh.as_node(fk_data[3])
+
+    if mode == UBER_MODE_LEGACY:
+        _create_legacy_uber_network(constrained_parent_transform, parent_ctrl, constrained_child_transform, uber_grp)
+        return
 
-    constrained_parent_transform = fk_data[0]
-    parent_ctrl = fk_data[1]
-    constrained_child_transform = fk_data[2]
-    uber_grp = fk_data[3]
+    if mode == UBER_MODE_OFFSET_PARENT and not uber_grp.has_attr('offsetParentMatrix'):
+        cmds.warning(f"offsetParentMatrix not available, fallback to compact: {uber_grp}")
+        mode = UBER_MODE_COMPACT
 
+    mm_uber_con = nh.create_node('multMatrix', name=f'{uber_grp.node_name()}_multMatrix')
+    nh.connect_attr(constrained_child_transform.worldMatrix[0], mm_uber_con.matrixIn[0], force=True)
+    nh.connect_attr(constrained_parent_transform.worldInverseMatrix[0], mm_uber_con.matrixIn[1], force=True)
+    nh.connect_attr(parent_ctrl.worldMatrix[0], mm_uber_con.matrixIn[2], force=True)
+    nh.connect_attr(constrained_child_transform.worldInverseMatrix[0], mm_uber_con.matrixIn[3], force=True)
 
-    mm_uber_con_0 = pm.createNode('multMatrix',name =f'{uber_grp}_multMatrix_0')
-    mm_uber_con_1 = pm.createNode('multMatrix',name =f'{uber_grp}_multMatrix_1')
-    mm_uber_con_2 = pm.createNode('multMatrix',name =f'{uber_grp}_multMatrix_2')
-    dm_uber_con = pm.createNode('decomposeMatrix', name = f'{uber_grp}_decomposeMatrix')
+    if mode == UBER_MODE_OFFSET_PARENT:
+        # 로컬 트랜스폼은 identity 로 두고 offsetParentMatrix 가 전체를 담당
+        uber_grp.translate.set(0, 0, 0)
+        uber_grp.rotate.set(0, 0, 0)
+        nh.connect_attr(mm_uber_con.matrixSum, uber_grp.offsetParentMatrix, force=True)
+        return
 
-    pm.connectAttr(constrained_child_transform.worldMatrix[0] ,mm_uber_con_0.matrixIn[0],force=True)
-    pm.connectAttr(constrained_parent_transform.worldInverseMatrix[0], mm_uber_con_0.matrixIn[1],force=True)
-    pm.connectAttr(mm_uber_con_0.matrixSum,mm_uber_con_1.matrixIn[0], force = True)
-    pm.connectAttr(parent_ctrl.worldMatrix[0],mm_uber_con_1.matrixIn[1], force = True)
-    pm.connectAttr(mm_uber_con_1.matrixSum,mm_uber_con_2.matrixIn[0], force=True)
-    pm.connectAttr(constrained_child_transform.worldInverseMatrix[0],mm_uber_con_2.matrixIn[1], force=True)
-    pm.connectAttr(mm_uber_con_2.matrixSum,dm_uber_con.inputMatrix, force=True)
+    dm_uber_con = nh.create_node('decomposeMatrix', name=f'{uber_grp.node_name()}_decomposeMatrix')
+    nh.connect_attr(mm_uber_con.matrixSum, dm_uber_con.inputMatrix, force=True)
+    nh.connect_attr(dm_uber_con.outputTranslate, uber_grp.translate, force=True)
+    nh.connect_attr(dm_uber_con.outputRotate, uber_grp.rotate, force=True)
 
-    pm.connectAttr(dm_uber_con.outputTranslate,uber_grp.translate,force=True)
-    pm.connectAttr(dm_uber_con.outputRotate, uber_grp.rotate, force=True)
 
-def create_fk_uber_batch(fk_data_list):
+def _create_legacy_uber_network(constrained_parent_transform, parent_ctrl, constrained_child_transform, uber_grp):
+    mm_uber_con_0 = nh.create_node('multMatrix',name=f'{uber_grp.node_name()}_multMatrix_0')
+    mm_uber_con_1 = nh.create_node('multMatrix',name=f'{uber_grp.node_name()}_multMatrix_1')
+    mm_uber_con_2 = nh.create_node('multMatrix',name=f'{uber_grp.node_name()}_multMatrix_2')
+    dm_uber_con = nh.create_node('decomposeMatrix', name=f'{uber_grp.node_name()}_decomposeMatrix')
+
+    nh.connect_attr(constrained_child_transform.worldMatrix[0] ,mm_uber_con_0.matrixIn[0],force=True)
+    nh.connect_attr(constrained_parent_transform.worldInverseMatrix[0], mm_uber_con_0.matrixIn[1],force=True)
+    nh.connect_attr(mm_uber_con_0.matrixSum,mm_uber_con_1.matrixIn[0], force = True)
+    nh.connect_attr(parent_ctrl.worldMatrix[0],mm_uber_con_1.matrixIn[1], force = True)
+    nh.connect_attr(mm_uber_con_1.matrixSum,mm_uber_con_2.matrixIn[0], force=True)
+    nh.connect_attr(constrained_child_transform.worldInverseMatrix[0],mm_uber_con_2.matrixIn[1], force=True)
+    nh.connect_attr(mm_uber_con_2.matrixSum,dm_uber_con.inputMatrix, force=True)
+
+    nh.connect_attr(dm_uber_con.outputTranslate,uber_grp.translate,force=True)
+    nh.connect_attr(dm_uber_con.outputRotate, uber_grp.rotate, force=True)
+
+def create_fk_uber_batch(fk_data_list, mode=UBER_MODE_LEGACY):
     '''
     fk_data_list = [
         [constrained_parent_transform1, parent_ctrl1, constrained_child_transform1, uber_grp1],
@@ -97,5 +185,185 @@ def create_fk_uber_batch(fk_data_list):
     '''
 
     for fk_data in fk_data_list:
-        create_fk_uber(fk_data)
+        create_fk_uber(fk_data, mode=mode)
+
+
+class FkUberPlan(object):
+    '''
+    root 에서 자동으로 만든 uber 작업 계획
+    적용 전에 확인할 수 있도록 모든 값은 long name 문자열로 들고 있다.
+
+    steps   : [{'constrained_parent', 'parent_ctrl', 'constrained_child', 'uber', 'children'}, ...]
+    skipped : 상위에 컨트롤/컨스트레인 부모가 없어서 uber 가 필요없는 컨스트레인 트랜스폼
+    errors  : 적용하면 안되는 문제들 (비어있어야 apply 가능)
+    '''
+    def __init__(self, root):
+        self.root = root
+        self.steps = []
+        self.skipped = []
+        self.errors = []
+
+    @property
+    def is_valid(self):
+        return not self.errors
+
+    @property
+    def fk_data_list(self):
+        return [[s['constrained_parent'], s['parent_ctrl'], s['constrained_child'], s['uber']] for s in self.steps]
+
+    def __repr__(self):
+        return f"<FkUberPlan root={self.root} steps={len(self.steps)} skipped={len(self.skipped)} errors={len(self.errors)}>"
+
+
+def _find_ancestor(index, node, candidates):
+    parent = index.parent_of.get(node)
+    while parent is not None:
+        if parent in candidates:
+            return parent
+        parent = index.parent_of.get(parent)
+    return None
+
+
+def plan_fk_uber(root, index=None):
+    '''
+    root 아래 컨트롤/컨스트레인 탐색 결과로 fk_data_list 를 자동으로 만들고 검증한다. 씬은 수정하지 않는다.
+    컨스트레인된 자식 그룹 -> 위로 올라가며 처음 만나는 컨트롤(parent_ctrl) -> 그 위의 컨스트레인된 부모 그룹 순서로 찾는다.
+    '''
+    index = index or HierarchyIndex(root)
+    plan = FkUberPlan(index.root)
+
+    constrained = index.constrained_transforms()
+    constrained_set = set(constrained)
+    ctrls = set(index.fk_controls())
+    uber_names = {}
+
+    for child in constrained:
+        parent_ctrl = _find_ancestor(index, child, ctrls)
+        constrained_parent = _find_ancestor(index, parent_ctrl, constrained_set) if parent_ctrl else None
+        if not (parent_ctrl and constrained_parent):
+            plan.skipped.append(child)
+            continue
+
+        uber = f"{child.rsplit('|', 1)[-1]}_uber"
+        if cmds.objExists(uber):
+            plan.errors.append(f"uber already exists: {uber}")
+        if uber in uber_names:
+            plan.errors.append(f"duplicated uber name: {uber} ({uber_names[uber]}, {child})")
+        uber_names[uber] = child
+
+        children = [c for c in index.children_of.get(child, []) if index.type_of[c] == 'transform']
+        plan.steps.append({
+            'constrained_parent': constrained_parent,
+            'parent_ctrl': parent_ctrl,
+            'constrained_child': child,
+            'uber': uber,
+            'children': children,
+        })
+
+    return plan
+
+
+def apply_fk_uber_plan(plan, mode=UBER_MODE_LEGACY):
+    '''
+    plan_fk_uber 결과를 한 번에 적용한다. uber 생성, 자식 reparent, 매트릭스 연결이 undo 한 번으로 묶인다.
+    reparent 하면 long name 이 바뀌기 때문에 시작하기 전에 모든 노드를 NodeHandle 로 잡아둔다.
+    '''
+    if not plan.is_valid:
+        raise RuntimeError("invalid fk uber plan:\n" + "\n".join(plan.errors))
+
+    resolved = [
+        {
+            'constrained_parent': nh.as_node(step['constrained_parent']),
+            'parent_ctrl': nh.as_node(step['parent_ctrl']),
+            'constrained_child': nh.as_node(step['constrained_child']),
+            'uber': step['uber'],
+            'children': nh.as_nodes(step['children']),
+        }
+        for step in plan.steps
+    ]
+
+    fk_data_list = []
+    cmds.undoInfo(openChunk=True, chunkName='apply_fk_uber_plan')
+    try:
+        for step in resolved:
+            # 컨스트레인 그룹 바로 아래 identity 로 만들기 때문에 월드 매트릭스를 따로 맞출 필요가 없다
+            uber = nh.create_node('transform', name=step['uber'], parent=step['constrained_child'])
+            if step['children']:
+                nh.parent(step['children'], uber)
+            fk_data_list.append([step['constrained_parent'], step['parent_ctrl'], step['constrained_child'], uber])
+
+        create_fk_uber_batch(fk_data_list, mode=mode)
+    finally:
+        cmds.undoInfo(closeChunk=True)
+
+    return fk_data_list
+
+
+def _build_benchmark_fk_chain(length):
+    '''
+    벤치마크용 FK 체인 생성
+    con(parentConstraint 걸림) > ctrl > 다음 con ... 구조로 만들고 uber 를 끼운 뒤 fk_data_list 를 반환
+    '''
+    root = nh.group('fk_bench_root')
+    drivers = nh.group('fk_bench_drivers')
+    parent = root
+    cons, ctrls = [], []
+    for i in range(length):
+        con = nh.group(f'fk_bench_{i:03d}_con', parent_node=parent)
+        if i:
+            con.translateX.set(2)
+        ctrl = nh.as_node(cmds.circle(name=f'fk_bench_{i:03d}_ctrl', normal=(1, 0, 0), constructionHistory=False)[0])
+        nh.parent(ctrl, con, relative=True)
+
+        driver = nh.group(f'fk_bench_{i:03d}_driver', parent_node=drivers)
+        nh.xform(driver, ws=True, m=nh.xform(con, q=True, ws=True, m=True))
+        nh.parent_constraint(driver, con, maintainOffset=True)
+
+        cons.append(con)
+        ctrls.append(ctrl)
+        parent = ctrl
+
+    ubers = insert_uber_transform(cons)
+    fk_data_list = [[cons[i - 1], ctrls[i - 1], cons[i], ubers[i]] for i in range(1, length)]
+    return ctrls, fk_data_list
+
+
+def benchmark_uber_networks(chain_length=100, frames=100, modes=UBER_MODES, evaluation_mode='off'):
+    '''
+    같은 FK 체인에 mode 별 uber 네트워크를 만들고 재생 평가 시간을 비교한다.
+    mode 마다 새 씬을 열기 때문에 현재 씬은 저장하지 않고 버려진다.
+
+    evaluation_mode : cmds.evaluationManager 모드 ('off' = DG, 'parallel', 'serial')
+    반환값 : {mode: {'nodes': uber 네트워크 노드 수, 'seconds': 재생 시간, 'fps': 초당 프레임}}
+    '''
+    results = {}
+    for mode in modes:
+        cmds.file(new=True, force=True)
+        ctrls, fk_data_list = _build_benchmark_fk_chain(chain_length)
+
+        before = set(cmds.ls(type=('multMatrix', 'decomposeMatrix')) or [])
+        create_fk_uber_batch(fk_data_list, mode=mode)
+        network_nodes = set(cmds.ls(type=('multMatrix', 'decomposeMatrix')) or []) - before
+
+        # 체인 전체가 매 프레임 다시 계산되도록 루트 컨트롤에 애니메이션
+        cmds.setKeyframe(str(ctrls[0]), attribute='rotateZ', time=1, value=0)
+        cmds.setKeyframe(str(ctrls[0]), attribute='rotateZ', time=frames, value=90)
+
+        cmds.evaluationManager(mode=evaluation_mode)
+        cmds.currentTime(1, update=True)
+        start = time.perf_counter()
+        for frame in range(1, frames + 1):
+            cmds.currentTime(frame, update=True)
+            # 마지막 uber 까지 평가되도록 말단 컨트롤의 월드 매트릭스를 당긴다
+            cmds.getAttr(f'{ctrls[-1]}.worldMatrix[0]')
+        elapsed = time.perf_counter() - start
+
+        results[mode] = {
+            'nodes': len(network_nodes),
+            'seconds': elapsed,
+            'fps': frames / elapsed if elapsed else 0.0,
+        }
+        print(f"[{mode}] nodes: {len(network_nodes)}  time: {elapsed:.3f}s  fps: {results[mode]['fps']:.1f}")
+
+    return results
 
@@ -0,0 +1,112 @@
+"""
+가짜 Maya 백엔드로 익스포터와 스케줄러를 확인하는 테스트 (Maya 없이 리눅스 CI 에서 실행)
+
+    python -m pytest func/yeti_standalone_export
+"""
+
+import os
+import sys
+
+import pytest
+
+import yeti_export_backend as backend_util
+import yeti_export_staging as staging_util
+import yeti_standalone_export as exporter_util
+from yeti_export_benchmark import make_fake_scene, _checksums
+from yeti_export_scheduler import YetiExportScheduler
+
+NODE_COUNT = 3
+START, END = 1001, 1012
+
+
+@pytest.fixture
+def scene_file(tmp_path):
+    exporter_util.set_backend(backend_util.FakeMayaBackend())
+    yield make_fake_scene(str(tmp_path), NODE_COUNT, START, END, frame_size=256, seconds_per_frame=0.0)
+    exporter_util.uninitialize_standalone()
+
+
+def _export(scene_file, **kwargs):
+    exporter = exporter_util.YetiCacheExporter(scene_file=scene_file, **kwargs)
+    return exporter, exporter.export()
+
+
+def test_serial_export_writes_every_frame(scene_file):
+    exporter, paths = _export(scene_file)
+    start, end = exporter._get_frame_range()
+
+    assert len(paths) == NODE_COUNT
+    for path in paths:
+        assert all(os.path.isfile(path % frame) for frame in range(start, end + 1))
+
+
+def test_dry_run_counts_every_frame(scene_file):
+    exporter = exporter_util.YetiCacheExporter(scene_file=scene_file)
+    plan = exporter.plan(sample=False)
+    # 프레임 범위는 plan 이 씬을 연 뒤에 조회
+    start, end = exporter._get_frame_range()
+
+    assert plan["totals"]["frames"] == NODE_COUNT * (end - start + 1)
+
+
+def test_resume_restores_removed_frames(scene_file):
+    exporter, paths = _export(scene_file)
+    start, end = exporter._get_frame_range()
+    serial = _checksums(paths, start, end)
+
+    removed = list(range(start, end + 1, 3))
+    for frame in removed:
+        os.remove(paths[0] % frame)
+    _export(scene_file, resume=True)
+
+    assert _checksums(paths, start, end) == serial
+
+
+def test_skip_up_to_date_leaves_frames_untouched(scene_file):
+    exporter, paths = _export(scene_file)
+    start, end = exporter._get_frame_range()
+    mtimes = {path: os.stat(path % start).st_mtime_ns for path in paths}
+
+    _export(scene_file, skip_up_to_date=True)
+
+    assert {path: os.stat(path % start).st_mtime_ns for path in paths} == mtimes
+
+
+def test_frame_watcher_reports_frame_after_next_is_written(tmp_path):
+    cache_path = str(tmp_path / "fur.%04d.fur")
+    old_path = cache_path % 1
+    with open(old_path, "w") as f:
+        f.write("old")
+    reported = []
+    watcher = staging_util.FrameWatcher(cache_path, lambda frame, path: reported.append(frame), frames=[1, 2, 3])
+
+    # 기존 파일은 다시 쓰이기 전까지 알리지 않음
+    watcher.scan()
+    assert reported == []
+
+    for frame in (1, 2):
+        with open(cache_path % frame, "w") as f:
+            f.write("new")
+        os.utime(cache_path % frame, ns=(0, 0))
+    watcher.scan()
+    assert reported == [1]
+
+    with open(cache_path % 3, "w") as f:
+        f.write("new")
+    watcher.scan(flush=True)
+    assert reported == [1, 2, 3]
+
+
+def test_sharded_scheduler_matches_serial(scene_file, monkeypatch):
+    exporter, paths = _export(scene_file)
+    start, end = exporter._get_frame_range()
+    serial = _checksums(paths, start, end)
+
+    # 워커는 현재 python 으로 띄우고 환경변수로 가짜 백엔드를 사용
+    monkeypatch.setenv(backend_util.BACKEND_ENV, "fake")
+    scheduler = YetiExportScheduler(scene_file=scene_file, mayapy=sys.executable, max_workers=2,
+                                    worker_memory_gb=0, shards=2)
+    result = scheduler.run()
+
+    assert result["success"]
+    assert _checksums(result["exported_paths"], start, end) == serial
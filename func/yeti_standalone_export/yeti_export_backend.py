@@ -0,0 +1,183 @@
+"""
+Yeti Cache Export Backend
+
+익스포터가 사용하는 Maya 를 교체할 수 있게 합니다.
+- MayaBackend     : maya.standalone / maya.cmds (기본값)
+- FakeMayaBackend : 메모리 안의 가짜 Maya. Maya 가 없는 리눅스 CI 에서 경로 계산, 노드 선택, 샤드, resume,
+                    스케줄러 동작을 실행하고 시간을 잴 수 있습니다.
+
+환경변수 YETI_EXPORT_BACKEND=fake 면 FakeMayaBackend 를 사용합니다. (스케줄러가 띄우는 워커에도 그대로 전달됨)
+가짜 Maya 에서 씬 파일은 JSON 씬 설명입니다:
+    {
+        "playback": [1001, 1100],
+        "nodes": {
+            "dogA:dog_yeti": {"frame_size": 4096, "seconds_per_frame": 0.01},
+            "cat_body_yeti": {}
+        }
+    }
+노드 키는 트랜스폼 이름이고, 쉐입은 '<트랜스폼>Shape' 입니다.
+"""
+
+import os
+import json
+import time
+
+BACKEND_ENV = "YETI_EXPORT_BACKEND"
+DEFAULT_FRAME_SIZE = 1024
+
+# pgYetiCommand 의 range 키워드가 내장 range 를 가리므로 따로 잡아둔다
+_range = range
+
+
+class MayaBackend:
+    """실제 maya.standalone. maya 모듈은 initialize 할 때 import 합니다."""
+
+    name = "maya"
+
+    def __init__(self):
+        self.cmds = None
+
+    def initialize(self):
+        import maya.standalone
+        maya.standalone.initialize(name="python")
+        import maya.cmds
+        self.cmds = maya.cmds
+
+    def uninitialize(self):
+        import maya.standalone
+        maya.standalone.uninitialize()
+
+
+class FakeCmds:
+    """익스포터가 사용하는 maya.cmds 명령만 흉내낸 메모리 안의 씬"""
+
+    def __init__(self):
+        self.scene_file = None
+        self.playback = (1, 1)
+        self.nodes = {}  # transform -> {"shape", "frame_size", "seconds_per_frame"}
+        self.frames_written = 0
+
+    # ------- 씬 -------- #
+    def file(self, path=None, o=False, force=False, new=False, query=False, q=False, sceneName=False,
+             loadReferenceDepth=None, loadReference=None):
+        if query or q:
+            return self.scene_file or ""
+        if new:
+            self.scene_file, self.playback, self.nodes = None, (1, 1), {}
+            return None
+        if loadReference:
+            raise RuntimeError(f"가짜 씬에는 레퍼런스가 없습니다: {loadReference}")
+        if o:
+            with open(path, "r", encoding="utf-8") as f:
+                description = json.load(f)
+            self.scene_file = path
+            self.playback = tuple(description.get("playback", (1, 1)))
+            self.nodes = {}
+            for transform, info in description.get("nodes", {}).items():
+                self.nodes[transform] = {
+                    "shape": info.get("shape", f"{transform}Shape"),
+                    "frame_size": info.get("frame_size", DEFAULT_FRAME_SIZE),
+                    "seconds_per_frame": info.get("seconds_per_frame", 0.0),
+                }
+            return path
+        raise RuntimeError("지원하지 않는 file 명령입니다.")
+
+    def playbackOptions(self, q=False, query=False, min=False, max=False):
+        return float(self.playback[0] if min else self.playback[1])
+
+    # ------- 노드 조회 -------- #
+    def _shape_to_transform(self, name):
+        name = name.split("|")[-1]
+        for transform, info in self.nodes.items():
+            if name == info["shape"]:
+                return transform
+        return None
+
+    def objExists(self, name):
+        name = name.split("|")[-1]
+        return name in self.nodes or self._shape_to_transform(name) is not None
+
+    def ls(self, *names, type=None, long=False):
+        if type == "pgYetiMaya":
+            return [info["shape"] for info in self.nodes.values()]
+        if type is not None:
+            return []
+        result = []
+        for name in names:
+            short = name.split("|")[-1]
+            transform = self._shape_to_transform(short)
+            if transform:
+                result.append(f"|{transform}|{short}" if long else short)
+            elif short in self.nodes:
+                result.append(f"|{short}" if long else short)
+        return result
+
+    def listRelatives(self, name, shapes=False, parent=False, type=None, fullPath=False):
+        # 가짜 씬의 트랜스폼은 모두 월드 바로 아래에 있다
+        short = name.split("|")[-1]
+        if parent:
+            transform = self._shape_to_transform(short)
+            if not transform:
+                return None
+            return [f"|{transform}" if fullPath else transform]
+        if shapes and short in self.nodes and type in (None, "pgYetiMaya"):
+            shape = self.nodes[short]["shape"]
+            return [f"|{short}|{shape}" if fullPath else shape]
+        return None
+
+    def listHistory(self, nodes, allConnections=False):
+        return list(nodes)
+
+    def referenceQuery(self, *args, **kwargs):
+        raise RuntimeError("가짜 씬에는 레퍼런스가 없습니다.")
+
+    # ------- 메모리 정리 (아무것도 하지 않음) -------- #
+    def flushUndo(self):
+        pass
+
+    def clearCache(self, all=False):
+        pass
+
+    # ------- Yeti -------- #
+    def pgYetiCommand(self, node=None, writeCache=None, range=None, samples=None, **flags):
+        """writeCache 면 range 의 프레임마다 노드/프레임으로 정해지는 더미 파일을 쓴다 (flush 플래그는 무시)"""
+        if writeCache is None:
+            return None
+        transform = self._shape_to_transform(node)
+        if transform is None:
+            raise RuntimeError(f"Yeti 노드가 없습니다: {node}")
+        info = self.nodes[transform]
+        for frame in _range(int(range[0]), int(range[1]) + 1):
+            if info["seconds_per_frame"]:
+                time.sleep(info["seconds_per_frame"])
+            seed = f"{info['shape']}:{frame}:{samples}\n".encode()
+            payload = (seed * (info["frame_size"] // len(seed) + 1))[:info["frame_size"]]
+            with open(writeCache % frame, "wb") as f:
+                f.write(payload)
+            self.frames_written += 1
+        return None
+
+
+class FakeMayaBackend:
+    """메모리 안의 가짜 Maya"""
+
+    name = "fake"
+
+    def __init__(self):
+        self.cmds = FakeCmds()
+
+    def initialize(self):
+        pass
+
+    def uninitialize(self):
+        pass
+
+
+def create_backend(name=None):
+    """이름('maya' / 'fake') 또는 YETI_EXPORT_BACKEND 환경변수로 백엔드 생성"""
+    name = name or os.environ.get(BACKEND_ENV, "maya")
+    if name == "fake":
+        return FakeMayaBackend()
+    if name == "maya":
+        return MayaBackend()
+    raise ValueError(f"알 수 없는 백엔드입니다: {name}")
@@ -0,0 +1,146 @@
+"""
+Yeti Cache Export Benchmark
+
+가짜 Maya 백엔드(yeti_export_backend.FakeMayaBackend)로 익스포터와 스케줄러를 Maya 없이 실행하고 시간을 잽니다.
+리눅스 CI 에서 경로 계산, 노드 선택, 샤드, resume, skip_up_to_date 동작을 확인할 때 사용합니다.
+
+    python yeti_export_benchmark.py --nodes 8 --frames 100 --frame_size 65536 --workers 4 --shards 2
+
+각 단계의 소요 시간과 확인 결과를 JSON 으로 출력하고, 확인이 하나라도 실패하면 exit 1 로 끝납니다.
+"""
+
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import tempfile
+
+import yeti_export_backend as backend_util
+import yeti_export_manifest as manifest_util
+import yeti_standalone_export as exporter_util
+from yeti_export_scheduler import YetiExportScheduler
+
+# _get_root_path 가 씬 경로 앞 9 조각을 프로젝트 루트로 쓴다
+ROOT_PATH_PARTS = 9
+
+
+def make_fake_scene(base_dir, node_count, start, end, frame_size, seconds_per_frame, version=1):
+    """base_dir 아래에 프로젝트 폴더 구조와 가짜 씬(JSON)을 만들고 씬 경로를 반환"""
+    depth = len(base_dir.replace("//", "/").split("/"))
+    if depth >= ROOT_PATH_PARTS:
+        raise RuntimeError(f"[ERROR] 벤치마크 폴더가 너무 깊습니다: {base_dir}")
+    root = os.path.join(base_dir, *[f"level{i}" for i in range(ROOT_PATH_PARTS - depth)])
+    scene_dir = os.path.join(root, "hair", "scenes")
+    os.makedirs(scene_dir, exist_ok=True)
+
+    nodes = {}
+    for index in range(node_count):
+        # 노드마다 비용이 다르도록 크기/시간을 늘려감
+        weight = index + 1
+        nodes[f"char{index}:char{index}_body_yeti"] = {
+            "frame_size": frame_size * weight,
+            "seconds_per_frame": seconds_per_frame * weight,
+        }
+    scene_file = os.path.join(scene_dir, f"bench_hair_v{version:03d}.json")
+    with open(scene_file, "w", encoding="utf-8") as f:
+        json.dump({"playback": [start, end], "nodes": nodes}, f, indent=1)
+    return scene_file
+
+
+def _timed(func):
+    start = time.time()
+    result = func()
+    return result, time.time() - start
+
+
+def _checksums(paths, start, end):
+    return {path: {frame: manifest_util.file_checksum(path % frame) for frame in range(start, end + 1)}
+            for path in paths}
+
+
+def run_benchmark(node_count=8, frames=100, frame_size=64 * 1024, seconds_per_frame=0.0, workers=4, shards=2,
+                  keep=False):
+    """
+    가짜 씬으로 직렬 익스포트, dry run, resume, skip_up_to_date, 스케줄러(샤드), 비용 기록 기반 스케줄러 실행을
+    차례로 재고 결과를 검증한다.
+    :return: {'timings': {...}, 'checks': {...}, 'scene_file': ...}
+    """
+    base_dir = tempfile.mkdtemp(prefix="yeti_bench_")
+    exporter_util.set_backend(backend_util.FakeMayaBackend())
+    timings, checks = {}, {}
+    try:
+        scene_file = make_fake_scene(base_dir, node_count, 1001, 1000 + frames, frame_size, seconds_per_frame)
+        cost_history = os.path.join(base_dir, "cost_history.json")
+
+        def _exporter(**kwargs):
+            return exporter_util.YetiCacheExporter(scene_file=scene_file, **kwargs)
+
+        # 직렬 익스포트에서 비용 기록을 남기고 마지막에 비용 기반 스케줄러가 사용
+        paths, timings["serial_export"] = _timed(lambda: _exporter(cost_history=cost_history).export())
+        start, end = _exporter()._get_frame_range()
+        serial = _checksums(paths, start, end)
+        checks["serial_nodes"] = len(paths) == node_count
+
+        plan, timings["dry_run"] = _timed(lambda: _exporter().plan(sample=False))
+        checks["dry_run_frames"] = plan["totals"]["frames"] == node_count * (end - start + 1)
+
+        # 첫 노드의 프레임 일부를 지우고 resume
+        removed = list(range(start, end + 1, 7))
+        for frame in removed:
+            os.remove(paths[0] % frame)
+        _, timings["resume"] = _timed(lambda: _exporter(resume=True).export())
+        checks["resume_restored"] = _checksums(paths[:1], start, end) == {paths[0]: serial[paths[0]]}
+
+        _, timings["skip_up_to_date"] = _timed(lambda: _exporter(skip_up_to_date=True).export())
+
+        # 스케줄러 워커는 현재 python 으로 띄우고 환경변수로 가짜 백엔드를 사용
+        previous_backend = os.environ.get(backend_util.BACKEND_ENV)
+        os.environ[backend_util.BACKEND_ENV] = "fake"
+        try:
+            scheduler = YetiExportScheduler(scene_file=scene_file, mayapy=sys.executable, max_workers=workers,
+                                            worker_memory_gb=0, shards=shards)
+            result, timings["scheduler"] = _timed(scheduler.run)
+
+            cost_scheduler = YetiExportScheduler(scene_file=scene_file, mayapy=sys.executable, max_workers=workers,
+                                                 worker_memory_gb=0, cost_history=cost_history)
+            cost_result, timings["scheduler_cost_history"] = _timed(cost_scheduler.run)
+        finally:
+            if previous_backend is None:
+                os.environ.pop(backend_util.BACKEND_ENV)
+            else:
+                os.environ[backend_util.BACKEND_ENV] = previous_backend
+        checks["scheduler_success"] = result["success"]
+        checks["scheduler_matches_serial"] = _checksums(result["exported_paths"], start, end) == serial
+        checks["cost_scheduler_success"] = cost_result["success"]
+        checks["cost_scheduler_matches_serial"] = _checksums(cost_result["exported_paths"], start, end) == serial
+    finally:
+        exporter_util.uninitialize_standalone()
+        if not keep:
+            shutil.rmtree(base_dir, ignore_errors=True)
+
+    return {"scene_file": scene_file, "nodes": node_count, "frames": end - start + 1,
+            "timings": timings, "checks": checks}
+
+
+def parse_args(args):
+    parser = argparse.ArgumentParser(description="Yeti exporter benchmark with a fake Maya backend")
+    parser.add_argument("--nodes", type=int, default=8, help="Yeti node count")
+    parser.add_argument("--frames", type=int, default=100, help="playback frame count (before padding)")
+    parser.add_argument("--frame_size", type=int, default=64 * 1024, help="bytes per frame of the lightest node")
+    parser.add_argument("--seconds_per_frame", type=float, default=0.0, help="compute time per frame of the lightest node")
+    parser.add_argument("--workers", type=int, default=4, help="scheduler worker count")
+    parser.add_argument("--shards", type=int, default=2, help="scheduler shard count")
+    parser.add_argument("--keep", action="store_true", help="keep the generated scene and caches")
+    return parser.parse_args(args)
+
+
+if __name__ == '__main__':
+
+    opts = parse_args(sys.argv[1:])
+    report = run_benchmark(node_count=opts.nodes, frames=opts.frames, frame_size=opts.frame_size,
+                           seconds_per_frame=opts.seconds_per_frame, workers=opts.workers, shards=opts.shards,
+                           keep=opts.keep)
+    print(json.dumps(report, indent=2))
+    sys.exit(0 if all(report["checks"].values()) else 1)
@@ -0,0 +1,157 @@
+"""
+Yeti Cache Export Cost History
+
+노드별 프레임당 익스포트 비용(시간, 크기)을 asset/part 이름으로 기록하고,
+스케줄러가 그 기록으로 노드와 프레임 샤드를 워커에 나눠 담을 수 있게 합니다.
+
+- 키는 _get_cache_path 와 같은 규칙(parse_node_name)으로 만든 'asset/part' 입니다.
+  네임스페이스는 빼기 때문에 dogA:dog_body_yeti 와 dogB:dog_body_yeti 는 같은 기록을 공유합니다.
+- 시간은 샘플 1 기준으로 저장하고, 조회할 때 샘플 수를 곱합니다.
+- 시간은 프리롤을 포함한 계산 프레임당 값입니다. (스케줄러가 샤드 비용을 계산할 때 프리롤 프레임을 더함)
+- 여러 워커가 동시에 기록하므로 잠금 파일로 읽기-병합-쓰기를 묶습니다. (fcntl 이 없으면 잠금 없이 기록)
+
+Maya 없이 동작합니다.
+"""
+
+import os
+import json
+import time
+import heapq
+import contextlib
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+COST_HISTORY_ENV = "YETI_COST_HISTORY"
+HISTORY_VERSION = 1
+# 새 기록이 평균에 반영되는 비율
+SMOOTHING = 0.3
+
+
+def parse_node_name(node):
+    """
+    Yeti 쉐입 이름에서 (namespace, asset_name, part_name) 추출 (_get_cache_path 규칙)
+    'dogA:dog_body_yetiShape' -> ('dogA', 'dog', 'body')
+    'dog_yetiShape'           -> (None, 'dog', 'main')
+    """
+    node_clean = node.split("|")[-1]
+
+    # 네임스페이스 분리
+    if ":" in node_clean:
+        namespace, base_name = node_clean.split(":", 1)
+    else:
+        namespace, base_name = None, node_clean
+
+    # 노드에서 _yetiShape 제거
+    base_name = base_name.replace("_yetiShape", "")
+
+    # assetName / partName 추출
+    if "_" in base_name:
+        asset_name, part_name = base_name.split("_", 1)
+    else:
+        asset_name, part_name = base_name, "main"
+
+    # part_name에서 _yeti 제거
+    if part_name.endswith("_yeti"):
+        part_name = part_name.rsplit("_", 1)[0]
+
+    return namespace, asset_name, part_name
+
+
+def cost_key(node):
+    """'dogA:dog_body_yetiShape' -> 'dog/body'"""
+    _, asset_name, part_name = parse_node_name(node)
+    return f"{asset_name}/{part_name}"
+
+
+def get_history_path(path=None):
+    return path or os.environ.get(COST_HISTORY_ENV) or None
+
+
+class CostHistory:
+    """asset/part 별 프레임당 비용 기록 (JSON 파일)"""
+
+    def __init__(self, path):
+        self.path = path
+        self.entries = self._read()
+
+    def _read(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if data.get("version") != HISTORY_VERSION:
+            return {}
+        return data.get("entries", {})
+
+    @contextlib.contextmanager
+    def _locked(self):
+        if fcntl is None:
+            yield
+            return
+        with open(self.path + ".lock", "a") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def seconds_per_frame(self, key, samples):
+        entry = self.entries.get(key)
+        return entry["seconds_per_frame_sample"] * samples if entry else None
+
+    def bytes_per_frame(self, key, samples):
+        entry = self.entries.get(key)
+        return entry["bytes_per_frame_sample"] * samples if entry else None
+
+    def record(self, key, frames, seconds, total_bytes, samples, computed_frames=None):
+        """
+        익스포트 결과 하나를 기록한다. (frames 가 0 이면 무시)
+        :param frames: 캐시로 쓴 프레임 수 (크기 계산에 사용)
+        :param computed_frames: 계산한 프레임 수 (프리롤 포함, 시간 계산에 사용). None 이면 frames
+        """
+        if frames <= 0 or samples <= 0:
+            return
+        computed_frames = max(computed_frames or frames, frames)
+        seconds_per_sample = seconds / float(computed_frames * samples)
+        bytes_per_sample = total_bytes / float(frames * samples)
+
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._locked():
+            # 다른 워커가 그 사이에 쓴 기록과 병합
+            self.entries = self._read()
+            entry = self.entries.get(key)
+            if entry is None:
+                entry = {"seconds_per_frame_sample": seconds_per_sample,
+                         "bytes_per_frame_sample": bytes_per_sample, "count": 0}
+            else:
+                entry["seconds_per_frame_sample"] += SMOOTHING * (seconds_per_sample - entry["seconds_per_frame_sample"])
+                entry["bytes_per_frame_sample"] += SMOOTHING * (bytes_per_sample - entry["bytes_per_frame_sample"])
+            entry["count"] += 1
+            entry["updated"] = time.time()
+            self.entries[key] = entry
+
+            tmp_path = f"{self.path}.tmp{os.getpid()}"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"version": HISTORY_VERSION, "entries": self.entries}, f, indent=1, sort_keys=True)
+            os.replace(tmp_path, self.path)
+
+
+def lpt_pack(tasks, bin_count):
+    """
+    LPT(longest processing time first): 비용이 큰 작업부터 가장 덜 찬 워커에 넣는다.
+    :param tasks: [(cost, task), ...]
+    :return: 워커별 (총 비용, [task, ...]) 리스트
+    """
+    bins = [(0.0, index, []) for index in range(max(1, bin_count))]
+    heapq.heapify(bins)
+    for cost, task in sorted(tasks, key=lambda item: item[0], reverse=True):
+        load, index, items = heapq.heappop(bins)
+        items.append(task)
+        heapq.heappush(bins, (load + cost, index, items))
+    return [(load, items) for load, index, items in sorted(bins, key=lambda b: b[1])]
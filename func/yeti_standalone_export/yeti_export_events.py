@@ -0,0 +1,67 @@
+"""
+Yeti Cache Export Events
+
+익스포터 진행 상황을 JSON lines 이벤트로 기록합니다. (한 줄에 이벤트 하나)
+팜 모니터에서 초당 프레임 수, 멈춘 익스포트 감지, 스케줄링 비용 모델 계산에 사용합니다.
+
+이벤트 공통 필드: event, time(epoch 초), pid
+- run_start  : scene_file, version, samples, host
+- scene_open : scene_file, seconds, selective_refs
+- node_start : node, cache_path, frame_range
+- frame      : node, frame, size
+- node_end   : node, cache_path, status, seconds, frames, bytes, peak_rss_mb (실패하면 error)
+- totals     : nodes, frames, bytes, seconds, fps
+
+Maya 없이 동작합니다.
+"""
+
+import os
+import sys
+import json
+import time
+import socket
+import threading
+
+STDOUT_TARGET = "-"
+
+
+class EventLogger:
+    """
+    JSON lines 이벤트 기록기
+    target 이 None 이면 아무것도 하지 않고, '-' 면 stdout, 그 외에는 파일 경로(이어쓰기)
+    """
+
+    def __init__(self, target=None):
+        self.target = target
+        self._lock = threading.Lock()
+        self._own_stream = False
+        if not target:
+            self._stream = None
+        elif target == STDOUT_TARGET:
+            self._stream = sys.stdout
+        else:
+            self._stream = open(target, "a", encoding="utf-8")
+            self._own_stream = True
+
+    @property
+    def enabled(self):
+        return self._stream is not None
+
+    def emit(self, event, **fields):
+        if self._stream is None:
+            return
+        record = {"event": event, "time": time.time(), "pid": os.getpid()}
+        record.update(fields)
+        line = json.dumps(record)
+        # 프레임 이벤트는 감시 스레드에서 들어오므로 줄이 섞이지 않게 잠금
+        with self._lock:
+            self._stream.write(line + "\n")
+            self._stream.flush()
+
+    def run_start(self, **fields):
+        self.emit("run_start", host=socket.gethostname(), **fields)
+
+    def close(self):
+        if self._own_stream and self._stream is not None:
+            self._stream.close()
+        self._stream = None
@@ -0,0 +1,164 @@
+"""
+Yeti Cache Export Manifest
+
+노드별 캐시 시퀀스 옆에 매니페스트(<asset>_<part>.manifest.json)를 기록합니다.
+씬 경로와 mtime, 노드, 프레임 범위, 샘플, 프레임별 파일 크기와 체크섬이 들어있어서
+이어서 뽑기(resume)와 최신이면 건너뛰기(skip-if-up-to-date)에 사용합니다.
+
+Maya 없이 동작하므로 익스포터와 스케줄러 양쪽에서 사용합니다.
+"""
+
+import os
+import json
+import time
+import hashlib
+
+MANIFEST_VERSION = 1
+MANIFEST_SUFFIX = ".manifest.json"
+CHECKSUM_CHUNK_SIZE = 1024 * 1024
+
+
+def get_manifest_path(cache_path):
+    """'dir/asset_part.%04d.fur' -> 'dir/asset_part.manifest.json'"""
+    cache_dir, file_name = os.path.split(cache_path)
+    return os.path.join(cache_dir, file_name.split(".%04d")[0] + MANIFEST_SUFFIX)
+
+
+def file_checksum(path):
+    md5 = hashlib.md5()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(CHECKSUM_CHUNK_SIZE), b""):
+            md5.update(chunk)
+    return md5.hexdigest()
+
+
+def frame_record(path):
+    stat = os.stat(path)
+    return {"size": stat.st_size, "mtime": stat.st_mtime, "md5": file_checksum(path)}
+
+
+def pending_manifest(scene_file, node, cache_path, start, end, samples, frames=None):
+    """
+    익스포트를 시작하기 전에 기록하는 미완료 매니페스트
+    익스포트 도중 죽어도 설정이 남아있어서 resume 할 수 있다.
+    """
+    return {
+        "manifest_version": MANIFEST_VERSION,
+        "scene_file": scene_file,
+        "scene_mtime": os.path.getmtime(scene_file) if os.path.exists(scene_file) else None,
+        "node": node,
+        "cache_path": cache_path,
+        "frame_range": [start, end],
+        "samples": samples,
+        "complete": False,
+        "elapsed": None,
+        "written_at": time.time(),
+        "frames": frames or {},
+    }
+
+
+def build_manifest(scene_file, node, cache_path, start, end, samples, elapsed=None, previous=None):
+    """
+    디스크의 프레임들을 읽어서 매니페스트를 만든다.
+    previous 매니페스트가 있으면 크기와 mtime 이 같은 프레임은 체크섬을 다시 계산하지 않는다.
+    """
+    previous_frames = (previous or {}).get("frames", {})
+    frames = {}
+    for frame in range(start, end + 1):
+        frame_path = cache_path % frame
+        if not os.path.isfile(frame_path):
+            continue
+        known = previous_frames.get(str(frame))
+        stat = os.stat(frame_path)
+        if known and known["size"] == stat.st_size and known.get("mtime") == stat.st_mtime:
+            frames[str(frame)] = known
+        else:
+            frames[str(frame)] = frame_record(frame_path)
+
+    manifest = pending_manifest(scene_file, node, cache_path, start, end, samples, frames)
+    manifest["complete"] = len(frames) == end - start + 1
+    manifest["elapsed"] = elapsed
+    return manifest
+
+
+def write_manifest(cache_path, manifest):
+    """임시 파일에 쓴 뒤 교체해서 중간에 죽어도 깨진 매니페스트가 남지 않게 한다."""
+    path = get_manifest_path(cache_path)
+    tmp_path = f"{path}.tmp{os.getpid()}"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=1)
+    os.replace(tmp_path, path)
+    return path
+
+
+def read_manifest(cache_path):
+    path = get_manifest_path(cache_path)
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def settings_match(manifest, start, end, samples):
+    """매니페스트는 노드 캐시 폴더에 있으므로 노드는 경로로 구분되고, 여기서는 범위와 샘플만 비교한다."""
+    return (manifest is not None
+            and manifest.get("manifest_version") == MANIFEST_VERSION
+            and manifest.get("frame_range") == [start, end]
+            and manifest.get("samples") == samples)
+
+
+def is_up_to_date(manifest, scene_file, cache_path, start, end, samples):
+    """씬(경로, mtime)과 설정이 같고 모든 프레임이 매니페스트 크기대로 있으면 True (체크섬은 보지 않음)"""
+    if not settings_match(manifest, start, end, samples) or not manifest.get("complete"):
+        return False
+    if manifest.get("scene_file") != scene_file:
+        return False
+    if not os.path.exists(scene_file) or manifest.get("scene_mtime") != os.path.getmtime(scene_file):
+        return False
+    for frame in range(start, end + 1):
+        record = manifest["frames"].get(str(frame))
+        frame_path = cache_path % frame
+        if not record or not os.path.isfile(frame_path) or os.path.getsize(frame_path) != record["size"]:
+            return False
+    return True
+
+
+def find_invalid_frames(manifest, cache_path, start, end, verify_checksum=True):
+    """
+    다시 뽑아야 하는 프레임 리스트
+    - 파일이 없거나 비어있는 프레임
+    - 매니페스트와 크기/체크섬이 다른 프레임
+    - 매니페스트에 없는 프레임 중 가장 마지막에 쓰인 파일 (크래시 때 쓰다 만 파일일 수 있음)
+    """
+    frames = (manifest or {}).get("frames", {})
+    invalid = []
+    unrecorded = []
+    for frame in range(start, end + 1):
+        frame_path = cache_path % frame
+        if not os.path.isfile(frame_path) or os.path.getsize(frame_path) == 0:
+            invalid.append(frame)
+            continue
+        record = frames.get(str(frame))
+        if record is None:
+            unrecorded.append(frame)
+        elif record["size"] != os.path.getsize(frame_path):
+            invalid.append(frame)
+        elif verify_checksum and record["md5"] != file_checksum(frame_path):
+            invalid.append(frame)
+
+    if unrecorded:
+        newest = max(unrecorded, key=lambda f: os.path.getmtime(cache_path % f))
+        invalid.append(newest)
+    return sorted(invalid)
+
+
+def contiguous_runs(frames):
+    """[1, 2, 3, 7, 8] -> [(1, 3), (7, 8)]"""
+    runs = []
+    for frame in sorted(frames):
+        if runs and frame == runs[-1][1] + 1:
+            runs[-1] = (runs[-1][0], frame)
+        else:
+            runs.append((frame, frame))
+    return runs
@@ -0,0 +1,423 @@
+"""
+Yeti Cache Export Scheduler
+
+Yeti 노드별 익스포트 작업을 계획하고, mayapy 워커 여러 개에 나눠서 병렬로 실행합니다.
+각 워커는 기존 yeti_standalone_export.py 를 --nodes 서브셋으로 실행합니다.
+동시 실행 개수는 CPU 개수와 사용 가능한 메모리(워커당 예상 메모리)로 제한합니다.
+
+무거운 노드는 프레임 범위를 샤드로 나눠서 여러 워커가 같은 %04d.fur 시퀀스에 나눠 쓰게 할 수 있습니다.
+각 샤드는 프리롤 프레임부터 계산하고 자기 담당 프레임만 남기며,
+모든 작업이 끝나면 시퀀스에 빠진 프레임이 없는지 검사합니다.
+
+이 스크립트 자체는 Maya 가 필요없어서 일반 python 으로 실행해도 됩니다.
+(--nodes 를 주지 않으면 노드 목록을 얻기 위해 mayapy 를 한 번 실행합니다)
+"""
+
+import os
+import sys
+import json
+import argparse
+import subprocess
+import multiprocessing
+from concurrent.futures import ThreadPoolExecutor
+
+import yeti_export_manifest as manifest_util
+import yeti_export_cost as cost_util
+
+EXPORTER_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "yeti_standalone_export.py")
+
+# yeti_standalone_export.py 의 출력 형식과 맞춰야 합니다.
+NODES_PREFIX = "[NODES]"
+RANGE_PREFIX = "[RANGE]"
+KEYS_PREFIX = "[KEYS]"
+SUCCESS_PREFIX = "[SUCCESS] Exported:"
+FRAME_PADDING = 5
+DEFAULT_SHARD_PREROLL = 5
+
+
+def get_available_memory_gb():
+    """/proc/meminfo 의 MemAvailable (GB), 알 수 없으면 None"""
+    try:
+        with open("/proc/meminfo", "r") as f:
+            for line in f:
+                if line.startswith("MemAvailable:"):
+                    return int(line.split()[1]) / (1024.0 * 1024.0)
+    except OSError:
+        pass
+    return None
+
+
+def get_max_concurrency(job_count, max_workers=None, worker_memory_gb=8.0):
+    """CPU 개수, 메모리, 작업 개수 중 가장 작은 값 (최소 1)"""
+    limits = [job_count, multiprocessing.cpu_count()]
+    if max_workers:
+        limits.append(max_workers)
+    available = get_available_memory_gb()
+    if available is not None and worker_memory_gb > 0:
+        limits.append(int(available // worker_memory_gb))
+    return max(1, min(limits))
+
+
+def split_frame_range(start, end, shard_count):
+    """start~end (포함) 범위를 최대 shard_count 개의 연속된 구간으로 균등하게 나눈다."""
+    total = end - start + 1
+    shard_count = max(1, min(shard_count, total))
+    shards = []
+    shard_start = start
+    for index in range(shard_count):
+        size = total // shard_count + (1 if index < total % shard_count else 0)
+        shards.append((shard_start, shard_start + size - 1))
+        shard_start += size
+    return shards
+
+
+def find_missing_frames(cache_path, start, end):
+    """%04d 시퀀스에서 없거나 비어있는 프레임 리스트"""
+    missing = []
+    for frame in range(start, end + 1):
+        frame_path = cache_path % frame
+        if not os.path.isfile(frame_path) or os.path.getsize(frame_path) == 0:
+            missing.append(frame)
+    return missing
+
+
+class YetiExportScheduler:
+    """
+    씬 하나의 Yeti 노드들을 mayapy 워커 풀에 나눠서 익스포트
+    """
+
+    def __init__(self, scene_file, nodes=None, start_frame=None, end_frame=None, samples=5,
+                 mayapy=None, max_workers=None, worker_memory_gb=8.0,
+                 shards=1, shard_nodes=None, preroll=DEFAULT_SHARD_PREROLL, resume=False, skip_up_to_date=False,
+                 selective_refs=False, staging_dir=None, cost_history=None):
+        """
+        :param scene_file: 캐시를 뽑을 마야 씬 경로
+        :param nodes: Yeti 노드 리스트 (없으면 mayapy 로 씬을 열어서 탐색)
+        :param mayapy: mayapy 실행 파일 (없으면 MAYAPY 환경변수, 그것도 없으면 'mayapy')
+        :param max_workers: 최대 워커 개수 (없으면 CPU/메모리 기준)
+        :param worker_memory_gb: 워커 하나가 사용할 것으로 예상하는 메모리(GB)
+        :param shards: 샤드로 나눌 노드의 프레임 범위 분할 개수 (1 이면 샤드 없음)
+        :param shard_nodes: 샤드로 나눌 노드 리스트 (없으면 모든 노드)
+        :param preroll: 샤드 시작 전에 미리 계산할 프레임 수 (음수면 패딩된 시작 프레임부터)
+        :param resume / skip_up_to_date: 샤드가 아닌 작업에 그대로 전달 (매니페스트 기준 이어뽑기 / 최신이면 건너뛰기)
+        :param selective_refs: 모든 워커(노드 탐색 포함)가 필요한 레퍼런스만 로드해서 씬을 열도록 전달
+        :param staging_dir: 워커가 캐시를 쓸 로컬 스크래치 폴더 (워커마다 하위 임시 폴더를 사용)
+        :param cost_history: 비용 기록 JSON 경로 (없으면 YETI_COST_HISTORY 환경변수).
+                             있으면 기록으로 노드/샤드를 워커에 나눠 담고(shards, shard_nodes 는 무시), 워커도 비용을 기록
+        """
+        self.scene_file = scene_file
+        self.nodes = nodes
+        self.frame_range = None
+        self.shards = shards
+        self.shard_nodes = shard_nodes
+        self.preroll = preroll
+        self.resume = resume
+        self.skip_up_to_date = skip_up_to_date
+        self.selective_refs = selective_refs
+        self.staging_dir = staging_dir
+        self.cost_history_path = cost_util.get_history_path(cost_history)
+        self.cost_keys = {}
+        self.start_frame = start_frame
+        self.end_frame = end_frame
+        self.samples = samples
+        self.mayapy = mayapy or os.environ.get("MAYAPY", "mayapy")
+        self.max_workers = max_workers
+        self.worker_memory_gb = worker_memory_gb
+
+    def _exporter_command(self, extra_args):
+        command = [self.mayapy, EXPORTER_SCRIPT, "--scenefile", self.scene_file, "--samples", str(self.samples)]
+        if self.start_frame is not None:
+            command += ["--start_frame", str(self.start_frame)]
+        if self.end_frame is not None:
+            command += ["--end_frame", str(self.end_frame)]
+        if self.selective_refs:
+            command.append("--selective_refs")
+        if self.staging_dir:
+            command += ["--staging_dir", self.staging_dir]
+        if self.cost_history_path:
+            command += ["--cost_history", self.cost_history_path]
+        return command + list(extra_args)
+
+    def discover_scene(self):
+        """
+        mayapy 로 씬을 열어서 Yeti 트랜스폼 노드 목록과 패딩된 프레임 범위를 얻는다.
+        비용 기록 키(트랜스폼 -> 'asset/part')는 self.cost_keys 에 저장한다.
+        """
+        extra = ["--list_nodes"] + (["--nodes"] + list(self.nodes) if self.nodes else [])
+        output = subprocess.check_output(self._exporter_command(extra), universal_newlines=True)
+        nodes = frame_range = None
+        for line in output.splitlines():
+            if line.startswith(NODES_PREFIX):
+                nodes = json.loads(line[len(NODES_PREFIX):])
+            elif line.startswith(RANGE_PREFIX):
+                frame_range = tuple(json.loads(line[len(RANGE_PREFIX):]))
+            elif line.startswith(KEYS_PREFIX):
+                self.cost_keys = json.loads(line[len(KEYS_PREFIX):])
+        if nodes is None or frame_range is None:
+            raise RuntimeError(f"[ERROR] 노드 목록을 얻지 못했습니다: {self.scene_file}")
+        return nodes, frame_range
+
+    def discover_nodes(self):
+        return self.discover_scene()[0]
+
+    def get_frame_range(self):
+        """패딩된 익스포트 프레임 범위 (프레임이 지정되지 않았으면 씬에서 조회)"""
+        if self.frame_range is None:
+            if self.start_frame and self.end_frame:
+                self.frame_range = (self.start_frame - FRAME_PADDING, self.end_frame + FRAME_PADDING)
+            else:
+                self.frame_range = self.discover_scene()[1]
+        return self.frame_range
+
+    def _shard_job(self, node, shard_start, shard_end):
+        extra = ["--nodes", node, "--shard_start", str(shard_start), "--shard_end", str(shard_end),
+                 "--preroll", str(self.preroll)]
+        return {"nodes": [node], "shard": (shard_start, shard_end), "command": self._exporter_command(extra)}
+
+    def _whole_nodes_job(self, nodes):
+        extra = ["--nodes"] + list(nodes)
+        if self.resume:
+            extra.append("--resume")
+        if self.skip_up_to_date:
+            extra.append("--skip_up_to_date")
+        return {"nodes": list(nodes), "shard": None, "command": self._exporter_command(extra)}
+
+    def _shard_cost(self, seconds_per_frame, start, shard_start, shard_end):
+        """
+        샤드 하나의 예상 시간 (프리롤 프레임 포함)
+        seconds_per_frame 은 프리롤을 포함한 계산 프레임당 시간으로 기록되므로 프리롤 프레임을 한 번만 더한다.
+        """
+        preroll = shard_start - start if self.preroll < 0 else min(self.preroll, shard_start - start)
+        return seconds_per_frame * (shard_end - shard_start + 1 + preroll)
+
+    def _plan_by_cost(self, nodes):
+        """
+        비용 기록으로 노드별 예상 시간을 구하고, 평균 워커 부하보다 무거운 노드는 프레임 샤드로 나눈 뒤
+        LPT 로 고정된 워커 개수에 나눠 담아서 가장 늦게 끝나는 워커의 시간(makespan)을 줄인다.
+        기록이 없는 노드는 기록된 노드들의 중간값(기록이 하나도 없으면 모두 같은 값)을 사용한다.
+        같은 워커에 담긴 노드들은 한 번의 씬 열기로 뽑도록 --nodes 하나로 묶는다.
+        """
+        start, end = self.get_frame_range()
+        frame_count = end - start + 1
+        history = cost_util.CostHistory(self.cost_history_path)
+        per_frame = {n: history.seconds_per_frame(self.cost_keys.get(n, ""), self.samples) for n in nodes}
+        known = sorted(c for c in per_frame.values() if c is not None)
+        default = known[len(known) // 2] if known else 1.0
+        per_frame = {n: default if c is None else c for n, c in per_frame.items()}
+
+        worker_count = get_max_concurrency(len(nodes) * frame_count, self.max_workers, self.worker_memory_gb)
+        target = sum(per_frame.values()) * frame_count / worker_count
+
+        tasks = []
+        for node in nodes:
+            node_cost = per_frame[node] * frame_count
+            # resume / skip_up_to_date 는 노드 단위로만 동작하므로 샤드로 나누지 않는다
+            shard_count = 1
+            if node_cost > target and not (self.resume or self.skip_up_to_date):
+                shard_count = min(int(-(-node_cost // target)), frame_count, worker_count)
+            if shard_count <= 1:
+                tasks.append((node_cost, ("node", node, None)))
+                continue
+            for shard in split_frame_range(start, end, shard_count):
+                tasks.append((self._shard_cost(per_frame[node], start, *shard), ("shard", node, shard)))
+
+        jobs = []
+        bins = cost_util.lpt_pack(tasks, worker_count)
+        for worker, (load, items) in enumerate(bins):
+            whole_nodes = [node for kind, node, _ in items if kind == "node"]
+            if whole_nodes:
+                job = self._whole_nodes_job(whole_nodes)
+                job["estimated_seconds"] = sum(per_frame[n] * frame_count for n in whole_nodes)
+                jobs.append(dict(job, worker=worker))
+            for kind, node, shard in items:
+                if kind == "shard":
+                    job = self._shard_job(node, *shard)
+                    job["estimated_seconds"] = self._shard_cost(per_frame[node], start, *shard)
+                    jobs.append(dict(job, worker=worker))
+
+        makespan = max(load for load, _ in bins) if bins else 0.0
+        print(f"[PLAN] {len(jobs)} jobs on {worker_count} workers, estimated makespan {makespan:.1f}s "
+              f"({len(known)}/{len(nodes)} nodes with cost history)")
+        return jobs
+
+    def plan(self):
+        """
+        작업을 계획한다.
+        - 비용 기록이 있으면 _plan_by_cost (LPT, 같은 워커 번호의 작업은 순서대로 실행)
+        - 없으면 샤드 노드는 샤드마다 작업 하나, 나머지 노드는 워커 개수만큼 서브셋으로 나눈다.
+        :return: [{'worker': index, 'nodes': [...], 'shard': (start, end) 또는 None, 'command': [...]}, ...]
+        """
+        if self.nodes and not self.cost_history_path:
+            nodes = list(self.nodes)
+        else:
+            # 비용 기록 키를 얻기 위해 --nodes 가 있어도 씬을 조회
+            nodes, self.frame_range = self.discover_scene()
+        if not nodes:
+            raise RuntimeError("[ERROR] 씬에 Yeti 노드가 존재하지 않습니다.")
+
+        if self.cost_history_path:
+            return self._plan_by_cost(nodes)
+
+        jobs = []
+        if self.shards <= 1:
+            sharded = set()
+        elif self.shard_nodes is None:
+            sharded = set(nodes)
+        else:
+            # 찾은 노드는 full DAG 경로이므로 --shard_nodes 의 짧은 이름과도 비교
+            shard_names = set(self.shard_nodes)
+            sharded = {n for n in nodes if n in shard_names or n.split("|")[-1] in shard_names}
+        if sharded:
+            start, end = self.get_frame_range()
+            for node in nodes:
+                if node in sharded:
+                    jobs.extend(self._shard_job(node, *shard) for shard in split_frame_range(start, end, self.shards))
+
+        whole_nodes = [n for n in nodes if n not in sharded]
+        if whole_nodes:
+            worker_count = get_max_concurrency(len(whole_nodes), self.max_workers, self.worker_memory_gb)
+            for i in range(worker_count):
+                subset = whole_nodes[i::worker_count]
+                if subset:
+                    jobs.append(self._whole_nodes_job(subset))
+
+        for index, job in enumerate(jobs):
+            job["worker"] = index
+        return jobs
+
+    def verify_sequences(self, results):
+        """
+        샤드로 나눠 뽑은 노드의 전체 시퀀스에 빠진 프레임이 없는지 검사하고, 완성된 시퀀스는 매니페스트를 기록한다.
+        :return: {cache_path: [missing frames]}
+        """
+        start, end = self.get_frame_range()
+        sharded = {p: r["nodes"][0] for r in results if r["shard"] for p in r["exported_paths"]}
+        missing = {}
+        for path in sorted(sharded):
+            missing[path] = find_missing_frames(path, start, end)
+            if not missing[path]:
+                manifest = manifest_util.build_manifest(self.scene_file, sharded[path], path,
+                                                        start, end, self.samples)
+                manifest_util.write_manifest(path, manifest)
+        return missing
+
+    @staticmethod
+    def _run_job(job):
+        print(f"[WORKER {job['worker']}] start: {' '.join(job['nodes'])}")
+        process = subprocess.run(job["command"], stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                                 universal_newlines=True)
+        exported_paths = [line[len(SUCCESS_PREFIX):].strip()
+                          for line in process.stdout.splitlines() if line.startswith(SUCCESS_PREFIX)]
+        status = "SUCCESS" if process.returncode == 0 else "FAILED"
+        print(f"[WORKER {job['worker']}] {status} (exit {process.returncode}), {len(exported_paths)} caches")
+        if process.returncode != 0:
+            print("\n".join(process.stdout.splitlines()[-20:]))
+        return {
+            "worker": job["worker"],
+            "nodes": job["nodes"],
+            "shard": job["shard"],
+            "returncode": process.returncode,
+            "exported_paths": exported_paths,
+            "log": process.stdout,
+        }
+
+    def _run_worker_jobs(self, jobs):
+        return [self._run_job(job) for job in jobs]
+
+    def run(self, jobs=None):
+        """
+        워커 풀로 작업을 실행하고 결과를 하나로 모은다.
+        :return: {'success': bool, 'exported_paths': [...], 'jobs': [...]}
+        """
+        jobs = jobs if jobs is not None else self.plan()
+        # 같은 워커 번호의 작업은 한 스레드에서 순서대로 실행
+        worker_jobs = {}
+        for job in jobs:
+            worker_jobs.setdefault(job["worker"], []).append(job)
+        concurrency = get_max_concurrency(len(worker_jobs), self.max_workers, self.worker_memory_gb)
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            results = [result for worker_results in pool.map(self._run_worker_jobs, worker_jobs.values())
+                       for result in worker_results]
+
+        missing = self.verify_sequences(results) if any(r["shard"] for r in results) else {}
+        for path, frames in missing.items():
+            if frames:
+                print(f"[ERROR] {len(frames)} frames missing in {path}: {frames[:10]}")
+
+        exported_paths = []
+        for path in (p for r in results for p in r["exported_paths"]):
+            if path not in exported_paths:
+                exported_paths.append(path)
+
+        return {
+            "scene_file": self.scene_file,
+            "success": all(r["returncode"] == 0 for r in results) and not any(missing.values()),
+            "exported_paths": exported_paths,
+            "missing_frames": {path: frames for path, frames in missing.items() if frames},
+            "jobs": results,
+        }
+
+    @staticmethod
+    def parse_args(args):
+        parser = argparse.ArgumentParser(description="Yeti parallel export scheduler")
+        parser.add_argument("--scenefile", required=True, help="Scene file name")
+        parser.add_argument("--start_frame", type=int, default=None, help="start frame")
+        parser.add_argument("--end_frame", type=int, default=None, help="end frame")
+        parser.add_argument("--samples", type=int, default=5, help="Sample count")
+        parser.add_argument("--nodes", nargs="+", help="Yeti node(s) to export (optional)")
+        parser.add_argument("--mayapy", default=None, help="mayapy executable")
+        parser.add_argument("--workers", type=int, default=None, help="max worker count")
+        parser.add_argument("--worker_memory_gb", type=float, default=8.0, help="expected memory per worker (GB)")
+        parser.add_argument("--shards", type=int, default=1, help="split each sharded node's frame range into N shards")
+        parser.add_argument("--shard_nodes", nargs="+", default=None, help="node(s) to shard (default: all nodes)")
+        parser.add_argument("--preroll", type=int, default=DEFAULT_SHARD_PREROLL,
+                            help="frames evaluated before each shard (negative: from the padded start frame)")
+        parser.add_argument("--resume", action="store_true", help="re-export only missing or invalid frames")
+        parser.add_argument("--skip_up_to_date", action="store_true", help="skip caches that are up to date")
+        parser.add_argument("--selective_refs", action="store_true",
+                            help="load only the references the Yeti nodes depend on")
+        parser.add_argument("--staging_dir", default=None,
+                            help="local scratch directory for workers (frames are copied to publish in the background)")
+        parser.add_argument("--cost_history", default=None,
+                            help="per-node cost history JSON used to bin-pack nodes and shards onto workers "
+                                 "(default: $YETI_COST_HISTORY)")
+        parser.add_argument("--plan_only", action="store_true", help="print the plan as JSON and exit")
+        return parser.parse_args(args)
+
+
+if __name__ == '__main__':
+
+    opts = YetiExportScheduler.parse_args(sys.argv[1:])
+    if not os.path.exists(opts.scenefile):
+        print(f"[WARNING] 씬 파일을 찾을 수 없습니다: {opts.scenefile}")
+        sys.exit(1)
+
+    scheduler = YetiExportScheduler(
+        scene_file=opts.scenefile,
+        nodes=opts.nodes,
+        start_frame=opts.start_frame,
+        end_frame=opts.end_frame,
+        samples=opts.samples,
+        mayapy=opts.mayapy,
+        max_workers=opts.workers,
+        worker_memory_gb=opts.worker_memory_gb,
+        shards=opts.shards,
+        shard_nodes=opts.shard_nodes,
+        preroll=opts.preroll,
+        resume=opts.resume,
+        skip_up_to_date=opts.skip_up_to_date,
+        selective_refs=opts.selective_refs,
+        staging_dir=opts.staging_dir,
+        cost_history=opts.cost_history,
+    )
+
+    if opts.plan_only:
+        print(json.dumps(scheduler.plan(), indent=2))
+        sys.exit(0)
+
+    result = scheduler.run()
+    summary = {k: v for k, v in result.items() if k != "jobs"}
+    summary["jobs"] = [{k: v for k, v in job.items() if k != "log"} for job in result["jobs"]]
+    print(json.dumps(summary, indent=2))
+    print(f"[ALL DONE] {len(result['exported_paths'])} caches, success={result['success']}")
+    sys.exit(0 if result["success"] else 1)
@@ -0,0 +1,242 @@
+"""
+Yeti Cache Export Staging
+
+캐시 프레임을 로컬 스크래치 디스크에 먼저 쓰고, 백그라운드 복사 스레드가 완성된 프레임을
+퍼블리시 경로(네트워크 파일러)로 복사합니다. Yeti 계산이 네트워크 쓰기를 기다리지 않습니다.
+
+- 감시 스레드(FrameWatcher): 스크래치 폴더를 폴링해서 완성된 프레임을 복사 큐에 넣습니다.
+  pgYetiCommand 는 프레임을 순서대로 쓰므로, 다음 프레임 파일이 생기면 앞 프레임은 완성된 것으로 봅니다.
+  쓸 프레임 순서를 알면 폴링마다 다음 프레임 경로만 stat 합니다.
+  마지막 프레임은 finish() 에서 넣습니다.
+- 복사 큐는 크기가 제한되어 있어서 복사가 밀리면 감시 스레드만 기다리고, 계산은 계속 진행됩니다.
+- 복사 스레드: 퍼블리시 폴더에 숨김 임시 파일로 복사하면서 체크섬을 계산하고, 복사본의 크기와 체크섬을 검증합니다.
+- finish(): 모든 프레임이 검증되면 임시 파일을 최종 이름으로 교체합니다. 하나라도 실패하면 기존 캐시는 그대로 둡니다.
+
+Maya 없이 동작합니다.
+"""
+
+import os
+import re
+import queue
+import hashlib
+import threading
+
+import yeti_export_manifest as manifest_util
+
+POLL_INTERVAL = 0.2
+DEFAULT_COPY_WORKERS = 4
+DEFAULT_QUEUE_DEPTH = 32
+
+
+class FrameWatcher:
+    """
+    캐시 시퀀스를 폴링해서 다 쓰인 프레임마다 callback(frame, path) 를 호출한다.
+    시작할 때 이미 있던 파일은 mtime 이 바뀐 경우에만 새로 쓰인 것으로 본다.
+
+    frames(쓰는 순서의 프레임 리스트)를 주면 폴링마다 다음에 쓰일 프레임과 그 다음 프레임 경로만 stat 한다.
+    (NFS 퍼블리시 폴더에서 긴 시퀀스를 감시해도 폴링 비용이 프레임 수와 상관없이 일정)
+    frames 가 없으면 폴더 전체를 listdir 해서 찾는다.
+    """
+
+    def __init__(self, cache_path, callback, interval=POLL_INTERVAL, frames=None):
+        self.cache_path = cache_path
+        self.cache_dir, file_name = os.path.split(cache_path)
+        prefix, suffix = file_name.split("%04d", 1)
+        self._frame_pattern = re.compile(re.escape(prefix) + r"(-?\d+)" + re.escape(suffix) + "$")
+        self._callback = callback
+        self._interval = interval
+        self._expected = list(frames) if frames is not None else None
+        self._next_index = 0
+        # 시작할 때 한 번만 폴더를 읽어서 기존 파일의 mtime 을 기억한다
+        self._initial = self._list_frames()
+        self._reported = set()
+        self.errors = []
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="yeti-frame-watch", daemon=True)
+
+    @property
+    def frames(self):
+        return sorted(self._reported)
+
+    def _list_frames(self):
+        """{frame: mtime_ns}"""
+        frames = {}
+        try:
+            names = os.listdir(self.cache_dir)
+        except OSError:
+            return frames
+        for name in names:
+            match = self._frame_pattern.match(name)
+            if not match:
+                continue
+            try:
+                frames[int(match.group(1))] = os.stat(os.path.join(self.cache_dir, name)).st_mtime_ns
+            except OSError:
+                pass
+        return frames
+
+    def _is_written(self, frame):
+        """frame 파일이 감시 시작 이후에 쓰였는지 (stat 한 번)"""
+        try:
+            mtime = os.stat(self.cache_path % frame).st_mtime_ns
+        except OSError:
+            return False
+        return self._initial.get(frame) != mtime
+
+    def _report(self, frame):
+        self._reported.add(frame)
+        self._callback(frame, self.cache_path % frame)
+
+    def _scan_expected(self, flush):
+        """다음 프레임 파일이 생기면 앞 프레임은 다 쓰인 것으로 보고 알린다. flush 면 남은 프레임도 확인한다."""
+        while self._next_index < len(self._expected):
+            frame = self._expected[self._next_index]
+            if not self._is_written(frame):
+                if not flush:
+                    return
+                # 끝난 뒤에 없는 프레임은 건너뛴다 (호출한 쪽에서 누락으로 처리)
+                self._next_index += 1
+                continue
+            is_last = self._next_index + 1 >= len(self._expected)
+            if not flush and (is_last or not self._is_written(self._expected[self._next_index + 1])):
+                return
+            self._report(frame)
+            self._next_index += 1
+
+    def scan(self, flush=False):
+        """새로 쓰인 프레임을 알린다. flush 가 아니면 가장 뒤 프레임은 쓰는 중일 수 있어서 남겨둔다."""
+        if self._expected is not None:
+            self._scan_expected(flush)
+            return
+        written = [f for f, mtime in self._list_frames().items() if self._initial.get(f) != mtime]
+        if not written:
+            return
+        newest = max(written)
+        for frame in sorted(written):
+            if frame in self._reported or (frame == newest and not flush):
+                continue
+            self._report(frame)
+
+    def _run(self):
+        while not self._stop.wait(self._interval):
+            try:
+                self.scan()
+            except OSError as e:
+                self.errors.append(f"scan: {e}")
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self, flush=True):
+        self._stop.set()
+        self._thread.join()
+        if flush:
+            self.scan(flush=True)
+
+
+class StagedCopier:
+    """스크래치 캐시 시퀀스 하나를 퍼블리시 시퀀스로 비동기 복사"""
+
+    def __init__(self, scratch_cache_path, publish_cache_path, workers=DEFAULT_COPY_WORKERS,
+                 queue_depth=DEFAULT_QUEUE_DEPTH, frames=None):
+        """
+        :param scratch_cache_path: 익스포터가 쓰는 로컬 경로 ('.../asset_part.%04d.fur')
+        :param publish_cache_path: 최종 퍼블리시 경로 ('.../asset_part.%04d.fur')
+        :param workers: 복사 스레드 개수
+        :param queue_depth: 복사 대기 프레임 최대 개수
+        :param frames: 쓰는 순서의 프레임 리스트 (주면 FrameWatcher 가 다음 프레임만 stat)
+        """
+        self.scratch_cache_path = scratch_cache_path
+        self.publish_cache_path = publish_cache_path
+
+        self._queue = queue.Queue(maxsize=queue_depth)
+        self._staged = {}
+        self._errors = []
+        self._lock = threading.Lock()
+        # 큐가 가득 차면 감시 스레드만 put 에서 기다린다 (계산 스레드는 막히지 않음)
+        self._watcher = FrameWatcher(scratch_cache_path, lambda frame, path: self._queue.put(frame), frames=frames)
+        self._workers = [threading.Thread(target=self._copy_worker, name=f"yeti-stage-copy-{i}", daemon=True)
+                         for i in range(max(1, workers))]
+        self.bytes_copied = 0
+
+    def start(self):
+        self._watcher.start()
+        for worker in self._workers:
+            worker.start()
+        return self
+
+    def _staged_path(self, frame):
+        cache_dir, file_name = os.path.split(self.publish_cache_path % frame)
+        return os.path.join(cache_dir, f".{file_name}.staged{os.getpid()}")
+
+    def _copy_frame(self, frame):
+        """임시 파일로 복사하면서 체크섬을 계산하고, 복사본을 다시 읽어서 검증한다."""
+        source = self.scratch_cache_path % frame
+        staged = self._staged_path(frame)
+        md5 = hashlib.md5()
+        with open(source, "rb") as src, open(staged, "wb") as dst:
+            for chunk in iter(lambda: src.read(manifest_util.CHECKSUM_CHUNK_SIZE), b""):
+                md5.update(chunk)
+                dst.write(chunk)
+        checksum = md5.hexdigest()
+
+        stat = os.stat(staged)
+        if stat.st_size != os.path.getsize(source):
+            raise RuntimeError(f"크기가 다릅니다: {staged}")
+        if manifest_util.file_checksum(staged) != checksum:
+            raise RuntimeError(f"체크섬이 다릅니다: {staged}")
+        return staged, {"size": stat.st_size, "mtime": stat.st_mtime, "md5": checksum}
+
+    def _copy_worker(self):
+        while True:
+            frame = self._queue.get()
+            if frame is None:
+                break
+            try:
+                staged, record = self._copy_frame(frame)
+                with self._lock:
+                    self._staged[frame] = (staged, record)
+                    self.bytes_copied += record["size"]
+            except (OSError, RuntimeError) as e:
+                with self._lock:
+                    self._errors.append(f"{frame}: {e}")
+
+    def _shutdown(self, flush):
+        self._watcher.stop(flush=flush)
+        for _ in self._workers:
+            self._queue.put(None)
+        for worker in self._workers:
+            worker.join()
+
+    def _remove_staged(self):
+        for staged, _ in self._staged.values():
+            try:
+                os.remove(staged)
+            except OSError:
+                pass
+
+    def finish(self):
+        """
+        남은 프레임까지 복사/검증한 뒤 최종 이름으로 교체한다.
+        :return: 매니페스트 형식의 프레임 기록 {"frame": {"size", "mtime", "md5"}}
+        """
+        self._shutdown(flush=True)
+        missing = sorted(set(self._watcher.frames) - set(self._staged))
+        errors = self._errors + self._watcher.errors
+        if errors or missing:
+            self._remove_staged()
+            raise RuntimeError(f"[ERROR] 퍼블리시 복사 실패 ({self.publish_cache_path}): "
+                               f"{errors[:5]} missing={missing[:10]}")
+
+        records = {}
+        for frame, (staged, record) in sorted(self._staged.items()):
+            # os.replace 는 mtime 을 유지하므로 기록한 mtime 이 최종 파일과 같다
+            os.replace(staged, self.publish_cache_path % frame)
+            records[str(frame)] = record
+        return records
+
+    def abort(self):
+        """익스포트가 실패했을 때 복사를 멈추고 임시 파일을 지운다. (기존 캐시는 건드리지 않음)"""
+        self._shutdown(flush=False)
+        self._remove_staged()
@@ -1,20 +1,155 @@
 """
 Yeti standalone Cache Exporter
-Version: 1.5
+Version: 2.6
 """
 
 
-__version__ = "1.5"
+__version__ = "2.6"
 
 import re
 import os
+import gc
 import sys
+import shutil
+import json
+import time
 import argparse
+import tempfile
+import contextlib
+import threading
 
-import maya.standalone
-import maya.cmds as cmds
+import yeti_export_manifest as manifest_util
+import yeti_export_backend as backend_util
+import yeti_export_cost as cost_util
+import yeti_export_staging as staging_util
+import yeti_export_events as events_util
 
 
+# 스케줄러가 워커 출력에서 파싱하는 줄 머리
+NODES_PREFIX = "[NODES]"
+RANGE_PREFIX = "[RANGE]"
+PLAN_PREFIX = "[PLAN]"
+KEYS_PREFIX = "[KEYS]"
+STATS_PREFIX = "[STATS]"
+SUCCESS_PREFIX = "[SUCCESS] Exported:"
+
+# 모션 블러용으로 앞뒤로 붙이는 프레임 수
+FRAME_PADDING = 5
+# 샤드 익스포트시 샤드 시작 전에 미리 계산하는 프레임 수 (기본값)
+DEFAULT_SHARD_PREROLL = 5
+
+# 노드 익스포트 중 RSS 를 재는 간격(초)
+RSS_SAMPLE_INTERVAL = 0.5
+
+# 레퍼런스 편집 문자열에서 커넥션 양쪽 플러그를 뽑는 패턴
+CONNECT_EDIT_PATTERN = re.compile(r'connectAttr\s+(?:-\w+\s+)*"([^"]+)"\s+"([^"]+)"')
+
+_standalone_initialized = False
+_backend = None
+
+# 백엔드의 cmds (initialize_standalone 에서 채워짐). 모듈 로드 시점에는 maya 를 import 하지 않는다.
+cmds = None
+
+
+def set_backend(backend):
+    """
+    Maya 백엔드를 교체한다. (기본값은 YETI_EXPORT_BACKEND 환경변수, 없으면 실제 Maya)
+    초기화된 상태에서 바꾸면 기존 백엔드를 먼저 종료한다.
+    """
+    global _backend
+    uninitialize_standalone()
+    _backend = backend
+
+
+def get_backend():
+    global _backend
+    if _backend is None:
+        _backend = backend_util.create_backend()
+    return _backend
+
+
+def initialize_standalone():
+    """maya.standalone 을 프로세스당 한 번만 초기화"""
+    global _standalone_initialized, cmds
+    if not _standalone_initialized:
+        backend = get_backend()
+        backend.initialize()
+        cmds = backend.cmds
+        _standalone_initialized = True
+
+
+def uninitialize_standalone():
+    global _standalone_initialized
+    if _standalone_initialized:
+        get_backend().uninitialize()
+        _standalone_initialized = False
+
+
+def get_rss_mb():
+    """현재 프로세스의 RSS(MB), /proc 이 없으면 None"""
+    try:
+        with open("/proc/self/status", "r") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024.0
+    except OSError:
+        pass
+    return None
+
+
+class RssSampler:
+    """백그라운드 스레드로 RSS 를 주기적으로 재서 최대값을 기록"""
+
+    def __init__(self, interval=RSS_SAMPLE_INTERVAL):
+        self.interval = interval
+        self.peak_mb = get_rss_mb()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="yeti-rss-sampler", daemon=True)
+
+    def _sample(self):
+        rss = get_rss_mb()
+        if rss is not None and (self.peak_mb is None or rss > self.peak_mb):
+            self.peak_mb = rss
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self._sample()
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+        self._sample()
+        return self.peak_mb
+
+
+def release_memory():
+    """노드/씬 사이 메모리 정리: undo 비우기, Yeti/DG 캐시 비우기"""
+    cmds.flushUndo()
+    cmds.clearCache(all=True)
+    for flag in ("flushGeometryCache", "flushTextureCache", "flushDisplayCache"):
+        try:
+            cmds.pgYetiCommand(**{flag: True})
+        except (RuntimeError, TypeError):
+            # 플러그인 버전에 따라 지원하지 않는 플래그는 무시
+            pass
+    gc.collect()
+
+
+def reset_scene():
+    """씬 사이 메모리 정리: 새 씬 + release_memory"""
+    cmds.file(new=True, force=True)
+    release_memory()
+
+
+def read_queue_file(path):
+    """한 줄에 씬 경로 하나, 빈 줄과 # 주석은 무시"""
+    with open(path, "r", encoding="utf-8") as f:
+        return [line.strip() for line in f if line.strip() and not line.strip().startswith("#")]
+
 
 class YetiCacheExporter:
     """
@@ -22,15 +157,48 @@ class YetiCacheExporter:
     (UI 없이, 원본 스크립트 캐시 이름 방식 그대로)
     """
 
-    def __init__(self, scene_file, nodes=None, start_frame=None, end_frame=None, samples=5):
+    def __init__(self, scene_file, nodes=None, start_frame=None, end_frame=None, samples=5,
+                 shard=None, preroll=DEFAULT_SHARD_PREROLL, resume=False, skip_up_to_date=False,
+                 selective_refs=False, staging_dir=None, copy_workers=staging_util.DEFAULT_COPY_WORKERS,
+                 copy_queue_depth=staging_util.DEFAULT_QUEUE_DEPTH, reopen_every=0, max_rss_gb=None,
+                 events=None, cost_history=None):
         """
         :param scene_file: 캐시를 뽑을 마야 씬 경로
         :param nodes: Yeti 노드 리스트 (없으면 씬 내 모든 Yeti 노드)
         :param start_frame: 시작 프레임
         :param end_frame: 끝 프레임
         :param samples: Yeti 샘플 값
+        :param shard: (shard_start, shard_end) 이 워커가 담당하는 출력 프레임 범위 (패딩 적용된 프레임 기준)
+        :param preroll: 샤드 시작 전에 미리 계산할 프레임 수 (음수면 패딩된 시작 프레임부터 계산)
+        :param resume: 매니페스트 기준으로 없거나 깨진 프레임만 다시 익스포트
+        :param skip_up_to_date: 씬과 설정이 바뀌지 않았고 캐시가 온전하면 노드를 건너뜀
+        :param selective_refs: 레퍼런스를 로드하지 않고 씬을 연 뒤 Yeti 노드 입력에 필요한 레퍼런스만 로드
+        :param staging_dir: 로컬 스크래치 폴더. 지정하면 여기에 캐시를 쓰고 백그라운드로 퍼블리시 경로에 복사
+        :param copy_workers: 스테이징 복사 스레드 개수
+        :param copy_queue_depth: 스테이징 복사 대기 프레임 최대 개수
+        :param reopen_every: 노드 N 개를 뽑을 때마다 씬을 다시 연다 (0 이면 다시 열지 않음)
+        :param max_rss_gb: 노드가 끝난 뒤 메모리를 정리해도 RSS 가 이 값을 넘으면 씬을 다시 연다
+        :param events: JSON lines 이벤트 출력 ('-' 면 stdout, 파일 경로, 또는 EventLogger), None 이면 기록하지 않음
+        :param cost_history: 노드별 프레임당 비용 기록 JSON 경로 (없으면 YETI_COST_HISTORY 환경변수, 둘 다 없으면 기록 안 함)
         """
         self.scene_file = scene_file
+        self.shard = shard
+        self.preroll = preroll
+        self.resume = resume
+        self.skip_up_to_date = skip_up_to_date
+        self.selective_refs = selective_refs
+        self.staging_dir = staging_dir
+        self.copy_workers = copy_workers
+        self.copy_queue_depth = copy_queue_depth
+        self.reopen_every = reopen_every
+        self.max_rss_gb = max_rss_gb
+        # 노드별 소요 시간 / 메모리 기록 (export 후 채워짐)
+        self.node_stats = []
+        self.events = events if isinstance(events, events_util.EventLogger) else events_util.EventLogger(events)
+        history_path = cost_util.get_history_path(cost_history)
+        self.cost_history = cost_util.CostHistory(history_path) if history_path else None
+        # 현재 노드에서 쓰인 프레임 수 / 바이트 (프레임 이벤트 감시 스레드가 갱신)
+        self._written = {"frames": 0, "bytes": 0}
         self.samples = samples
         self.root_path = self._get_root_path(scene_file)
         self.output_root = os.path.join(self.root_path,'pub','caches','fur')
@@ -43,8 +211,8 @@ class YetiCacheExporter:
         # 씬 버전 추출
         self.version = self._get_scene_version(scene_file)
 
-        # Standalone 초기화
-        maya.standalone.initialize(name="python")
+        # Standalone 초기화 (이미 초기화되어 있으면 재사용)
+        initialize_standalone()
 
     @staticmethod
     def parse_args(args):
@@ -56,6 +224,17 @@ class YetiCacheExporter:
             help = "Scene file name",
             default = None
         )
+        parser.add_argument(
+            "--scenefiles",
+            nargs="+",
+            help="Scene files to export in one maya.standalone session (batch mode)",
+            default=None
+        )
+        parser.add_argument(
+            "--queue_file",
+            help="Text file with one scene path per line (batch mode)",
+            default=None
+        )
         parser.add_argument(
             "--start_frame",
             type = int,
@@ -84,16 +263,133 @@ class YetiCacheExporter:
                 "If the node has a namespace, please include the namespace, e.g., 'dogA:dog_yeti'."
             )
         )
+
+        parser.add_argument(
+            "--shard_start",
+            type=int,
+            help="First output frame owned by this worker (padded frame number)",
+            default=None
+        )
+        parser.add_argument(
+            "--shard_end",
+            type=int,
+            help="Last output frame owned by this worker (padded frame number)",
+            default=None
+        )
+        parser.add_argument(
+            "--preroll",
+            type=int,
+            help="Frames evaluated before a shard start (negative: from the padded start frame)",
+            default=DEFAULT_SHARD_PREROLL
+        )
+
+        parser.add_argument(
+            "--resume",
+            action="store_true",
+            help="Re-export only missing or invalid frames according to the manifest"
+        )
+        parser.add_argument(
+            "--skip_up_to_date",
+            action="store_true",
+            help="Skip nodes whose cache is complete and whose scene and settings are unchanged"
+        )
+
+        parser.add_argument(
+            "--selective_refs",
+            action="store_true",
+            help="Open the scene with references unloaded and load only the ones the Yeti nodes depend on"
+        )
+
+        parser.add_argument(
+            "--staging_dir",
+            help="Local scratch directory; caches are written here and copied to the publish path in the background",
+            default=None
+        )
+        parser.add_argument(
+            "--copy_workers",
+            type=int,
+            help="Background copy threads for --staging_dir",
+            default=staging_util.DEFAULT_COPY_WORKERS
+        )
+        parser.add_argument(
+            "--copy_queue_depth",
+            type=int,
+            help="Max frames waiting to be copied for --staging_dir",
+            default=staging_util.DEFAULT_QUEUE_DEPTH
+        )
+
+        parser.add_argument(
+            "--reopen_every",
+            type=int,
+            help="Reopen the scene after every N exported nodes to release memory (0: never)",
+            default=0
+        )
+        parser.add_argument(
+            "--max_rss_gb",
+            type=float,
+            help="Reopen the scene when RSS stays above this after a node's memory is released",
+            default=None
+        )
+
+        parser.add_argument(
+            "--events",
+            help="Write JSON-lines progress events to this file ('-' for stdout)",
+            default=None
+        )
+
+        parser.add_argument(
+            "--cost_history",
+            help="JSON file to record per-node, per-frame export cost (default: $YETI_COST_HISTORY)",
+            default=None
+        )
+
+        parser.add_argument(
+            "--dry_run", "--dry-run",
+            action="store_true",
+            help="Print the export plan (cache paths, frame ranges, size/time estimates) as JSON without writing caches"
+        )
+        parser.add_argument(
+            "--no_sample",
+            action="store_true",
+            help="With --dry_run, don't export a sample frame for nodes without a previous manifest"
+        )
+
+        parser.add_argument(
+            "--list_nodes",
+            action="store_true",
+            help="Print Yeti transform nodes in the scene as JSON and exit (used by the scheduler)"
+        )
         return parser.parse_args(args)
 
     @staticmethod
     def are_valid_arguments(opt):
-        if not opt.scenefile:
+        if not (opt.scenefile or opt.scenefiles or opt.queue_file):
             print("Scene file should be added.")
             return False
+        if opt.scenefile and (opt.scenefiles or opt.queue_file):
+            print("--scenefile can't be used with --scenefiles / --queue_file")
+            return False
         if opt.samples <= 0:
             print("Samples must be > 0")
             return False
+        if (opt.shard_start is None) != (opt.shard_end is None):
+            print("--shard_start and --shard_end must be used together")
+            return False
+        if opt.shard_start is not None and opt.shard_start > opt.shard_end:
+            print("--shard_start must be <= --shard_end")
+            return False
+        if opt.shard_start is not None and (opt.resume or opt.skip_up_to_date):
+            print("--resume / --skip_up_to_date can't be used with shards")
+            return False
+        if opt.copy_workers <= 0 or opt.copy_queue_depth <= 0:
+            print("--copy_workers and --copy_queue_depth must be > 0")
+            return False
+        if opt.reopen_every < 0 or (opt.max_rss_gb is not None and opt.max_rss_gb <= 0):
+            print("--reopen_every must be >= 0 and --max_rss_gb must be > 0")
+            return False
+        if opt.dry_run and not opt.scenefile:
+            print("--dry_run needs --scenefile")
+            return False
         return True
 
 
@@ -122,7 +418,7 @@ class YetiCacheExporter:
         if self.nodes:
             shapes_from_transforms = []
             for n in self.nodes:
-                shapes = cmds.listRelatives(n, shapes=True, type="pgYetiMaya") or []
+                shapes = cmds.listRelatives(n, shapes=True, type="pgYetiMaya", fullPath=True) or []
                 if not shapes:
                     raise RuntimeError(f"[ERROR] 씬에서 Yeti 노드를 찾을 수 없습니다: {n}")
                 shapes_from_transforms.extend(shapes)
@@ -132,34 +428,15 @@ class YetiCacheExporter:
             raise RuntimeError("[ERROR] 씬에 Yeti 노드가 존재하지 않습니다.")
         return all_nodes
 
-    def _get_cache_path(self, node):
+    def _resolve_cache_path(self, node):
         """
-        노드별 캐시 경로 생성 (원본 스크립트 방식) + 네임스페이스 처리
+        노드별 캐시 경로 계산 (원본 스크립트 방식) + 네임스페이스 처리
         - 네임스페이스가 있으면 캐시 폴더는 namespace/part_name
         - 네임스페이스가 없으면 asset_name/part_name
-
+        폴더는 만들지 않는다. (dry run 에서 사용)
         """
         node_long = cmds.ls(node,long=True)[0]
-        node_clean = node_long.split("|")[-1]
-
-        #네임스페이스 분리
-        if ":" in node_clean:
-            namespace, base_name = node_clean.split(":",1)
-        else:
-            namespace, base_name = None, node_clean
-
-        # 노드에서 _yetiShape 제거
-        base_name = base_name.replace("_yetiShape", "")
-
-        # assetName / partName 추출
-        if "_" in base_name:
-            asset_name, part_name = base_name.split("_",1)
-        else:
-            asset_name, part_name = base_name , "main"
-
-        # part_name에서 _yeti 제거
-        if part_name.endswith("_yeti"):
-            part_name = part_name.rsplit("_",1)[0]
+        namespace, asset_name, part_name = cost_util.parse_node_name(node_long)
 
         file_name = f"{asset_name}_{part_name}.%04d.fur"
 
@@ -169,35 +446,519 @@ class YetiCacheExporter:
         else:
             cache_dir = os.path.join(self.output_root, f"v{self.version:03d}", asset_name, part_name)
 
-        os.makedirs(cache_dir, exist_ok=True)
-
         # 캐시 파일 경로
-        cache_path = os.path.join(cache_dir, file_name)
+        return os.path.join(cache_dir, file_name)
+
+    def _get_cache_path(self, node):
+        """캐시 경로를 계산하고 캐시 폴더를 만든다."""
+        cache_path = self._resolve_cache_path(node)
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
         return cache_path
 
+    @staticmethod
+    def _get_reference_nodes():
+        """씬의 레퍼런스 노드 (sharedReferenceNode 제외)"""
+        return [r for r in cmds.ls(type="reference") or [] if not r.endswith("sharedReferenceNode")]
+
+    @staticmethod
+    def _short_node_name(plug):
+        """'|grp|ns:mesh.worldMesh[0]' -> 'ns:mesh'"""
+        return plug.split(".", 1)[0].split("|")[-1]
+
+    @staticmethod
+    def _get_reference_namespace(ref_node):
+        try:
+            namespace = cmds.referenceQuery(ref_node, namespace=True, shortName=True)
+        except RuntimeError:
+            return None
+        return namespace.lstrip(":") or None
+
+    def _get_connected_nodes(self, ref_node):
+        """레퍼런스 노드에 저장된 connectAttr 편집에 등장하는 노드 이름들 (로드 전에도 조회 가능)"""
+        try:
+            edits = cmds.referenceQuery(ref_node, editStrings=True, editCommand="connectAttr",
+                                        successfulEdits=True, failedEdits=True) or []
+        except RuntimeError:
+            return set()
+        nodes = set()
+        for edit in edits:
+            match = CONNECT_EDIT_PATTERN.search(edit)
+            if match:
+                nodes.update(self._short_node_name(plug) for plug in match.groups())
+        return nodes
+
+    def _get_dependency_names(self):
+        """현재 로드된 Yeti 노드(요청 노드)와 그 입력 히스토리의 짧은 이름 집합"""
+        if self.nodes:
+            yeti_nodes = [n for n in self.nodes if cmds.objExists(n)]
+        else:
+            yeti_nodes = cmds.ls(type="pgYetiMaya") or []
+        if not yeti_nodes:
+            return set()
+        history = cmds.listHistory(yeti_nodes, allConnections=True) or []
+        return {self._short_node_name(n) for n in history + yeti_nodes}
+
+    def _load_required_references(self):
+        """
+        레퍼런스가 로드되지 않은 씬에서 Yeti 노드가 의존하는 레퍼런스만 로드한다.
+        1. 요청 노드의 네임스페이스와 같은 레퍼런스 (Yeti 노드가 레퍼런스 안에 있는 경우)
+        2. 레퍼런스에 저장된 connectAttr 편집이 Yeti 노드 히스토리와 이어지는 레퍼런스
+        새로 로드된 레퍼런스로 히스토리가 늘어나므로 더 로드할 레퍼런스가 없을 때까지 반복한다.
+        필요한 레퍼런스를 판단할 수 없으면 모든 레퍼런스를 로드한다.
+        :return: 로드한 레퍼런스 노드 리스트
+        """
+        node_namespaces = {n.split("|")[-1].rsplit(":", 1)[0] for n in self.nodes or [] if ":" in n}
+
+        def _is_required(ref_node, dependencies):
+            # 1. 요청 노드의 네임스페이스 (중첩 네임스페이스면 상위 레퍼런스부터)
+            namespace = self._get_reference_namespace(ref_node)
+            if namespace and any(ns == namespace or ns.startswith(namespace + ":") for ns in node_namespaces):
+                return True
+            # 2. 레퍼런스의 커넥션 편집이 Yeti 노드 히스토리와 이어짐
+            return bool(dependencies and self._get_connected_nodes(ref_node) & dependencies)
+
+        loaded = []
+        while True:
+            # 레퍼런스를 로드하면 하위 레퍼런스 노드가 새로 생기므로 매번 다시 조회
+            unloaded = [r for r in self._get_reference_nodes() if not cmds.referenceQuery(r, isLoaded=True)]
+            dependencies = self._get_dependency_names()
+            required = [r for r in unloaded if _is_required(r, dependencies)]
+            if not required:
+                break
+            for ref_node in required:
+                cmds.file(loadReference=ref_node)
+                loaded.append(ref_node)
+
+        missing_nodes = [n for n in self.nodes or [] if not cmds.objExists(n)]
+        if missing_nodes or not self._get_dependency_names():
+            print("[WARNING] 필요한 레퍼런스를 찾지 못해서 모든 레퍼런스를 로드합니다.")
+            for ref_node in self._get_reference_nodes():
+                if not cmds.referenceQuery(ref_node, isLoaded=True):
+                    cmds.file(loadReference=ref_node)
+                    loaded.append(ref_node)
+        return loaded
+
+    def _open_scene(self):
+        """씬 열기 (selective_refs 면 레퍼런스를 미루고 필요한 것만 로드)"""
+        open_start_time = time.time()
+        if not self.selective_refs:
+            cmds.file(self.scene_file, o=True, force=True)
+        else:
+            cmds.file(self.scene_file, o=True, force=True, loadReferenceDepth="none")
+            loaded = self._load_required_references()
+            total = len(self._get_reference_nodes())
+            print(f"[REFERENCE] Loaded {len(loaded)}/{total} references in {time.time() - open_start_time:.1f}s: "
+                  f"{', '.join(loaded)}")
+        self.events.emit("scene_open", scene_file=self.scene_file, seconds=time.time() - open_start_time,
+                         selective_refs=self.selective_refs)
+
+    def list_nodes(self):
+        """
+        씬을 열고 --nodes 로 넘길 수 있는 Yeti 트랜스폼 리스트를 반환
+        부모만 다르고 이름이 같은 트랜스폼이 있어도 워커에서 구분되도록 full DAG 경로를 사용
+        """
+        self._open_scene()
+        transforms = []
+        for shape in self._get_yeti_nodes():
+            parent = cmds.listRelatives(shape, parent=True, fullPath=True)[0]
+            if parent not in transforms:
+                transforms.append(parent)
+        return transforms
+
+    def _get_frame_range(self):
+        """패딩(앞뒤 FRAME_PADDING 프레임)이 적용된 익스포트 프레임 범위"""
+        # 프레임 범위가 None으로 입력 받을경우 자동 추출
+        start = self.start_frame if self.start_frame else int(cmds.playbackOptions(q=True, min=True))
+        end = self.end_frame if self.end_frame else int(cmds.playbackOptions(q=True, max=True))
+        return start - FRAME_PADDING, end + FRAME_PADDING
+
+    def _export_start(self, start, owned_start):
+        """owned_start 프레임을 쓰기 위해 계산을 시작하는 프레임 (프리롤 포함)"""
+        return start if self.preroll < 0 else max(start, owned_start - self.preroll)
+
+    def _export_owned(self, node, cache_path, start, owned_start, owned_end):
+        """
+        owned_start~owned_end 프레임만 최종 경로에 쓴다.
+        프리롤 프레임이 다른 프레임 파일을 덮어쓰지 않도록 전용 폴더에 먼저 쓰고 담당 프레임만 옮긴다.
+        """
+        export_start = self._export_start(start, owned_start)
+        if export_start == owned_start:
+            cmds.pgYetiCommand(node, writeCache=cache_path, range=(owned_start, owned_end), samples=self.samples)
+            return
+
+        cache_dir, file_name = os.path.split(cache_path)
+        shard_dir = os.path.join(cache_dir, f".shard_{owned_start:04d}_{owned_end:04d}")
+        os.makedirs(shard_dir, exist_ok=True)
+        try:
+            cmds.pgYetiCommand(node, writeCache=os.path.join(shard_dir, file_name),
+                               range=(export_start, owned_end), samples=self.samples)
+            for frame in range(owned_start, owned_end + 1):
+                frame_file = file_name % frame
+                shard_file = os.path.join(shard_dir, frame_file)
+                if not os.path.exists(shard_file):
+                    raise RuntimeError(f"[ERROR] 샤드 프레임이 생성되지 않았습니다: {shard_file}")
+                os.replace(shard_file, os.path.join(cache_dir, frame_file))
+        finally:
+            shutil.rmtree(shard_dir, ignore_errors=True)
+
+    @contextlib.contextmanager
+    def _frame_events(self, node, write_cache_path, frames):
+        """
+        이벤트가 켜져 있으면 write_cache_path 시퀀스를 감시해서 프레임이 쓰일 때마다 frame 이벤트를 남긴다.
+        frames 는 쓰는 순서의 담당 프레임 리스트 (감시 스레드는 다음 프레임 경로만 stat)
+        """
+        if not self.events.enabled:
+            yield
+            return
+
+        def _on_frame(frame, path):
+            size = os.path.getsize(path)
+            self._written["frames"] += 1
+            self._written["bytes"] += size
+            self.events.emit("frame", node=node, frame=frame, size=size)
+
+        watcher = staging_util.FrameWatcher(write_cache_path, _on_frame, frames=frames).start()
+        try:
+            yield
+        finally:
+            watcher.stop(flush=True)
+
+    def _export_runs(self, node, cache_path, start, runs):
+        """
+        runs [(owned_start, owned_end), ...] 를 익스포트한다.
+        staging_dir 이 있으면 스크래치에 쓰고 백그라운드로 복사한 뒤 검증이 끝나면 최종 경로로 교체한다.
+        :return: 스테이징이면 복사한 프레임 기록 (매니페스트 형식), 아니면 None
+        """
+        frames = [frame for run_start, run_end in runs for frame in range(run_start, run_end + 1)]
+        if not self.staging_dir:
+            with self._frame_events(node, cache_path, frames):
+                for run_start, run_end in runs:
+                    self._export_owned(node, cache_path, start, run_start, run_end)
+            return None
+
+        os.makedirs(self.staging_dir, exist_ok=True)
+        scratch_dir = tempfile.mkdtemp(prefix="yeti_stage_", dir=self.staging_dir)
+        scratch_cache_path = os.path.join(scratch_dir, os.path.basename(cache_path))
+        copier = staging_util.StagedCopier(scratch_cache_path, cache_path, workers=self.copy_workers,
+                                           queue_depth=self.copy_queue_depth, frames=frames).start()
+        try:
+            try:
+                with self._frame_events(node, scratch_cache_path, frames):
+                    for run_start, run_end in runs:
+                        self._export_owned(node, scratch_cache_path, start, run_start, run_end)
+            except Exception:
+                copier.abort()
+                raise
+            compute_done_time = time.time()
+            records = copier.finish()
+            print(f"[STAGING] {len(records)} frames ({copier.bytes_copied / 1024.0 ** 2:.1f} MB) published, "
+                  f"waited {time.time() - compute_done_time:.1f}s for copies: {cache_path}")
+            return records
+        finally:
+            shutil.rmtree(scratch_dir, ignore_errors=True)
+
+    def _export_node(self, node, cache_path, start, end):
+        """
+        노드 하나를 start~end 범위로 익스포트하고 매니페스트를 기록한다.
+        - 샤드 모드: 담당 범위만 익스포트 (매니페스트는 기록하지 않음)
+        - skip_up_to_date: 씬/설정이 같고 캐시가 온전하면 건너뜀
+        - resume: 없거나 깨진 프레임 구간만 프리롤을 붙여서 다시 익스포트
+        """
+        if self.shard:
+            owned_start, owned_end = max(start, self.shard[0]), min(end, self.shard[1])
+            if owned_start > owned_end:
+                print(f"[SKIP] shard {self.shard} is outside of frame range ({start}, {end}): {node}")
+                return
+            export_start_time = time.time()
+            self._export_runs(node, cache_path, start, [(owned_start, owned_end)])
+            self._record_cost(node, cache_path, start, [(owned_start, owned_end)], time.time() - export_start_time)
+            return
+
+        previous = manifest_util.read_manifest(cache_path)
+        if self.skip_up_to_date and manifest_util.is_up_to_date(
+                previous, self.scene_file, cache_path, start, end, self.samples):
+            print(f"[SKIP] Up to date: {cache_path}")
+            return
+
+        runs = [(start, end)]
+        if self.resume and manifest_util.settings_match(previous, start, end, self.samples):
+            invalid = manifest_util.find_invalid_frames(previous, cache_path, start, end)
+            runs = manifest_util.contiguous_runs(invalid)
+            print(f"[RESUME] {len(invalid)} frames to export in {len(runs)} runs: {cache_path}")
+        elif previous:
+            print(f"[WARNING] Overwriting existing cache: {cache_path}")
+            previous = None
+
+        pending = manifest_util.pending_manifest(self.scene_file, node, cache_path, start, end, self.samples,
+                                                 frames=(previous or {}).get("frames"))
+        manifest_util.write_manifest(cache_path, pending)
+
+        export_start_time = time.time()
+        staged_frames = self._export_runs(node, cache_path, start, runs)
+        elapsed = time.time() - export_start_time
+        self._record_cost(node, cache_path, start, runs, elapsed)
+        if previous and previous.get("elapsed") and runs != [(start, end)]:
+            # 이어 뽑은 경우 전체 소요 시간은 알 수 없으므로 이전 기록을 유지
+            elapsed = previous["elapsed"]
+
+        if staged_frames:
+            # 복사하면서 계산한 체크섬을 재사용해서 퍼블리시 파일을 다시 읽지 않는다
+            previous = dict(previous or {}, frames=dict((previous or {}).get("frames", {}), **staged_frames))
+        manifest = manifest_util.build_manifest(self.scene_file, node, cache_path, start, end,
+                                                self.samples, elapsed=elapsed, previous=previous)
+        manifest_util.write_manifest(cache_path, manifest)
+
+    def _record_cost(self, node, cache_path, start, runs, seconds):
+        """
+        익스포트 시간과 크기를 비용 기록에 남긴다.
+        seconds 에는 프리롤 계산 시간도 들어가므로 시간은 계산한 프레임 수(프리롤 포함)로, 크기는 쓴 프레임 수로 나눈다.
+        (스케줄러 _shard_cost 도 프리롤 프레임을 더해서 예상 시간을 계산)
+        """
+        if self.cost_history is None:
+            return
+        frames = [f for run_start, run_end in runs for f in range(run_start, run_end + 1)]
+        computed_frames = sum(run_end - self._export_start(start, run_start) + 1 for run_start, run_end in runs)
+        total_bytes = sum(os.path.getsize(cache_path % f) for f in frames if os.path.isfile(cache_path % f))
+        try:
+            self.cost_history.record(cost_util.cost_key(node), len(frames), seconds, total_bytes, self.samples,
+                                     computed_frames=computed_frames)
+        except OSError as e:
+            print(f"[WARNING] 비용 기록을 저장하지 못했습니다: {e}")
+
+    def get_cost_keys(self):
+        """열린 씬에서 Yeti 트랜스폼(full DAG 경로, list_nodes 와 같음) -> 비용 기록 키('asset/part')"""
+        keys = {}
+        for shape in self._get_yeti_nodes():
+            keys[cmds.listRelatives(shape, parent=True, fullPath=True)[0]] = cost_util.cost_key(shape)
+        return keys
+
+    def _owned_frames(self, start, end):
+        """이 익스포터가 실제로 쓰는 프레임 범위 (샤드면 담당 범위, 겹치지 않으면 None)"""
+        if not self.shard:
+            return start, end
+        owned_start, owned_end = max(start, self.shard[0]), min(end, self.shard[1])
+        return (owned_start, owned_end) if owned_start <= owned_end else None
+
+    def _estimate_from_manifest(self, manifest):
+        """이전 매니페스트의 프레임 크기와 소요 시간 (샘플 수가 다르면 샘플 비율로 환산)"""
+        frames = (manifest or {}).get("frames") or {}
+        if not frames:
+            return None
+        ratio = self.samples / float(manifest.get("samples") or self.samples)
+        bytes_per_frame = sum(r["size"] for r in frames.values()) / float(len(frames)) * ratio
+        seconds_per_frame = None
+        if manifest.get("elapsed") and manifest.get("complete"):
+            seconds_per_frame = manifest["elapsed"] / float(len(frames)) * ratio
+        return {"source": "manifest", "bytes_per_frame": bytes_per_frame, "seconds_per_frame": seconds_per_frame}
+
+    def _estimate_from_sample(self, node, frame):
+        """임시 폴더에 한 프레임을 뽑아서 크기와 시간을 잰다. (첫 프레임 계산 비용이 포함되어 보수적인 값)"""
+        sample_dir = tempfile.mkdtemp(prefix="yeti_dry_run_")
+        try:
+            sample_path = os.path.join(sample_dir, "sample.%04d.fur")
+            sample_start_time = time.time()
+            cmds.pgYetiCommand(node, writeCache=sample_path, range=(frame, frame), samples=self.samples)
+            elapsed = time.time() - sample_start_time
+            if not os.path.isfile(sample_path % frame):
+                return None
+            return {"source": "sample", "bytes_per_frame": float(os.path.getsize(sample_path % frame)),
+                    "seconds_per_frame": elapsed}
+        except RuntimeError as e:
+            print(f"[WARNING] 샘플 프레임을 뽑지 못했습니다: {node}: {e}")
+            return None
+        finally:
+            shutil.rmtree(sample_dir, ignore_errors=True)
+
+    def _plan_node(self, node, start, end, sample):
+        cache_path = self._resolve_cache_path(node)
+        node_plan = {
+            "node": node,
+            "transform": cmds.listRelatives(node, parent=True, fullPath=True)[0],
+            "cache_path": cache_path,
+            "cache_dir_exists": os.path.isdir(os.path.dirname(cache_path)),
+            "frame_range": [start, end],
+            "action": "export",
+            "frames": [],
+            "estimate": None,
+        }
+
+        owned = self._owned_frames(start, end)
+        frames = list(range(owned[0], owned[1] + 1)) if owned else []
+        previous = manifest_util.read_manifest(cache_path)
+        if not self.shard and previous:
+            if self.skip_up_to_date and manifest_util.is_up_to_date(
+                    previous, self.scene_file, cache_path, start, end, self.samples):
+                node_plan["action"] = "skip"
+                frames = []
+            elif self.resume and manifest_util.settings_match(previous, start, end, self.samples):
+                node_plan["action"] = "resume"
+                frames = manifest_util.find_invalid_frames(previous, cache_path, start, end, verify_checksum=False)
+        if not owned:
+            node_plan["action"] = "skip"
+        node_plan["frames"] = [list(run) for run in manifest_util.contiguous_runs(frames)]
+        node_plan["frame_count"] = len(frames)
+
+        estimate = self._estimate_from_manifest(previous)
+        if estimate is None and self.cost_history is not None:
+            key = cost_util.cost_key(node)
+            if key in self.cost_history.entries:
+                estimate = {"source": "history",
+                            "bytes_per_frame": self.cost_history.bytes_per_frame(key, self.samples),
+                            "seconds_per_frame": self.cost_history.seconds_per_frame(key, self.samples)}
+        if frames and sample and (estimate is None or estimate["seconds_per_frame"] is None):
+            estimate = self._estimate_from_sample(node, frames[0]) or estimate
+        if estimate:
+            estimate["total_bytes"] = int(estimate["bytes_per_frame"] * len(frames))
+            estimate["total_seconds"] = (estimate["seconds_per_frame"] * len(frames)
+                                         if estimate["seconds_per_frame"] is not None else None)
+        node_plan["estimate"] = estimate
+        return node_plan
+
+    def plan(self, sample=True):
+        """
+        캐시를 쓰거나 폴더를 만들지 않고 익스포트 계획을 만든다. (dry run)
+        노드별 캐시 경로, 프레임 범위, 실제로 뽑을 프레임, 예상 크기/시간을 담는다.
+        예상치는 이전 매니페스트, 비용 기록 순서로 사용하고, 없으면 임시 폴더에 한 프레임을 뽑아서 잰다.
+        :param sample: False 면 매니페스트가 없는 노드는 예상치를 비워둔다.
+        """
+        open_start_time = time.time()
+        self._open_scene()
+        open_elapsed = time.time() - open_start_time
+
+        start, end = self._get_frame_range()
+        nodes = [self._plan_node(node, start, end, sample) for node in self._get_yeti_nodes()]
+
+        estimates = [n["estimate"] for n in nodes if n["frame_count"]]
+        known_bytes = [e["total_bytes"] for e in estimates if e]
+        known_seconds = [e["total_seconds"] for e in estimates if e and e["total_seconds"] is not None]
+        return {
+            "scene_file": self.scene_file,
+            "version": self.version,
+            "frame_range": [start, end],
+            "samples": self.samples,
+            "shard": list(self.shard) if self.shard else None,
+            "scene_open_seconds": open_elapsed,
+            "nodes": nodes,
+            "totals": {
+                "nodes": len(nodes),
+                "frames": sum(n["frame_count"] for n in nodes),
+                "bytes": sum(known_bytes),
+                "seconds": sum(known_seconds),
+                # 예상치가 없는 노드가 있으면 합계가 실제보다 작다
+                "complete_estimate": len(known_seconds) == len(estimates),
+            },
+        }
+
     def export(self):
         """Yeti 캐시 추출"""
         # 씬 열기
         print(f"[START] Exporting Yeti caches from scene: {self.scene_file}")
-        cmds.file(self.scene_file, o=True, force=True)
-
-        # 프레임 범위가 None으로 입력 받을경우 자동 추출
-        start = (self.start_frame - 5) if self.start_frame else int(cmds.playbackOptions(q=True, min=True)) - 5
-        end = (self.end_frame + 5) if self.end_frame else int(cmds.playbackOptions(q=True, max=True)) + 5
+        run_start_time = time.time()
+        self.events.run_start(scene_file=self.scene_file, version=self.version, samples=self.samples)
+        self._open_scene()
 
         exported_paths = []
+        self.node_stats = []
+        try:
+            self._export_nodes(exported_paths)
+        finally:
+            frames = sum(s.get("frames", 0) for s in self.node_stats)
+            seconds = time.time() - run_start_time
+            self.events.emit("totals", nodes=len(self.node_stats), frames=frames,
+                             bytes=sum(s.get("bytes", 0) for s in self.node_stats), seconds=seconds,
+                             fps=frames / seconds if seconds else 0.0)
+        return exported_paths
+
+    def _export_nodes(self, exported_paths):
+        """씬이 열린 상태에서 노드를 차례로 익스포트하고 노드 사이 메모리를 정리한다."""
+        start, end = self._get_frame_range()
+        nodes_since_open = 0
+        reopen = False
         for node in self._get_yeti_nodes():
+            if reopen:
+                self._reopen_scene()
+                nodes_since_open = 0
+
             cache_path = self._get_cache_path(node)
-            # pgYetiCommand 실행
-            cmds.pgYetiCommand(node, writeCache=cache_path, range=(start, end), samples=self.samples)
-            print(f"[SUCCESS] Exported: {cache_path}")
+            self._written = {"frames": 0, "bytes": 0}
+            self.events.emit("node_start", node=node, cache_path=cache_path, frame_range=[start, end])
+            sampler = RssSampler().start()
+            node_start_time = time.time()
+            try:
+                # pgYetiCommand 실행
+                self._export_node(node, cache_path, start, end)
+            except Exception as e:
+                self.events.emit("node_end", node=node, cache_path=cache_path, status="FAILED",
+                                 seconds=time.time() - node_start_time, error=str(e), **self._written)
+                raise
+            finally:
+                elapsed = time.time() - node_start_time
+                peak_rss = sampler.stop()
+            self.events.emit("node_end", node=node, cache_path=cache_path, status="SUCCESS", seconds=elapsed,
+                             peak_rss_mb=peak_rss, **self._written)
+            print(f"{SUCCESS_PREFIX} {cache_path}")
             exported_paths.append(cache_path)
 
-        return exported_paths
+            # 다음 노드 전에 메모리 정리
+            release_memory()
+            nodes_since_open += 1
+            rss_after = get_rss_mb()
+            reopen = bool((self.reopen_every and nodes_since_open >= self.reopen_every)
+                          or (self.max_rss_gb and rss_after is not None and rss_after > self.max_rss_gb * 1024))
+
+            stats = {"node": node, "cache_path": cache_path, "elapsed": elapsed,
+                     "peak_rss_mb": peak_rss, "rss_after_release_mb": rss_after, "reopen_after": reopen}
+            if self.events.enabled:
+                stats.update(self._written)
+            self.node_stats.append(stats)
+            print(f"{STATS_PREFIX} {json.dumps(stats)}")
+
+    def _reopen_scene(self):
+        """새 씬으로 비우고 메모리를 정리한 뒤 씬을 다시 연다."""
+        rss_before = get_rss_mb()
+        reset_scene()
+        self._open_scene()
+        print(f"[MEMORY] Scene reopened (RSS {rss_before or 0:.0f} MB -> {get_rss_mb() or 0:.0f} MB)")
 
     def cleanup(self):
         """Standalone 종료"""
-        maya.standalone.uninitialize()
+        self.events.close()
+        uninitialize_standalone()
+
+    @classmethod
+    def export_batch(cls, scene_files, **kwargs):
+        """
+        maya.standalone 을 한 번만 초기화하고 여러 씬을 차례로 익스포트한다.
+        씬 하나가 실패해도 다음 씬은 계속 진행하고, 씬 사이에는 reset_scene 으로 메모리를 정리한다.
+        :param scene_files: 씬 경로 리스트
+        :param kwargs: YetiCacheExporter 생성자 인자 (scene_file 제외)
+        :return: 씬별 결과 리스트 [{'scene_file', 'status', 'exported_paths', 'node_stats', 'elapsed', 'error'}, ...]
+        """
+        initialize_standalone()
+        results = []
+        for index, scene_file in enumerate(scene_files):
+            print(f"[BATCH {index + 1}/{len(scene_files)}] {scene_file}")
+            result = {"scene_file": scene_file, "status": "FAILED", "exported_paths": [], "node_stats": [],
+                      "elapsed": 0.0, "error": None}
+            start_time = time.time()
+            try:
+                if not os.path.exists(scene_file):
+                    raise RuntimeError(f"씬 파일을 찾을 수 없습니다: {scene_file}")
+                exporter = cls(scene_file=scene_file, **kwargs)
+                result["exported_paths"] = exporter.export()
+                result["node_stats"] = exporter.node_stats
+                result["status"] = "SUCCESS"
+            except Exception as e:
+                result["error"] = str(e)
+                print(f"[ERROR] {scene_file}: {e}")
+            finally:
+                result["elapsed"] = time.time() - start_time
+                try:
+                    reset_scene()
+                except Exception as e:
+                    print(f"[WARNING] 씬 정리 중 에러: {e}")
+            results.append(result)
+        return results
 
 if __name__ == '__main__':
 
@@ -205,6 +966,37 @@ if __name__ == '__main__':
     if not YetiCacheExporter.are_valid_arguments(opts):
         sys.exit(1)
 
+    if opts.scenefiles or opts.queue_file:
+        scene_files = list(opts.scenefiles or [])
+        if opts.queue_file:
+            scene_files.extend(read_queue_file(opts.queue_file))
+
+        event_logger = events_util.EventLogger(opts.events)
+        batch_results = YetiCacheExporter.export_batch(
+            scene_files,
+            start_frame=opts.start_frame,
+            end_frame=opts.end_frame,
+            samples=opts.samples,
+            nodes=opts.nodes,
+            resume=opts.resume,
+            skip_up_to_date=opts.skip_up_to_date,
+            selective_refs=opts.selective_refs,
+            staging_dir=opts.staging_dir,
+            copy_workers=opts.copy_workers,
+            copy_queue_depth=opts.copy_queue_depth,
+            reopen_every=opts.reopen_every,
+            max_rss_gb=opts.max_rss_gb,
+            events=event_logger,
+            cost_history=opts.cost_history
+        )
+        event_logger.close()
+        uninitialize_standalone()
+
+        failed = [r for r in batch_results if r["status"] != "SUCCESS"]
+        print(json.dumps(batch_results, indent=2))
+        print(f"[ALL DONE] Batch finished: {len(batch_results) - len(failed)} succeeded, {len(failed)} failed.")
+        sys.exit(1 if failed else 0)
+
     if not os.path.exists(opts.scenefile):
         print(f"[WARNING] 씬 파일을 찾을 수 없습니다: {opts.scenefile}")
         sys.exit(1)
@@ -215,8 +1007,32 @@ if __name__ == '__main__':
         start_frame=opts.start_frame,
         end_frame=opts.end_frame,
         samples=opts.samples,
-        nodes=opts.nodes
+        nodes=opts.nodes,
+        shard=(opts.shard_start, opts.shard_end) if opts.shard_start is not None else None,
+        preroll=opts.preroll,
+        resume=opts.resume,
+        skip_up_to_date=opts.skip_up_to_date,
+        selective_refs=opts.selective_refs,
+        staging_dir=opts.staging_dir,
+        copy_workers=opts.copy_workers,
+        copy_queue_depth=opts.copy_queue_depth,
+        reopen_every=opts.reopen_every,
+        max_rss_gb=opts.max_rss_gb,
+        events=opts.events,
+        cost_history=opts.cost_history
     )
+    if opts.list_nodes:
+        print(f"{NODES_PREFIX} {json.dumps(exporter.list_nodes())}")
+        print(f"{RANGE_PREFIX} {json.dumps(exporter._get_frame_range())}")
+        print(f"{KEYS_PREFIX} {json.dumps(exporter.get_cost_keys())}")
+        exporter.cleanup()
+        sys.exit(0)
+
+    if opts.dry_run:
+        print(f"{PLAN_PREFIX} {json.dumps(exporter.plan(sample=not opts.no_sample))}")
+        exporter.cleanup()
+        sys.exit(0)
+
     exported_paths = exporter.export()
     exporter.cleanup()
     print(f"[ALL DONE] Export finished for {len(exported_paths)} nodes.")
@@ -2,13 +2,21 @@
 
 """
 ============================
-Casper Script Runner for Maya (v5.0 Final)
+Casper Script Runner for Maya (v5.5)
 ============================
 
 [기능]
-- 지정된 폴더와 그 하위 폴더의 .py 스크립트 목록을 탭으로 구분하여 UI에 표시합니다.
-- 스크립트 버튼을 좌클릭하면 스크립트를 실행하고, 우클릭하면 해당 스크립트의 도움말(docstring)을 표시합니다.
+- 지정된 폴더와 그 아래 모든 하위 폴더의 .py 스크립트 목록을 탭으로 구분하여 UI에 표시합니다. (하위 탭 이름은 상대 경로)
+- 스크립트 항목을 좌클릭하면 스크립트를 실행하고, 우클릭하면 해당 스크립트의 도움말(docstring)을 표시합니다.
+- 탭은 처음 열릴 때 채워지고, 스크립트 목록은 화면에 보이는 줄만 그리는 리스트 뷰라서 스크립트가 많아도 UI가 가볍습니다.
 - 마지막으로 사용한 폴더 경로를 'casper_config.txt'에 자동 저장하여 다음 실행 시 자동으로 로드합니다.
+- 스크립트 목록과 도움말은 'casper_script_index.json' 인덱스에 저장해 두고, 실행하면 인덱스로 바로 UI를 그린 뒤
+  백그라운드에서 바뀐 폴더만 다시 스캔하여 해당 탭만 갱신합니다.
+- 실행한 스크립트는 컴파일된 코드 객체를 (경로, mtime, 크기)로 메모리와 'casper_code_cache' 폴더에 캐시하여,
+  같은 스크립트를 다시 실행할 때 컴파일을 건너뜁니다. (에러 로그에는 실제 스크립트 경로가 표시됩니다)
+- 검색창에 입력하면 스크립트 이름, 폴더 이름, 도움말(docstring) 역색인에서 접두어/오타를 허용하는 검색 결과를
+  점수순으로 보여줍니다. 도움말은 인덱스에 한 번만 추출해 두고 다시 파싱하지 않습니다.
+- 폴더와 스크립트 파일을 감시하여, 파일이 추가/삭제/수정되면 잠시 모아서(디바운스) 바뀐 폴더의 탭만 자동으로 갱신합니다.
 - '폴더 변경' 버튼을 통해 언제든지 스크립트 루트 폴더를 변경하고 저장할 수 있습니다.
 - UI는 항상 Maya 위에 표시되며, Maya 종료 시 함께 닫힙니다.
 - 상세한 에러 로그, 새로고침, 스크롤 등 다양한 편의 기능을 제공합니다.
@@ -21,15 +29,23 @@ launch()
 """
 
 import os
+import re
 import sys
+import json
+import bisect
+import struct
+import marshal
+import hashlib
+import importlib.util
 import traceback
 import random
 import ast
 
-from PySide2.QtCore import Qt, Signal
+from PySide2.QtCore import Qt, Signal, QThread, QTimer, QFileSystemWatcher, QAbstractListModel, QModelIndex, QSize
+from PySide2.QtGui import QColor, QFont, QPainter
 from PySide2.QtWidgets import (
     QApplication, QWidget, QVBoxLayout, QHBoxLayout, QPushButton,
-    QFileDialog, QLabel, QMessageBox, QScrollArea, QTabWidget
+    QFileDialog, QLabel, QMessageBox, QTabWidget, QListView, QStyledItemDelegate, QStyle, QLineEdit
 )
 from shiboken2 import wrapInstance
 import maya.OpenMayaUI as omui
@@ -38,6 +54,21 @@ import maya.utils
 # --- 설정 파일 관리 ---
 # 이 스크립트 파일이 있는 디렉토리를 기준으로 설정 파일 경로를 정합니다.
 CONFIG_FILE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "casper_config.txt")
+# 스크립트 인덱스도 설정 파일 옆에 저장합니다.
+INDEX_FILE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "casper_script_index.json")
+INDEX_VERSION = 1
+
+IGNORE_FOLDERS = {"__pycache__", ".git", ".venv", ".vscode"}
+IGNORE_FILES = {"__init__.py"}
+# 검색어/이름/도움말을 단어로 나눕니다. (camelCase, snake_case, 숫자, 한글 단어)
+SEARCH_TOKEN_PATTERN = re.compile(r"[A-Z]+(?![a-z])|[A-Z]?[a-z]+|\d+|[^\W\d_A-Za-z]+")
+SEARCH_RESULT_LIMIT = 200
+# 컴파일된 스크립트 코드 캐시 폴더 (None 이면 메모리에만 캐시)
+CODE_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "casper_code_cache")
+# 코드 캐시 파일 헤더: 파이썬 매직 넘버 + 원본 mtime_ns, size
+CODE_CACHE_HEADER = struct.Struct("<4sqq")
+# 파일 변경 알림을 모았다가 한 번에 스캔하는 대기 시간 (ms)
+WATCH_DEBOUNCE_MS = 300
 
 
 def read_config():
@@ -71,33 +102,467 @@ def _extract_docstring(file_path):
         return ""
 
 
-# --- 커스텀 UI 위젯 ---
-class CustomScriptButton(QPushButton):
-    """좌클릭과 우클릭 이벤트를 구분하는 커스텀 버튼입니다."""
-    rightClicked = Signal(str)
+# --- 스크립트 인덱스 ---
+class ScriptIndex(object):
+    """
+    스크립트 폴더 인덱스 (INDEX_FILE_PATH 에 JSON 으로 저장)
+    폴더 경로 -> {"mtime": 폴더 mtime, "subfolders": [...], "scripts": {파일 이름: {"mtime", "size", "doc"}}}
 
-    def __init__(self, text, script_path, parent=None):
-        super().__init__(text, parent)
-        self.script_path = script_path
+    - 폴더 mtime 이 같으면 os.listdir 없이 이전 목록을 재사용합니다. (파일 추가/삭제/이름 변경시 폴더 mtime 이 바뀜)
+    - 파일 mtime/size 가 같으면 docstring 을 다시 파싱하지 않습니다.
+    """
 
-    def mousePressEvent(self, event):
-        if event.button() == Qt.RightButton:
-            self.rightClicked.emit(self.script_path)
+    def __init__(self, root, folders=None):
+        self.root = root
+        self.folders = folders or {}
+
+    @classmethod
+    def load(cls, root, index_path=INDEX_FILE_PATH):
+        """저장된 인덱스를 읽습니다. 루트가 다르거나 읽을 수 없으면 빈 인덱스를 반환합니다."""
+        try:
+            with open(index_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return cls(root)
+        if data.get("version") != INDEX_VERSION or data.get("root") != root:
+            return cls(root)
+        return cls(root, data.get("folders", {}))
+
+    def save(self, index_path=INDEX_FILE_PATH):
+        tmp_path = f"{index_path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"version": INDEX_VERSION, "root": self.root, "folders": self.folders}, f)
+        os.replace(tmp_path, index_path)
+
+    def subfolders(self, folder):
+        """인덱스에 있는 하위 폴더 경로 리스트 (이름순)"""
+        entry = self.folders.get(folder)
+        return [os.path.join(folder, name) for name in entry["subfolders"]] if entry else []
+
+    def all_folders(self):
+        """루트부터 깊이 우선으로 모든 폴더 경로 리스트 (루트가 처음, 하위 폴더는 이름순)"""
+        result = []
+        pending = [self.root] if self.root in self.folders else []
+        while pending:
+            folder = pending.pop()
+            result.append(folder)
+            pending.extend(reversed([f for f in self.subfolders(folder) if f in self.folders]))
+        return result
+
+    def scripts(self, folder):
+        """인덱스에 있는 스크립트 경로 리스트 (이름순)"""
+        entry = self.folders.get(folder)
+        if not entry:
+            return []
+        return [os.path.join(folder, name) for name in sorted(entry["scripts"], key=str.lower)]
+
+    def get_docstring(self, script_path, stale=False):
+        """
+        인덱스의 docstring. 파일이 바뀌었거나 인덱스에 없으면 다시 파싱해서 갱신합니다.
+        :param stale: True 면 mtime/size 가 같아도 다시 파싱합니다. (감시자가 수정을 알린 파일)
+        """
+        folder, name = os.path.split(script_path)
+        scripts = self.folders.get(folder, {}).get("scripts", {})
+        record = scripts.get(name)
+        try:
+            stat = os.stat(script_path)
+        except OSError:
+            return ""
+        if stale or record is None or record["mtime"] != stat.st_mtime_ns or record["size"] != stat.st_size:
+            record = {"mtime": stat.st_mtime_ns, "size": stat.st_size, "doc": _extract_docstring(script_path) or ""}
+            # 스캔 스레드가 읽는 중일 수 있으므로 이미 있는 항목만 교체합니다.
+            if name in scripts:
+                scripts[name] = record
+        return record["doc"]
+
+    @staticmethod
+    def scan_folder(folder, previous=None):
+        """폴더 하나를 스캔합니다. previous 엔트리와 같은 부분은 재사용합니다."""
+        folder_mtime = os.stat(folder).st_mtime_ns
+        if previous and previous["mtime"] == folder_mtime:
+            subfolders = list(previous["subfolders"])
+            file_names = list(previous["scripts"])
         else:
-            super().mousePressEvent(event)
+            names = os.listdir(folder)
+            subfolders = sorted([d for d in names if d not in IGNORE_FOLDERS and os.path.isdir(os.path.join(folder, d))],
+                                key=str.lower)
+            file_names = [f for f in names if f.endswith(".py") and f not in IGNORE_FILES]
+
+        previous_scripts = (previous or {}).get("scripts", {})
+        scripts = {}
+        for name in file_names:
+            try:
+                stat = os.stat(os.path.join(folder, name))
+            except OSError:
+                continue
+            record = previous_scripts.get(name)
+            if record is None or record["mtime"] != stat.st_mtime_ns or record["size"] != stat.st_size:
+                record = {"mtime": stat.st_mtime_ns, "size": stat.st_size,
+                          "doc": _extract_docstring(os.path.join(folder, name)) or ""}
+            scripts[name] = record
+        return {"mtime": folder_mtime, "subfolders": subfolders, "scripts": scripts}
+
+    def rescan(self, folders=None):
+        """
+        폴더를 다시 스캔합니다.
+        :param folders: 다시 스캔할 폴더 경로들. None 이면 루트부터 모든 하위 폴더를 확인합니다.
+                        주어진 폴더에서 새로 생긴 하위 폴더는 그 아래까지 스캔하고, 없어진 폴더는 하위 폴더와 함께 뺍니다.
+        :return: (새 ScriptIndex, 바뀌거나 추가/삭제된 폴더 경로 set)
+        """
+        new_folders = dict(self.folders)
+        pending = [self.root] if folders is None else [f for f in folders if f in self.folders or f == self.root]
+        visited = set()
+        while pending:
+            folder = pending.pop()
+            if folder in visited:
+                continue
+            visited.add(folder)
+            try:
+                entry = self.scan_folder(folder, self.folders.get(folder))
+            except OSError:
+                if folder == self.root:
+                    raise
+                new_folders.pop(folder, None)
+                continue
+            new_folders[folder] = entry
+            for child in (os.path.join(folder, name) for name in entry["subfolders"]):
+                if folders is None or child not in new_folders:
+                    pending.append(child)
+
+        # 루트에서 닿지 않는 폴더(삭제되었거나 IGNORE 된 폴더의 하위)는 뺍니다.
+        new_index = ScriptIndex(self.root, new_folders)
+        new_index.folders = {f: new_folders[f] for f in new_index.all_folders()}
+
+        changed = {f for f in set(new_index.folders) | set(self.folders)
+                   if new_index.folders.get(f) != self.folders.get(f)}
+        return new_index, changed
+
+
+def _tokenize(text):
+    return [token.lower() for token in SEARCH_TOKEN_PATTERN.findall(text)]
+
+
+def _trigrams(token):
+    # 앞뒤를 채워서 짧은 단어와 첫 글자도 trigram 에 반영합니다.
+    padded = f"  {token} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def _edit_distance(a, b, limit):
+    """글자 바꿈(전치)을 1로 세는 편집 거리. limit 를 넘으면 limit + 1 을 반환합니다."""
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    previous2, previous = None, list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        current = [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            cost = 0 if a[i - 1] == b[j - 1] else 1
+            current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                current[j] = min(current[j], previous2[j - 2] + 1)
+        if min(current) > limit:
+            return limit + 1
+        previous2, previous = previous, current
+    return previous[-1]
+
+
+class ScriptSearchIndex(object):
+    """
+    스크립트 이름 / 폴더 이름 / 도움말 단어의 역색인 (ScriptIndex 로 만듭니다)
+    - 단어 -> {스크립트 번호: 필드 가중치} 로 검색어 단어와 정확히 같은 단어를 찾습니다.
+    - 정렬된 단어 목록에서 bisect 로 접두어가 같은 단어를 찾습니다.
+    - 단어 trigram 색인으로 오타가 있는 단어 후보를 찾고, trigram Dice 유사도나 편집 거리로 거릅니다.
+    검색어의 모든 단어가 맞는 스크립트만 점수순으로 반환합니다.
+    """
+    FIELD_WEIGHTS = {"name": 10.0, "folder": 4.0, "doc": 1.0}
+    PREFIX_SCORE = 0.6
+    FUZZY_SCORE = 0.5
+    FUZZY_MIN_SIMILARITY = 0.45
+
+    def __init__(self, script_index):
+        self.paths = []
+        self.postings = {}
+        for folder in script_index.all_folders():
+            folder_tokens = [] if folder == script_index.root else _tokenize(os.path.relpath(folder, script_index.root))
+            for name, record in sorted(script_index.folders[folder]["scripts"].items()):
+                script_id = len(self.paths)
+                self.paths.append(os.path.join(folder, name))
+                script_name = os.path.splitext(name)[0]
+                self._add(script_id, _tokenize(script_name) + [script_name.lower()], self.FIELD_WEIGHTS["name"])
+                self._add(script_id, folder_tokens, self.FIELD_WEIGHTS["folder"])
+                self._add(script_id, _tokenize(record["doc"]), self.FIELD_WEIGHTS["doc"])
+
+        self.vocabulary = sorted(self.postings)
+        self.trigrams = {}
+        for token in self.vocabulary:
+            for gram in _trigrams(token):
+                self.trigrams.setdefault(gram, []).append(token)
+
+    def _add(self, script_id, tokens, weight):
+        for token in set(tokens):
+            posting = self.postings.setdefault(token, {})
+            if posting.get(script_id, 0.0) < weight:
+                posting[script_id] = weight
+
+    def _term_matches(self, term):
+        """검색어 단어 하나에 맞는 색인 단어와 배율 {단어: 배율}"""
+        matches = {}
+        if term in self.postings:
+            matches[term] = 1.0
+
+        position = bisect.bisect_left(self.vocabulary, term)
+        while position < len(self.vocabulary) and self.vocabulary[position].startswith(term):
+            matches.setdefault(self.vocabulary[position], self.PREFIX_SCORE)
+            position += 1
+
+        grams = _trigrams(term)
+        if len(term) >= 3:
+            shared = {}
+            for gram in grams:
+                for token in self.trigrams.get(gram, ()):
+                    shared[token] = shared.get(token, 0) + 1
+            # 짧은 단어는 오타 1개, 긴 단어는 2개까지 허용 (글자 바꿈 포함)
+            max_edits = 1 if len(term) <= 5 else 2
+            for token, count in shared.items():
+                if token in matches or count < 2:
+                    continue
+                similarity = 2.0 * count / (len(grams) + len(_trigrams(token)))
+                if similarity < self.FUZZY_MIN_SIMILARITY:
+                    edits = _edit_distance(term, token, max_edits)
+                    if edits > max_edits:
+                        continue
+                    similarity = 1.0 - edits / float(max(len(term), len(token)))
+                matches[token] = self.FUZZY_SCORE * similarity
+        return matches
+
+    def search(self, query, limit=SEARCH_RESULT_LIMIT):
+        """:return: 점수가 높은 순서의 스크립트 경로 리스트"""
+        scores = None
+        for term in set(_tokenize(query)):
+            term_scores = {}
+            for token, factor in self._term_matches(term).items():
+                for script_id, weight in self.postings[token].items():
+                    if term_scores.get(script_id, 0.0) < weight * factor:
+                        term_scores[script_id] = weight * factor
+            if scores is None:
+                scores = term_scores
+            else:
+                scores = {script_id: scores[script_id] + score for script_id, score in term_scores.items()
+                          if script_id in scores}
+            if not scores:
+                return []
+
+        ranked = sorted((scores or {}).items(), key=lambda item: (-item[1], self.paths[item[0]].lower()))
+        return [self.paths[script_id] for script_id, _ in ranked[:limit]]
+
+
+class ScriptScanThread(QThread):
+    """백그라운드에서 인덱스를 다시 스캔하고 저장한 뒤, 검색 색인까지 만들어서 UI 스레드로 보냅니다."""
+    scanned = Signal(object, object, object)
+    failed = Signal(str)
+
+    def __init__(self, index, folders=None, parent=None):
+        super().__init__(parent)
+        self.index = index
+        self.folders = folders
+
+    def run(self):
+        try:
+            new_index, changed = self.index.rescan(self.folders)
+            new_index.save()
+            search_index = ScriptSearchIndex(new_index)
+        except Exception as e:
+            self.failed.emit(str(e))
+            return
+        self.scanned.emit(new_index, changed, search_index)
+
+
+# --- 스크립트 코드 캐시 ---
+class ScriptCodeCache(object):
+    """
+    스크립트 경로 -> 컴파일된 코드 객체 캐시
+    (mtime, size)가 같으면 다시 컴파일하지 않습니다. cache_dir 가 있으면 marshal 로 디스크에도 저장해서
+    Maya 를 다시 켠 뒤에도 재사용합니다. 파이썬 버전이 달라지면(매직 넘버) 디스크 캐시는 무시합니다.
+    """
+
+    def __init__(self, cache_dir=None):
+        self.cache_dir = cache_dir
+        self._codes = {}
+
+    def _cache_file(self, script_path):
+        name = hashlib.md5(os.path.abspath(script_path).encode("utf-8")).hexdigest()
+        return os.path.join(self.cache_dir, f"{name}.casperc")
+
+    def _read_disk(self, script_path, mtime, size):
+        try:
+            with open(self._cache_file(script_path), "rb") as f:
+                data = f.read()
+            magic, cached_mtime, cached_size = CODE_CACHE_HEADER.unpack_from(data)
+            if (magic, cached_mtime, cached_size) != (importlib.util.MAGIC_NUMBER, mtime, size):
+                return None
+            return marshal.loads(data[CODE_CACHE_HEADER.size:])
+        except (OSError, ValueError, EOFError, TypeError, struct.error):
+            return None
+
+    def _write_disk(self, script_path, mtime, size, code):
+        cache_file = self._cache_file(script_path)
+        tmp_path = f"{cache_file}.tmp{os.getpid()}"
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            with open(tmp_path, "wb") as f:
+                f.write(CODE_CACHE_HEADER.pack(importlib.util.MAGIC_NUMBER, mtime, size))
+                f.write(marshal.dumps(code))
+            os.replace(tmp_path, cache_file)
+        except OSError as e:
+            # 디스크 캐시는 실패해도 실행에는 문제가 없습니다.
+            print(f"코드 캐시를 저장하지 못했습니다: {e}")
+
+    def get(self, script_path):
+        """스크립트의 코드 객체. 파일명은 실제 경로로 컴파일해서 traceback 이 원본 파일을 가리킵니다."""
+        stat = os.stat(script_path)
+        cached = self._codes.get(script_path)
+        if cached and cached[0] == stat.st_mtime_ns and cached[1] == stat.st_size:
+            return cached[2]
+
+        code = self._read_disk(script_path, stat.st_mtime_ns, stat.st_size) if self.cache_dir else None
+        if code is None:
+            with open(script_path, "r", encoding="utf-8") as f:
+                source = f.read()
+            code = compile(source, script_path, "exec")
+            if self.cache_dir:
+                self._write_disk(script_path, stat.st_mtime_ns, stat.st_size, code)
+        self._codes[script_path] = (stat.st_mtime_ns, stat.st_size, code)
+        return code
+
+
+# --- 커스텀 UI 위젯 ---
+class ScriptListModel(QAbstractListModel):
+    """
+    한 폴더의 스크립트 목록 모델
+    버튼 위젯 대신 경로 리스트와 색상 번호만 가지고, 뷰가 보이는 줄만 data() 로 요청합니다.
+    """
+    ScriptPathRole = Qt.UserRole + 1
+
+    def __init__(self, colors, parent=None):
+        super().__init__(parent)
+        self.colors = colors
+        self._paths = []
+        self._color_indices = []
+        self._root = None
+
+    def set_scripts(self, script_paths, root=None):
+        """:param root: 주면 (검색 결과처럼 여러 폴더가 섞인 경우) 이름 옆에 root 기준 폴더 경로를 표시합니다."""
+        self.beginResetModel()
+        self._paths = list(script_paths)
+        self._root = root
+        # 이웃한 항목끼리 같은 색이 나오지 않게 색상 번호를 미리 정합니다.
+        self._color_indices = []
+        last_color_index = -1
+        for _ in self._paths:
+            current_color_index = last_color_index
+            while current_color_index == last_color_index:
+                current_color_index = random.randint(0, len(self.colors) - 1)
+            self._color_indices.append(current_color_index)
+            last_color_index = current_color_index
+        self.endResetModel()
+
+    @property
+    def script_paths(self):
+        return list(self._paths)
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._paths)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        script_path = self._paths[index.row()]
+        if role == Qt.DisplayRole:
+            folder, name = os.path.split(script_path)
+            display_name = f"▶ {os.path.splitext(name)[0]}"
+            if self._root and folder != self._root:
+                display_name += f"   ({os.path.relpath(folder, self._root).replace(os.sep, '/')})"
+            return display_name
+        if role == Qt.BackgroundRole:
+            return QColor(self.colors[self._color_indices[index.row()]])
+        if role == Qt.ToolTipRole or role == self.ScriptPathRole:
+            return script_path
+        return None
+
+
+class ScriptItemDelegate(QStyledItemDelegate):
+    """기존 스크립트 버튼 모양(색 배경, 흰 글씨, 12pt)으로 한 줄을 그립니다."""
+    ROW_HEIGHT = 32
+    ROW_SPACING = 4
+
+    def paint(self, painter, option, index):
+        rect = option.rect.adjusted(0, 0, 0, -self.ROW_SPACING)
+        color = index.data(Qt.BackgroundRole)
+        if option.state & QStyle.State_MouseOver:
+            color = color.lighter(120)
+        painter.save()
+        painter.fillRect(rect, color)
+        font = QFont(option.font)
+        font.setPointSize(12)
+        painter.setFont(font)
+        painter.setPen(Qt.white)
+        painter.drawText(rect, Qt.AlignCenter, index.data(Qt.DisplayRole))
+        painter.restore()
+
+    def sizeHint(self, option, index):
+        return QSize(option.rect.width(), self.ROW_HEIGHT + self.ROW_SPACING)
+
+
+class ScriptListView(QListView):
+    """좌클릭과 우클릭을 구분해서 스크립트 경로를 보내는 리스트 뷰입니다."""
+    leftClicked = Signal(str)
+    rightClicked = Signal(str)
+    EMPTY_MESSAGE = "⚠️ 이 폴더에 실행할 .py 파일이 없습니다."
+
+    def __init__(self, folder, model, parent=None):
+        super().__init__(parent)
+        self.folder = folder
+        self.setModel(model)
+        self.setItemDelegate(ScriptItemDelegate(self))
+        # 모든 줄 높이가 같아서 보이는 줄만 계산합니다.
+        self.setUniformItemSizes(True)
+        self.setSelectionMode(QListView.NoSelection)
+        self.setMouseTracking(True)
+        self.setVerticalScrollMode(QListView.ScrollPerPixel)
+        self.setStyleSheet("QListView { border: none; background-color: transparent; }")
+        # 탭이 처음 열렸을 때 채워졌는지 여부
+        self.populated = False
+
+    def mouseReleaseEvent(self, event):
+        index = self.indexAt(event.pos())
+        if index.isValid():
+            script_path = index.data(ScriptListModel.ScriptPathRole)
+            if event.button() == Qt.RightButton:
+                self.rightClicked.emit(script_path)
+            elif event.button() == Qt.LeftButton:
+                self.leftClicked.emit(script_path)
+        super().mouseReleaseEvent(event)
+
+    def paintEvent(self, event):
+        super().paintEvent(event)
+        if self.populated and self.model().rowCount() == 0:
+            painter = QPainter(self.viewport())
+            painter.setPen(QColor("#cccccc"))
+            painter.drawText(self.viewport().rect().adjusted(8, 8, -8, -8), Qt.AlignTop | Qt.AlignLeft,
+                             self.EMPTY_MESSAGE)
 
 
 # --- 메인 UI 클래스 ---
 class ScriptRunner(QWidget):
     BUTTON_COLORS = ["#555555", "#666666", "#4a6a7f", "#7f6c4a", "#4f7f4a"]
-    IGNORE_FOLDERS = {"__pycache__", ".git", ".venv", ".vscode"}
-    IGNORE_FILES = {"__init__.py"}
+    IGNORE_FOLDERS = IGNORE_FOLDERS
+    IGNORE_FILES = IGNORE_FILES
 
     def __init__(self, folder_path, parent=get_maya_main_window()):
         super().__init__(parent)
         self.folder_path = folder_path
         self.setWindowFlags(Qt.Window)
-        self.setWindowTitle("Casper Script Runner v5.0 (Final)")
+        self.setWindowTitle("Casper Script Runner v5.5")
         self.setGeometry(300, 200, 450, 550)
 
         main_layout = QVBoxLayout(self)
@@ -118,6 +583,22 @@ class ScriptRunner(QWidget):
         top_layout.addWidget(refresh_btn)
         main_layout.addLayout(top_layout)
 
+        # --- 검색창과 검색 결과 (검색어가 있을 때만 탭 대신 표시) ---
+        self.search_edit = QLineEdit()
+        self.search_edit.setPlaceholderText("🔍 스크립트 검색 (이름, 폴더, 도움말)")
+        self.search_edit.setClearButtonEnabled(True)
+        self.search_edit.textChanged.connect(self.search_scripts)
+        main_layout.addWidget(self.search_edit)
+
+        self.search_view = ScriptListView(None, ScriptListModel(self.BUTTON_COLORS))
+        self.search_view.EMPTY_MESSAGE = "⚠️ 검색 결과가 없습니다."
+        self.search_view.populated = True
+        self.search_view.leftClicked.connect(self.run_script)
+        self.search_view.rightClicked.connect(self.show_script_help)
+        self.search_view.hide()
+        main_layout.addWidget(self.search_view)
+        self._search_index = None
+
         # --- 탭 위젯 UI ---
         self.tab_widget = QTabWidget()
         self.tab_widget.setStyleSheet("""
@@ -126,9 +607,34 @@ class ScriptRunner(QWidget):
             QTabBar::tab:selected { background: #606060; border-color: #333; border-bottom-color: #606060; color: white; }
             QTabBar::tab:hover { background: #505050; }
         """)
+        self.tab_widget.currentChanged.connect(self._on_tab_changed)
         main_layout.addWidget(self.tab_widget)
 
+        # 폴더 경로 -> 탭 위젯 (ScriptListView)
+        self._tabs = {}
+        self._scan_thread = None
+        # 스캔 중에 들어온 요청: 전체 스캔 여부와 다시 스캔할 폴더
+        self._rescan_pending = False
+        self._pending_folders = set()
+        # 감시자가 수정을 알린 스크립트 (도움말을 다시 읽어야 함)
+        self._stale_help = set()
+        self.script_index = ScriptIndex.load(self.folder_path)
+        self.code_cache = ScriptCodeCache(CODE_CACHE_DIR)
+
+        # 폴더/스크립트 감시. 알림은 WATCH_DEBOUNCE_MS 동안 모았다가 바뀐 폴더만 스캔합니다.
+        self._watcher = QFileSystemWatcher(self)
+        self._watcher.directoryChanged.connect(self._on_folder_changed)
+        self._watcher.fileChanged.connect(self._on_script_changed)
+        self._watch_keys = {}
+        self._dirty_folders = set()
+        self._debounce_timer = QTimer(self)
+        self._debounce_timer.setSingleShot(True)
+        self._debounce_timer.setInterval(WATCH_DEBOUNCE_MS)
+        self._debounce_timer.timeout.connect(self._rescan_dirty_folders)
+
+        # 저장된 인덱스로 바로 그리고, 바뀐 폴더는 백그라운드에서 찾아서 반영
         self.load_scripts()
+        self.start_rescan()
 
     def change_folder(self):
         """'폴더 변경' 버튼 클릭 시, 새로운 폴더를 선택하고 UI를 갱신합니다."""
@@ -137,66 +643,218 @@ class ScriptRunner(QWidget):
             self.folder_path = new_folder
             write_config(new_folder)  # 새로운 경로를 설정 파일에 저장
             self.label.setText(f"📁 루트 폴더: {new_folder}")
-            self.refresh_scripts()
-
-    def _create_script_tab(self, target_folder, tab_name):
-        scroll_area = QScrollArea()
-        scroll_area.setWidgetResizable(True)
-
-        scroll_widget = QWidget()
-        button_layout = QVBoxLayout(scroll_widget)
-        button_layout.setAlignment(Qt.AlignTop)
-
-        scroll_area.setWidget(scroll_widget)
-
-        try:
-            py_files = sorted(
-                [f for f in os.listdir(target_folder) if f.endswith(".py") and f not in self.IGNORE_FILES],
-                key=str.lower)
-
-            if not py_files:
-                button_layout.addWidget(QLabel("⚠️ 이 폴더에 실행할 .py 파일이 없습니다."))
-            else:
-                last_color_index = -1
-                for f in py_files:
-                    current_color_index = last_color_index
-                    while current_color_index == last_color_index:
-                        current_color_index = random.randint(0, len(self.BUTTON_COLORS) - 1)
-
-                    color = self.BUTTON_COLORS[current_color_index]
-                    last_color_index = current_color_index
-
-                    full_script_path = os.path.join(target_folder, f)
-                    display_name = os.path.splitext(f)[0]
-
-                    btn = CustomScriptButton(f"▶ {display_name}", full_script_path)
-                    btn.setStyleSheet(f"background-color: {color}; color: white; font-size: 12pt; padding: 5px;")
-                    btn.clicked.connect(lambda checked=False, path=full_script_path: self.run_script(path))
-                    btn.rightClicked.connect(self.show_script_help)
-                    button_layout.addWidget(btn)
-        except Exception as e:
-            button_layout.addWidget(QLabel(f"🚫 폴더를 읽는 중 에러 발생:\n{e}"))
-
-        self.tab_widget.addTab(scroll_area, tab_name)
+            # 루트가 바뀌면 탭을 모두 다시 만듭니다.
+            self.tab_widget.clear()
+            for view in self._tabs.values():
+                view.deleteLater()
+            self._tabs = {}
+            self._dirty_folders.clear()
+            self._stale_help.clear()
+            self._search_index = None
+            self.script_index = ScriptIndex.load(new_folder)
+            self._sync_watcher()
+            self.load_scripts()
+            self.start_rescan()
+
+    def _tab_name(self, folder):
+        if folder == self.folder_path:
+            return f"📁 {os.path.basename(self.folder_path)}"
+        return f"📂 {os.path.relpath(folder, self.folder_path).replace(os.sep, '/')}"
+
+    def _create_script_tab(self, folder):
+        """빈 스크립트 리스트 탭을 만듭니다. 내용은 탭이 처음 보일 때 _populate_tab 에서 채웁니다."""
+        view = ScriptListView(folder, ScriptListModel(self.BUTTON_COLORS))
+        view.leftClicked.connect(self.run_script)
+        view.rightClicked.connect(self.show_script_help)
+        return view
+
+    def _populate_tab(self, folder):
+        view = self._tabs.get(folder)
+        if view is None:
+            return
+        script_paths = self.script_index.scripts(folder)
+        view.model().set_scripts(script_paths)
+        view.populated = True
+        # 스크립트 파일 감시는 화면에 채운 탭의 파일만 (폴더는 항상 감시)
+        self._watch_files(script_paths)
+
+    def _on_tab_changed(self, position):
+        """탭이 처음 열릴 때만 목록을 채웁니다."""
+        view = self.tab_widget.widget(position)
+        if isinstance(view, ScriptListView) and not view.populated:
+            self._populate_tab(view.folder)
+
+    def _tab_folders(self):
+        """탭으로 보여줄 폴더 (루트 + 모든 하위 폴더, 인덱스가 비어 있으면 루트만)"""
+        return self.script_index.all_folders() or [self.folder_path]
+
+    def _set_tab(self, folder, position):
+        """folder 탭이 없으면 position 에 만들고, 이미 채워진 탭이면 목록만 다시 채웁니다."""
+        view = self._tabs.get(folder)
+        if view is None:
+            # insertTab 에서 currentChanged 가 오면 첫 탭은 바로 채워집니다.
+            view = self._tabs[folder] = self._create_script_tab(folder)
+            self.tab_widget.insertTab(position, view, self._tab_name(folder))
+        else:
+            if self.tab_widget.indexOf(view) != position:
+                self.tab_widget.tabBar().moveTab(self.tab_widget.indexOf(view), position)
+            if view.populated:
+                self._populate_tab(folder)
 
     def refresh_scripts(self):
-        self.tab_widget.clear()
-        self.load_scripts()
-        print("스크립트 목록을 새로고침했습니다.")
+        """백그라운드에서 모든 폴더를 다시 확인해서 바뀐 탭만 갱신합니다."""
+        self.start_rescan()
+        print("스크립트 목록을 새로고침합니다...")
 
     def load_scripts(self):
-        root_folder_name = os.path.basename(self.folder_path)
-        self._create_script_tab(self.folder_path, f"📁 {root_folder_name}")
-
-        try:
-            subfolders = sorted([d for d in os.listdir(self.folder_path) if
-                                 os.path.isdir(os.path.join(self.folder_path, d)) and d not in self.IGNORE_FOLDERS],
-                                key=str.lower)
-            for folder in subfolders:
-                full_folder_path = os.path.join(self.folder_path, folder)
-                self._create_script_tab(full_folder_path, f"📂 {folder}")
-        except Exception as e:
-            QMessageBox.critical(self, "폴더 스캔 에러", f"하위 폴더를 스캔하는 중 에러가 발생했습니다:\n{str(e)}")
+        """인덱스 내용으로 탭을 만듭니다. (인덱스가 비어 있으면 스캔이 끝난 뒤 채워집니다)"""
+        for position, folder in enumerate(self._tab_folders()):
+            self._set_tab(folder, position)
+        self._sync_watcher()
+
+    def start_rescan(self, folders=None):
+        """
+        백그라운드 스캔을 시작합니다.
+        :param folders: 다시 스캔할 폴더들. None 이면 전체 스캔
+        """
+        if self._scan_thread is not None and self._scan_thread.isRunning():
+            if folders is None:
+                self._rescan_pending = True
+            else:
+                self._pending_folders.update(folders)
+            return
+        self._scan_thread = ScriptScanThread(self.script_index, folders, self)
+        self._scan_thread.scanned.connect(self._apply_scan)
+        self._scan_thread.failed.connect(self._on_scan_failed)
+        self._scan_thread.finished.connect(self._on_scan_finished)
+        self._scan_thread.start()
+
+    def _apply_scan(self, new_index, changed, search_index):
+        """스캔 결과에서 바뀐 폴더의 탭 목록만 다시 채우고, 없어진 폴더의 탭은 제거합니다."""
+        if new_index.root != self.folder_path:
+            # 스캔 중에 루트 폴더가 바뀐 경우: 결과는 버리고 스캔이 끝나면 새 루트로 다시 스캔
+            self._rescan_pending = True
+            return
+        self.script_index = new_index
+        self._search_index = search_index
+        folders = self._tab_folders()
+        for folder in [f for f in self._tabs if f not in folders]:
+            tab = self._tabs.pop(folder)
+            self.tab_widget.removeTab(self.tab_widget.indexOf(tab))
+            tab.deleteLater()
+        for position, folder in enumerate(folders):
+            if folder in changed or folder not in self._tabs:
+                self._set_tab(folder, position)
+        self._sync_watcher()
+        if changed and self.search_edit.text().strip():
+            self.search_scripts(self.search_edit.text())
+        if changed:
+            print(f"스크립트 목록을 갱신했습니다. (바뀐 폴더 {len(changed)}개)")
+
+    def _on_scan_finished(self):
+        """스캔 중에 들어온 새로고침 요청은 스캔이 끝난 뒤 한 번만 다시 실행합니다."""
+        if self._rescan_pending:
+            self._rescan_pending = False
+            self._pending_folders.clear()
+            self.start_rescan()
+        elif self._pending_folders:
+            folders, self._pending_folders = self._pending_folders, set()
+            self.start_rescan(folders)
+
+    # ------- 검색 -------- #
+    def search_scripts(self, text):
+        """검색어가 있으면 탭 대신 검색 결과 목록을 보여줍니다."""
+        if not text.strip():
+            self.search_view.hide()
+            self.tab_widget.show()
+            # 검색 결과로만 감시하던 파일은 감시를 풉니다.
+            self._sync_watcher()
+            return
+        if self._search_index is None:
+            # 첫 스캔이 끝나기 전에는 저장된 인덱스로 바로 만듭니다.
+            self._search_index = ScriptSearchIndex(self.script_index)
+        results = self._search_index.search(text)
+        self.search_view.model().set_scripts(results, root=self.folder_path)
+        self._watch_files(results)
+        self.tab_widget.hide()
+        self.search_view.show()
+
+    # ------- 파일 감시 -------- #
+    @staticmethod
+    def _watch_key(path):
+        # QFileSystemWatcher 는 구분자를 바꿔서 알려줄 수 있으므로 정규화한 경로로 인덱스 경로를 찾습니다.
+        return os.path.normcase(os.path.normpath(path))
+
+    def _visible_scripts(self):
+        """파일 감시 대상 스크립트: 채워진 탭과 검색 결과에 보이는 스크립트"""
+        script_paths = set()
+        for folder, view in self._tabs.items():
+            if view.populated:
+                script_paths.update(self.script_index.scripts(folder))
+        if self.search_edit.text().strip():
+            script_paths.update(self.search_view.model().script_paths)
+        return script_paths
+
+    def _watch_files(self, script_paths):
+        """스크립트 파일 감시를 추가합니다. (이미 감시 중인 파일은 건너뜀)"""
+        added = []
+        for path in script_paths:
+            key = self._watch_key(path)
+            if key not in self._watch_keys:
+                self._watch_keys[key] = path
+                if os.path.exists(path):
+                    added.append(path)
+        if added:
+            self._watcher.addPaths(added)
+
+    def _sync_watcher(self):
+        """
+        감시 목록을 모든 폴더 + 화면에 보이는 스크립트 파일에 맞춥니다. (추가/삭제된 경로만 반영)
+        네트워크 드라이브의 수천 개 스크립트를 모두 감시하면 inotify/핸들 한도에 걸리고 Qt 가 폴링으로 바뀌므로,
+        파일은 채워진 탭과 검색 결과의 스크립트만 감시합니다. 나머지 파일의 추가/삭제는 폴더 감시로 알 수 있습니다.
+        """
+        folders = self.script_index.all_folders() or [self.folder_path]
+        wanted = set(folders) | self._visible_scripts()
+        self._watch_keys = {self._watch_key(path): path for path in wanted}
+
+        watched = set(self._watcher.directories()) | set(self._watcher.files())
+        watched_keys = {self._watch_key(path): path for path in watched}
+        removed = [path for key, path in watched_keys.items() if key not in self._watch_keys]
+        added = [path for key, path in self._watch_keys.items() if key not in watched_keys and os.path.exists(path)]
+        if removed:
+            self._watcher.removePaths(removed)
+        if added:
+            self._watcher.addPaths(added)
+
+    def _on_folder_changed(self, path):
+        """폴더에 파일이 추가/삭제/이름 변경되었습니다."""
+        self._dirty_folders.add(self._watch_keys.get(self._watch_key(path), path))
+        self._debounce_timer.start()
+
+    def _on_script_changed(self, path):
+        """스크립트 파일이 수정되었습니다. 도움말을 stale 로 표시하고 폴더를 다시 스캔합니다."""
+        script_path = self._watch_keys.get(self._watch_key(path), path)
+        self._stale_help.add(script_path)
+        self._dirty_folders.add(os.path.dirname(script_path))
+        self._debounce_timer.start()
+        # 저장 방식에 따라 파일이 교체되면 감시가 풀리므로 다시 등록합니다.
+        if os.path.exists(path) and path not in self._watcher.files():
+            self._watcher.addPath(path)
+
+    def _rescan_dirty_folders(self):
+        folders, self._dirty_folders = self._dirty_folders, set()
+        if folders:
+            self.start_rescan(folders)
+
+    def closeEvent(self, event):
+        # 실행 중인 QThread 가 위젯과 함께 지워지면 Maya 가 죽으므로 스캔이 끝날 때까지 기다립니다.
+        self._debounce_timer.stop()
+        if self._scan_thread is not None:
+            self._scan_thread.wait()
+        super().closeEvent(event)
+
+    def _on_scan_failed(self, message):
+        QMessageBox.critical(self, "폴더 스캔 에러", f"폴더를 스캔하는 중 에러가 발생했습니다:\n{message}")
 
     def run_script(self, script_path):
         filename = os.path.basename(script_path)
@@ -207,9 +865,7 @@ class ScriptRunner(QWidget):
         print(f"'{filename}' 스크립트 실행을 시작합니다... (경로: {script_path})")
         try:
             def _execute():
-                with open(script_path, "r", encoding="utf-8") as f:
-                    code = f.read()
-                exec(code, globals())
+                exec(self.code_cache.get(script_path), globals())
 
             maya.utils.executeInMainThreadWithResult(_execute)
             print(f"'{filename}' 스크립트 실행이 완료되었습니다.")
@@ -220,7 +876,9 @@ class ScriptRunner(QWidget):
 
     def show_script_help(self, script_path):
         filename = os.path.basename(script_path)
-        docstring = _extract_docstring(script_path)
+        stale = script_path in self._stale_help
+        self._stale_help.discard(script_path)
+        docstring = self.script_index.get_docstring(script_path, stale=stale)
 
         if not docstring:
             docstring = "이 스크립트에는 작성된 도움말(docstring)이 없습니다."
@@ -9,20 +9,98 @@ make_curve_from_locator.py
 - 먼저 로케이터 위치에 정확히 CV(Control Vertex)가 위치하는 Degree 1(Linear) 커브를 생성합니다.
 - 그 다음, 생성된 커브를 부드러운 형태를 위해 Degree 3(Cubic) 커브로 리빌드(rebuild)합니다.
 - 최소 4개의 로케이터가 선택되어야 Degree 3 커브를 정상적으로 생성할 수 있습니다.
+- bake 모드에서는 애니메이션된 로케이터를 따라가는 커브를 만듭니다.
+  타임라인을 넘기지 않고 프레임 범위 전체의 월드 위치를 컨텍스트 평가(MDGContext)로 한 번에 읽은 뒤,
+  CV 애니메이션 커브를 한 번에(bulk) 작성합니다.
 
 [실행 방법]
 1. 커브를 생성할 위치에 로케이터를 4개 이상 배치하고 생성 순서대로 선택합니다.
 2. 스크립트를 실행합니다.
+3. 애니메이션 커브가 필요하면 make_curve_from_locator(bake=True, start_frame=1001, end_frame=1100) 처럼 호출합니다.
+   프레임 범위를 지정하지 않으면 플레이백 범위를 사용합니다.
 
 """
 # Maya 커맨드 모듈을 사용하기 위해 import 합니다.
 import maya.cmds as cmds
+# 컨텍스트 평가와 애니메이션 커브 작성을 위해 OpenMaya 2.0 을 사용합니다.
+import maya.api.OpenMaya as om2
+import maya.api.OpenMayaAnim as om2anim
 
-def make_curve_from_locator():
+
+def _get_world_matrix_plugs(locators):
+    """
+    로케이터들의 worldMatrix 플러그를 한 번에 찾아 반환합니다.
+    인스턴스된 경우를 고려해 dagPath 의 instanceNumber 로 엘리먼트를 선택합니다.
+    """
+    selection = om2.MSelectionList()
+    for locator in locators:
+        selection.add(locator)
+
+    plugs = []
+    for index in range(selection.length()):
+        dag_path = selection.getDagPath(index)
+        fn_node = om2.MFnDependencyNode(dag_path.node())
+        plug = fn_node.findPlug('worldMatrix', False)
+        plugs.append(plug.elementByLogicalIndex(dag_path.instanceNumber()))
+    return plugs
+
+
+def sample_locator_positions(locators, frames):
+    """
+    프레임 리스트에 대해 로케이터들의 월드 위치를 한 번의 패스로 샘플링합니다.
+    currentTime 을 바꾸지 않고 MDGContext 로 각 프레임을 평가하므로 타임라인 스크러빙이 없습니다.
+
+    반환값: frames 와 같은 순서의 [[(x, y, z), ...], ...] 리스트
+    """
+    plugs = _get_world_matrix_plugs(locators)
+    time_unit = om2.MTime.uiUnit()
+
+    samples = []
+    for frame in frames:
+        context = om2.MDGContext(om2.MTime(frame, time_unit))
+        frame_points = []
+        with om2.MDGContextGuard(context):
+            for plug in plugs:
+                matrix = om2.MFnMatrixData(plug.asMObject()).matrix()
+                # 월드 매트릭스의 translate 성분(4번째 행)
+                frame_points.append((matrix[12], matrix[13], matrix[14]))
+        samples.append(frame_points)
+    return samples
+
+
+def _bake_cv_animation(curve, frames, samples):
+    """
+    샘플링한 위치를 커브 쉐입의 controlPoints 에 애니메이션 커브로 한 번에 작성합니다.
+    CV/축 마다 MFnAnimCurve.addKeys 한 번으로 모든 키를 넣습니다.
+    """
+    shape = cmds.listRelatives(curve, shapes=True, fullPath=True)[0]
+    selection = om2.MSelectionList()
+    selection.add(shape)
+    fn_shape = om2.MFnDependencyNode(selection.getDependNode(0))
+    control_points = fn_shape.findPlug('controlPoints', False)
+
+    time_unit = om2.MTime.uiUnit()
+    times = om2.MTimeArray([om2.MTime(frame, time_unit) for frame in frames])
+
+    for cv_index in range(len(samples[0])):
+        cv_plug = control_points.elementByLogicalIndex(cv_index)
+        for axis in range(3):
+            values = om2.MDoubleArray([frame_points[cv_index][axis] for frame_points in samples])
+            anim_curve = om2anim.MFnAnimCurve()
+            anim_curve.create(cv_plug.child(axis), om2anim.MFnAnimCurve.kAnimCurveTL)
+            anim_curve.addKeys(times, values,
+                               om2anim.MFnAnimCurve.kTangentLinear,
+                               om2anim.MFnAnimCurve.kTangentLinear)
+
+
+def make_curve_from_locator(bake=False, start_frame=None, end_frame=None):
     """
     선택된 로케이터의 위치를 기반으로 커브를 생성하는 메인 함수입니다.
     1. 먼저 Degree 1 커브를 생성하여 CV가 로케이터 위치와 일치하도록 합니다.
     2. 그 다음, 생성된 커브를 Degree 3으로 리빌드하여 부드럽게 만듭니다.
+
+    bake=True 이면 프레임 범위 동안 로케이터를 따라가는 애니메이션 커브를 만듭니다.
+    Degree 1 커브의 CV 에 애니메이션을 굽고, 히스토리가 있는 rebuildCurve 로 Degree 3 커브를 구동합니다.
     """
     # 1. 현재 Maya 씬에서 선택된 오브젝트 리스트를 가져옵니다.
     # ls 명령어는 리스트를 반환합니다.
@@ -37,6 +115,9 @@ def make_curve_from_locator():
         cmds.warning("최소 4개 이상의 로케이터를 선택해야 합니다.")
         return
 
+    if bake:
+        return _make_baked_curve_from_locator(selected_locators, start_frame, end_frame)
+
     # 3. 각 로케이터의 월드 공간(world space) 위치 정보를 저장할 빈 리스트를 생성합니다.
     point_list = []
     # for 루프를 사용하여 선택된 각 로케이터에 대해 반복 작업을 수행합니다.
@@ -71,6 +152,42 @@ def make_curve_from_locator():
     return final_curve
 
 
+def _make_baked_curve_from_locator(locators, start_frame=None, end_frame=None):
+    """
+    로케이터 애니메이션을 따라가는 커브를 생성합니다.
+    - 모든 프레임의 위치를 한 번에 샘플링하고 CV 애니메이션을 한 번에 작성합니다.
+    - 최종 Degree 3 커브는 히스토리가 있는 rebuildCurve 로 애니메이션된 Degree 1 커브를 따라갑니다.
+    """
+    if start_frame is None:
+        start_frame = cmds.playbackOptions(query=True, minTime=True)
+    if end_frame is None:
+        end_frame = cmds.playbackOptions(query=True, maxTime=True)
+    if end_frame < start_frame:
+        cmds.warning("끝 프레임이 시작 프레임보다 작습니다.")
+        return
+
+    frames = [start_frame + i for i in range(int(end_frame - start_frame) + 1)]
+    samples = sample_locator_positions(locators, frames)
+
+    # 첫 프레임 위치로 Degree 1 커브를 만들고 CV 애니메이션을 굽습니다.
+    linear_curve = cmds.curve(degree=1, point=samples[0])
+    linear_curve = cmds.rename(linear_curve, "generated_curve_linear#")
+    _bake_cv_animation(linear_curve, frames, samples)
+
+    # 히스토리를 남겨서 리빌드된 커브가 매 프레임 Degree 1 커브를 따라가도록 합니다.
+    rebuilt_curve = cmds.rebuildCurve(linear_curve,
+                                      replaceOriginal=False,
+                                      rebuildType=0,
+                                      keepRange=0,
+                                      constructionHistory=True,
+                                      degree=3)[0]
+    final_curve = cmds.rename(rebuilt_curve, "generated_curve#")
+    cmds.setAttr(f"{linear_curve}.visibility", False)
+
+    print(f"'{final_curve}' 이름으로 애니메이션 커브가 생성되었습니다. ({start_frame} - {end_frame}, {len(frames)} 프레임)")
+    return final_curve
+
+
 # 스크립트의 메인 함수를 실행합니다.
 make_curve_from_locator()
 